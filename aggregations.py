@@ -0,0 +1,115 @@
+"""
+Agrégations SQL partagées par les rapports
+
+Les totaux, comptages et répartitions sont calculés par la base de données
+(SUM / COUNT / GROUP BY) au lieu de charger chaque ligne en objet ORM.
+"""
+from fastapi import HTTPException
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+from typing import Optional, List, Tuple, Any
+from models import Purchase, StockItem, PurchasePeriod
+import calendar
+
+
+def period_bounds(period: PurchasePeriod, year: int, month: Optional[int] = None, week: Optional[int] = None) -> Tuple[datetime, datetime]:
+    """Calculer les dates de début et de fin d'une période de rapport"""
+    if period == PurchasePeriod.DAILY:
+        if not month:
+            raise HTTPException(status_code=400, detail="Le mois est requis pour les rapports journaliers")
+        start_date = datetime(year, month, 1)
+        end_date = datetime(year, month, calendar.monthrange(year, month)[1])
+    elif period == PurchasePeriod.WEEKLY:
+        if not week:
+            raise HTTPException(status_code=400, detail="La semaine est requise pour les rapports hebdomadaires")
+        start_date = datetime(year, 1, 1) + timedelta(weeks=week-1)
+        end_date = start_date + timedelta(days=6)
+    elif period == PurchasePeriod.MONTHLY:
+        if not month:
+            raise HTTPException(status_code=400, detail="Le mois est requis pour les rapports mensuels")
+        start_date = datetime(year, month, 1)
+        end_date = datetime(year, month, calendar.monthrange(year, month)[1])
+    elif period == PurchasePeriod.SEMESTRIAL:
+        semester = 1 if month and month <= 6 else 2
+        if semester == 1:
+            start_date = datetime(year, 1, 1)
+            end_date = datetime(year, 6, 30)
+        else:
+            start_date = datetime(year, 7, 1)
+            end_date = datetime(year, 12, 31)
+    else:
+        start_date = datetime(year, 1, 1)
+        end_date = datetime(year, 12, 31)
+    return start_date, end_date
+
+
+def _date_filters(date_column, start_date: Optional[datetime], end_date: Optional[datetime]) -> list:
+    filters = []
+    if start_date:
+        filters.append(date_column >= start_date)
+    if end_date:
+        filters.append(date_column <= end_date)
+    return filters
+
+
+def total_and_count(
+    db: Session,
+    value_column,
+    date_column,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    filters: Optional[list] = None
+) -> Tuple[float, int]:
+    """Somme d'une colonne et nombre de lignes sur une plage de dates"""
+    conditions = _date_filters(date_column, start_date, end_date) + list(filters or [])
+    total, count = db.query(
+        func.coalesce(func.sum(value_column), 0.0),
+        func.count()
+    ).select_from(value_column.class_).filter(*conditions).one()
+    return float(total), int(count)
+
+
+def grouped_totals(
+    db: Session,
+    key_column,
+    value_column,
+    date_column,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    filters: Optional[list] = None,
+    limit: Optional[int] = None
+) -> List[Tuple[Any, int, float]]:
+    """Nombre de lignes et somme d'une colonne groupés par clé, triés par somme décroissante"""
+    conditions = _date_filters(date_column, start_date, end_date) + list(filters or [])
+    amount = func.coalesce(func.sum(value_column), 0.0)
+    query = db.query(
+        key_column,
+        func.count(),
+        amount
+    ).filter(*conditions).group_by(key_column).order_by(amount.desc())
+    if limit:
+        query = query.limit(limit)
+    return [(key, int(count), float(total)) for key, count, total in query.all()]
+
+
+def average_unit_prices(db: Session):
+    """Sous-requête (item_name, category, unit_price) : prix unitaire moyen d'achat de chaque article"""
+    return db.query(
+        Purchase.item_name.label("item_name"),
+        Purchase.category.label("category"),
+        func.avg(Purchase.unit_price).label("unit_price")
+    ).group_by(Purchase.item_name, Purchase.category).subquery()
+
+
+def stock_value(db: Session) -> float:
+    """Valeur du stock actif, valorisé au prix unitaire moyen d'achat de chaque article"""
+    average_prices = average_unit_prices(db)
+
+    value = db.query(
+        func.coalesce(func.sum(StockItem.current_quantity * average_prices.c.unit_price), 0.0)
+    ).join(
+        average_prices,
+        (average_prices.c.item_name == StockItem.name) & (average_prices.c.category == StockItem.category)
+    ).filter(StockItem.is_active == True).scalar()
+    return float(value)
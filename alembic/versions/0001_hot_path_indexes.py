@@ -0,0 +1,60 @@
+"""Index composites pour les filtres et la pagination des routes principales
+
+Les tables sont créées par create_all() au démarrage : cette migration
+n'ajoute que les index absents, elle peut donc être appliquée aussi bien
+à une base existante qu'à une base neuve.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_purchases_purchase_date_category", "purchases", ["purchase_date", "category"]),
+    ("ix_purchases_supplier_purchase_date", "purchases", ["supplier", "purchase_date"]),
+    ("ix_purchases_item_name_category_unit_price", "purchases", ["item_name", "category", "unit_price"]),
+    ("ix_purchases_created_at_id", "purchases", ["created_at", "id"]),
+    ("ix_stock_items_name_category", "stock_items", ["name", "category"]),
+    ("ix_stock_movements_stock_item_id_created_at", "stock_movements", ["stock_item_id", "created_at", "id"]),
+    ("ix_stock_movements_created_at_id", "stock_movements", ["created_at", "id"]),
+    ("ix_maintenance_records_next_service_due", "maintenance_records", ["next_service_due"]),
+    ("ix_maintenance_records_service_date", "maintenance_records", ["service_date"]),
+    ("ix_maintenance_records_vehicle_id_created_at", "maintenance_records", ["vehicle_id", "created_at", "id"]),
+    ("ix_maintenance_records_created_at_id", "maintenance_records", ["created_at", "id"]),
+    ("ix_breakdowns_vehicle_id_created_at", "breakdowns", ["vehicle_id", "created_at", "id"]),
+    ("ix_breakdowns_created_at_id", "breakdowns", ["created_at", "id"]),
+    ("ix_fuel_records_vehicle_id_refuel_date", "fuel_records", ["vehicle_id", "refuel_date"]),
+    ("ix_fuel_records_vehicle_id_created_at", "fuel_records", ["vehicle_id", "created_at", "id"]),
+    ("ix_purchase_requests_status_department", "purchase_requests", ["status", "department"]),
+    ("ix_purchase_requests_requested_by_user_id_created_at", "purchase_requests", ["requested_by_user_id", "created_at", "id"]),
+    ("ix_purchase_requests_created_at_id", "purchase_requests", ["created_at", "id"]),
+]
+
+
+def _existing_indexes(inspector, table):
+    if not inspector.has_table(table):
+        return None
+    return {index["name"] for index in inspector.get_indexes(table)}
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in INDEXES:
+        existing = _existing_indexes(inspector, table)
+        if existing is not None and name not in existing:
+            op.create_index(name, table, columns)
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in reversed(INDEXES):
+        existing = _existing_indexes(inspector, table)
+        if existing and name in existing:
+            op.drop_index(name, table_name=table)
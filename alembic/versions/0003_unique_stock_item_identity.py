@@ -0,0 +1,63 @@
+"""Index unique sur l'identité des articles de stock (nom, catégorie)
+
+L'entrée en stock des achats crée l'article ou ajoute la quantité par un
+INSERT ... ON CONFLICT (name, category), qui exige cet index unique. Il
+remplace l'index simple ix_stock_items_name_category.
+
+Si des articles en double existent déjà, la migration s'arrête en les
+listant : ils doivent être fusionnés (quantités et mouvements) avant de la
+relancer.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+TABLE = "stock_items"
+UNIQUE_INDEX = "ux_stock_items_name_category"
+PREVIOUS_INDEX = "ix_stock_items_name_category"
+COLUMNS = ["name", "category"]
+
+
+def _existing_indexes(inspector, table):
+    if not inspector.has_table(table):
+        return None
+    return {index["name"] for index in inspector.get_indexes(table)}
+
+
+def upgrade():
+    bind = op.get_bind()
+    existing = _existing_indexes(sa.inspect(bind), TABLE)
+    if existing is None or UNIQUE_INDEX in existing:
+        return
+
+    duplicates = bind.execute(sa.text(
+        "SELECT name, category, COUNT(*) FROM stock_items GROUP BY name, category HAVING COUNT(*) > 1"
+    )).fetchall()
+    if duplicates:
+        listing = ", ".join(f"{name} ({category}) x{count}" for name, category, count in duplicates[:20])
+        raise RuntimeError(
+            f"{len(duplicates)} articles de stock en double (même nom et catégorie) : {listing}. "
+            "Fusionnez-les avant d'appliquer cette migration."
+        )
+
+    op.create_index(UNIQUE_INDEX, TABLE, COLUMNS, unique=True)
+    if PREVIOUS_INDEX in existing:
+        op.drop_index(PREVIOUS_INDEX, table_name=TABLE)
+
+
+def downgrade():
+    existing = _existing_indexes(sa.inspect(op.get_bind()), TABLE)
+    if not existing:
+        return
+    if PREVIOUS_INDEX not in existing:
+        op.create_index(PREVIOUS_INDEX, TABLE, COLUMNS)
+    if UNIQUE_INDEX in existing:
+        op.drop_index(UNIQUE_INDEX, table_name=TABLE)
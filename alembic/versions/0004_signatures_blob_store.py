@@ -0,0 +1,87 @@
+"""Signatures des demandes d'achat déplacées dans le stockage de fichiers
+
+dg_signature et receipt_signature contenaient l'image PNG en base64
+(souvent plusieurs dizaines de Ko par ligne, relues par chaque liste). Les
+images sont écrites dans BLOB_STORE_DIR (voir blobstore.py) et la colonne ne
+garde que la référence "sha256:<empreinte>".
+
+Les valeurs qui ne sont pas du base64 valide sont laissées telles quelles
+(et signalées). Le retour arrière remet les images en ligne au format
+data:image/png;base64 ; le répertoire BLOB_STORE_DIR doit être le même que
+celui de l'application.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from alembic import op
+import base64
+import sqlalchemy as sa
+
+from blobstore import REFERENCE_PREFIX, decode_signature, get, media_type, put
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+TABLE = "purchase_requests"
+COLUMNS = ["dg_signature", "receipt_signature"]
+BATCH_SIZE = 200
+
+
+def _rows(bind, column, condition):
+    """(id, valeur) par lots, dans l'ordre des id, sans charger toute la table"""
+    last_id = 0
+    while True:
+        rows = bind.execute(sa.text(
+            f"SELECT id, {column} FROM {TABLE} WHERE id > :last_id AND {column} IS NOT NULL "
+            f"AND {column} <> '' AND {condition} ORDER BY id LIMIT {BATCH_SIZE}"
+        ), {"last_id": last_id}).fetchall()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
+
+
+def _update(bind, column, values):
+    if values:
+        bind.execute(sa.text(f"UPDATE {TABLE} SET {column} = :value WHERE id = :id"), values)
+
+
+def upgrade():
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table(TABLE):
+        return
+    for column in COLUMNS:
+        moved = invalid = 0
+        for rows in _rows(bind, column, f"{column} NOT LIKE '{REFERENCE_PREFIX}%'"):
+            values = []
+            for row_id, value in rows:
+                try:
+                    values.append({"id": row_id, "value": put(decode_signature(value))})
+                except ValueError:
+                    invalid += 1
+            _update(bind, column, values)
+            moved += len(values)
+        print(f"{TABLE}.{column} : {moved} signatures déplacées" + (f", {invalid} invalides laissées en ligne" if invalid else ""))
+
+
+def downgrade():
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table(TABLE):
+        return
+    for column in COLUMNS:
+        missing = 0
+        for rows in _rows(bind, column, f"{column} LIKE '{REFERENCE_PREFIX}%'"):
+            values = []
+            for row_id, value in rows:
+                data = get(value[len(REFERENCE_PREFIX):])
+                if data is None:
+                    missing += 1
+                    continue
+                encoded = base64.b64encode(data).decode("ascii")
+                values.append({"id": row_id, "value": f"data:{media_type(data)};base64,{encoded}"})
+            _update(bind, column, values)
+        if missing:
+            print(f"{TABLE}.{column} : {missing} images absentes de BLOB_STORE_DIR, références conservées")
@@ -0,0 +1,69 @@
+"""Pagination des historiques de véhicules par date d'intervention
+
+Les listes d'entretiens, de pannes et de pleins sont triées par date
+d'intervention (service_date, breakdown_date, refuel_date) et non par date
+de saisie : les index (created_at, id) sont remplacés par des index sur la
+date d'intervention. Les pleins d'un véhicule utilisent l'index existant
+(vehicle_id, refuel_date).
+
+Comme 0001, seuls les index absents sont créés.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+ADDED = [
+    ("ix_maintenance_records_service_date_id", "maintenance_records", ["service_date", "id"]),
+    ("ix_maintenance_records_vehicle_id_service_date", "maintenance_records", ["vehicle_id", "service_date", "id"]),
+    ("ix_breakdowns_vehicle_id_breakdown_date", "breakdowns", ["vehicle_id", "breakdown_date", "id"]),
+    ("ix_breakdowns_breakdown_date_id", "breakdowns", ["breakdown_date", "id"]),
+]
+
+REPLACED = [
+    ("ix_maintenance_records_service_date", "maintenance_records", ["service_date"]),
+    ("ix_maintenance_records_vehicle_id_created_at", "maintenance_records", ["vehicle_id", "created_at", "id"]),
+    ("ix_maintenance_records_created_at_id", "maintenance_records", ["created_at", "id"]),
+    ("ix_breakdowns_vehicle_id_created_at", "breakdowns", ["vehicle_id", "created_at", "id"]),
+    ("ix_breakdowns_created_at_id", "breakdowns", ["created_at", "id"]),
+    ("ix_fuel_records_vehicle_id_created_at", "fuel_records", ["vehicle_id", "created_at", "id"]),
+]
+
+
+def _existing_indexes(inspector, table):
+    if not inspector.has_table(table):
+        return None
+    return {index["name"] for index in inspector.get_indexes(table)}
+
+
+def _create(indexes):
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in indexes:
+        existing = _existing_indexes(inspector, table)
+        if existing is not None and name not in existing:
+            op.create_index(name, table, columns)
+
+
+def _drop(indexes):
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in reversed(indexes):
+        existing = _existing_indexes(inspector, table)
+        if existing and name in existing:
+            op.drop_index(name, table_name=table)
+
+
+def upgrade():
+    _create(ADDED)
+    _drop(REPLACED)
+
+
+def downgrade():
+    _create(REPLACED)
+    _drop(ADDED)
@@ -0,0 +1,139 @@
+"""
+Pages HTML et fichiers statiques précompilés
+
+Au démarrage, chaque fichier de static/ est lu une fois, nommé d'après
+l'empreinte de son contenu (css/stock.3f2a9c1e0b.css) et compressé en gzip
+et, si le module brotli est installé, en brotli. Ces fichiers sont servis avec
+Cache-Control: immutable : le navigateur ne les redemande pas, un contenu
+modifié ayant un autre nom.
+
+Les pages de templates/pages/ désignent leurs fichiers par
+{{ static('js/stock.js') }}, remplacé par l'URL avec empreinte. L'URL des
+pages (/stock, /dashboard...) ne change pas : elles sont servies avec un
+ETag fort et revalidées à chaque visite (304 si elles n'ont pas changé).
+"""
+from fastapi import HTTPException, Request, Response
+from typing import Dict, Optional
+from compression import negotiate_encoding
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import threading
+
+try:
+    import brotli
+except ImportError:  # brotli est optionnel : gzip seulement
+    brotli = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(BASE_DIR, "static")
+PAGES_DIR = os.path.join(BASE_DIR, "templates", "pages")
+STATIC_URL = "/static/"
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+STATIC_REFERENCE = re.compile(r"\{\{\s*static\('([^']+)'\)\s*\}\}")
+
+# Encodages proposés, par ordre de préférence
+COMPRESSORS = {"gzip": lambda body: gzip.compress(body, compresslevel=9, mtime=0)}
+if brotli is not None:
+    COMPRESSORS = {"br": lambda body: brotli.compress(body, quality=11), **COMPRESSORS}
+
+
+class Asset:
+    """Contenu d'un fichier servi, avec ses variantes compressées"""
+
+    def __init__(self, body: bytes, media_type: str):
+        self.media_type = media_type
+        self.digest = hashlib.sha256(body).hexdigest()
+        self.variants = {None: body}  # encodage -> contenu
+        for encoding, compress in COMPRESSORS.items():
+            compressed = compress(body)
+            if len(compressed) < len(body):
+                self.variants[encoding] = compressed
+        self.encodings = [encoding for encoding in COMPRESSORS if encoding in self.variants]
+
+    def etag(self, encoding: Optional[str]) -> str:
+        # Un ETag par représentation, comme l'exige un ETag fort
+        return f'"{self.digest[:32]}-{encoding}"' if encoding else f'"{self.digest[:32]}"'
+
+    def matches(self, if_none_match: str) -> bool:
+        if if_none_match.strip() == "*":
+            return True
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return any(self.etag(encoding) in tags for encoding in self.variants)
+
+
+def asset_response(request: Request, asset: Asset, cache_control: str) -> Response:
+    """Réponse 200 (variante négociée selon Accept-Encoding) ou 304"""
+    encoding = negotiate_encoding(request.headers.get("accept-encoding", ""), asset.encodings)
+    headers = {"ETag": asset.etag(encoding), "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+    if asset.matches(request.headers.get("if-none-match", "")):
+        return Response(status_code=304, headers=headers)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(asset.variants[encoding], media_type=asset.media_type, headers=headers)
+
+
+_static: Dict[str, Asset] = {}  # chemin avec empreinte -> fichier
+_static_urls: Dict[str, str] = {}  # chemin d'origine -> URL avec empreinte
+_pages: Dict[str, Asset] = {}
+_build_lock = threading.Lock()
+
+
+def _hashed_path(path: str, body: bytes) -> str:
+    root, extension = os.path.splitext(path)
+    return f"{root}.{hashlib.sha256(body).hexdigest()[:10]}{extension}"
+
+
+def build():
+    """Lire, nommer et compresser fichiers statiques et pages (une fois par processus)"""
+    with _build_lock:
+        if _pages:
+            return
+        for directory, _, filenames in os.walk(STATIC_DIR):
+            for filename in sorted(filenames):
+                full_path = os.path.join(directory, filename)
+                path = os.path.relpath(full_path, STATIC_DIR).replace(os.sep, "/")
+                with open(full_path, "rb") as handle:
+                    body = handle.read()
+                media_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+                hashed = _hashed_path(path, body)
+                _static[hashed] = _static[path] = Asset(body, media_type)
+                _static_urls[path] = STATIC_URL + hashed
+
+        for filename in sorted(os.listdir(PAGES_DIR)):
+            name, extension = os.path.splitext(filename)
+            if extension != ".html":
+                continue
+            with open(os.path.join(PAGES_DIR, filename), encoding="utf-8") as handle:
+                html = STATIC_REFERENCE.sub(lambda match: static_url(match.group(1)), handle.read())
+            _pages[name] = Asset(html.encode("utf-8"), "text/html")
+
+
+def static_url(path: str) -> str:
+    """URL avec empreinte d'un fichier de static/"""
+    if path not in _static_urls:
+        raise KeyError(f"Fichier statique inconnu: {path}")
+    return _static_urls[path]
+
+
+def page_response(request: Request, name: str) -> Response:
+    """Servir une page de templates/pages/ (revalidée avec son ETag)"""
+    if not _pages:
+        build()
+    return asset_response(request, _pages[name], REVALIDATE)
+
+
+def static_response(request: Request, path: str) -> Response:
+    """Servir un fichier de static/ : immuable sous son nom avec empreinte"""
+    if not _pages:
+        build()
+    asset = _static.get(path)
+    if asset is None:
+        raise HTTPException(status_code=404, detail="Fichier non trouvé")
+    # Le nom d'origine reste servi (liens existants), mais doit être revalidé
+    return asset_response(request, asset, REVALIDATE if path in _static_urls else IMMUTABLE)
@@ -4,10 +4,14 @@ from sqlalchemy.orm import Session
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from database import get_db
 from models import User, UserRole
+from cache import ReportCache
+import asyncio
 import os
+import time
 
 # Configuration de sécurité
 SECRET_KEY = os.getenv("SECRET_KEY", "votre-clé-secrète-très-longue-et-complexe-ici")
@@ -16,11 +20,43 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 24 * 60  # 24 heures
 
 # Configuration du hachage des mots de passe
 # Utilisation de pbkdf2_sha256 temporairement pour éviter le bug bcrypt
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+# min_rounds = default_rounds : un hachage créé avec moins d'itérations est
+# recalculé à la prochaine connexion (voir verify_and_update_password)
+PASSWORD_HASH_ROUNDS = int(os.getenv("PASSWORD_HASH_ROUNDS", "29000"))
+pwd_context = CryptContext(
+    schemes=["pbkdf2_sha256"],
+    deprecated="auto",
+    pbkdf2_sha256__default_rounds=PASSWORD_HASH_ROUNDS,
+    pbkdf2_sha256__min_rounds=PASSWORD_HASH_ROUNDS
+)
+
+# Exécuteur dédié et borné pour le hachage (coûteux en CPU) : une vague de
+# connexions ne monopolise ni la boucle d'événements ni le pool de threads
+# des routes
+password_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1)))),
+    thread_name_prefix="password-hash"
+)
 
 # Configuration du bearer token
 security = HTTPBearer()
 
+# Cache des utilisateurs authentifiés : jeton -> (expiration du jeton, colonnes de l'utilisateur)
+# Évite un jwt.decode et une requête SQL par appel d'API. Les routes qui modifient
+# ou suppriment un utilisateur appellent invalidate_user() ; les autres workers
+# se mettent à jour au plus tard après AUTH_CACHE_TTL secondes.
+principal_cache = ReportCache(
+    maxsize=int(os.getenv("AUTH_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("AUTH_CACHE_TTL", "60"))
+)
+
+def _user_snapshot(user: User) -> dict:
+    return {column.key: getattr(user, column.key) for column in User.__table__.columns}
+
+def invalidate_user(user_id: int):
+    """Retirer du cache les identités d'un utilisateur modifié ou supprimé"""
+    principal_cache.invalidate_tables([f"user:{user_id}"])
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Vérifier un mot de passe"""
     return pwd_context.verify(plain_password, hashed_password)
@@ -29,6 +65,15 @@ def get_password_hash(password: str) -> str:
     """Hacher un mot de passe"""
     return pwd_context.hash(password)
 
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Vérifier un mot de passe dans l'exécuteur dédié
+
+    Retourne (valide, nouveau_hachage) : nouveau_hachage est fourni quand le
+    hachage stocké utilise des paramètres obsolètes et doit être remplacé.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, pwd_context.verify_and_update, plain_password, hashed_password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Créer un token d'accès JWT"""
     to_encode = data.copy()
@@ -52,7 +97,11 @@ def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
 ) -> User:
-    """Obtenir l'utilisateur actuel à partir du token"""
+    """Obtenir l'utilisateur actuel à partir du token
+
+    L'utilisateur retourné est une copie détachée de la session : pour le
+    modifier, recharger l'enregistrement avec db.get(User, current_user.id).
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Impossible de valider les identifiants",
@@ -60,6 +109,12 @@ def get_current_user(
     )
     
     token = credentials.credentials
+    cached = principal_cache.get(("principal", token))
+    if cached is not None:
+        expires_at, snapshot = cached
+        if expires_at is None or expires_at > time.time():
+            return User(**snapshot)
+    
     payload = verify_token(token)
     if payload is None:
         raise credentials_exception
@@ -72,7 +127,9 @@ def get_current_user(
     if user is None:
         raise credentials_exception
     
-    return user
+    snapshot = _user_snapshot(user)
+    principal_cache.set(("principal", token), (payload.get("exp"), snapshot), [f"user:{user.id}"])
+    return User(**snapshot)
 
 def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
     """Obtenir l'utilisateur actuel actif"""
@@ -0,0 +1,154 @@
+"""
+Outils partagés par les scripts de benchmark
+
+Chaque benchmark travaille dans un répertoire temporaire pour ne jamais
+toucher à la base de production (gestion_stock.db).
+
+Pour exécuter les scripts sur PostgreSQL, définir DATABASE_URL vers une base
+de test dédiée (par exemple un serveur local lancé avec pgserver) :
+  DATABASE_URL=postgresql://postgres:@/gestion_stock?host=/tmp/pgdata python benchmarks/...
+"""
+import os
+import random
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+CATEGORIES = ["office_supplies", "equipment", "maintenance", "fuel", "food", "cleaning", "security", "other"]
+SUPPLIERS = [f"Fournisseur {i}" for i in range(50)]
+
+
+def use_temporary_database():
+    """Se placer dans un répertoire temporaire avant d'importer `database`"""
+    workdir = tempfile.mkdtemp(prefix="bench_gestion_stock_")
+    os.chdir(workdir)
+    return workdir
+
+
+def seed(purchases=10000, fuel_records=10000, maintenance_records=5000, stock_items=500, vehicles=50, batch_size=10000):
+    """Remplir la base avec des données synthétiques réparties sur 3 ans"""
+    from database import engine, create_tables
+    from models import Purchase, FuelRecord, MaintenanceRecord, StockItem, Vehicle
+
+    create_tables()
+    rng = random.Random(42)
+    start = datetime.utcnow() - timedelta(days=3 * 365)
+
+    def random_date():
+        return start + timedelta(seconds=rng.randint(0, 3 * 365 * 86400))
+
+    def insert(model, total, factory):
+        for offset in range(0, total, batch_size):
+            rows = [factory(i) for i in range(offset, min(offset + batch_size, total))]
+            with engine.begin() as conn:
+                conn.execute(model.__table__.insert(), rows)
+
+    insert(Vehicle, vehicles, lambda i: {
+        "plate_number": f"BEN-{i:04d}", "brand": rng.choice(["Toyota", "Ford", "Nissan"]),
+        "model": "Modèle", "current_mileage": rng.randint(0, 200000), "status": "active",
+    })
+    insert(StockItem, stock_items, lambda i: {
+        "name": f"Article {i}", "category": rng.choice(CATEGORIES), "current_quantity": rng.randint(0, 500),
+        "min_threshold": 10, "max_threshold": 400, "unit": "pièce", "is_active": True,
+    })
+
+    def purchase(i):
+        quantity = rng.randint(1, 20)
+        unit_price = round(rng.uniform(1, 500), 2)
+        date = random_date()
+        return {
+            "item_name": f"Article {rng.randint(0, stock_items - 1)}", "category": rng.choice(CATEGORIES),
+            "period": "monthly", "amount": quantity * unit_price, "quantity": quantity, "unit_price": unit_price,
+            "total": quantity * unit_price, "supplier": rng.choice(SUPPLIERS), "purchase_date": date,
+            "created_at": date, "updated_at": date,
+        }
+    insert(Purchase, purchases, purchase)
+
+    def fuel(i):
+        quantity = round(rng.uniform(10, 80), 1)
+        date = random_date()
+        return {
+            "vehicle_id": rng.randint(1, vehicles), "fuel_type": "Diesel", "quantity": quantity,
+            "price_per_liter": 12000.0, "total_cost": quantity * 12000.0, "refuel_date": date, "created_at": date,
+        }
+    insert(FuelRecord, fuel_records, fuel)
+
+    def maintenance(i):
+        date = random_date()
+        return {
+            "vehicle_id": rng.randint(1, vehicles), "maintenance_type": rng.choice(["Vidange", "Révision", "Freins"]),
+            "cost": round(rng.uniform(100, 5000), 2), "service_date": date,
+            "next_service_due": date + timedelta(days=180), "created_at": date,
+        }
+    insert(MaintenanceRecord, maintenance_records, maintenance)
+
+    from database import SessionLocal
+    from rollups import rebuild_rollups
+    db = SessionLocal()
+    try:
+        rebuild_rollups(db)
+    finally:
+        db.close()
+
+
+def signature_png(width=400, height=150, seed=0) -> bytes:
+    """Image PNG en niveaux de gris imitant une signature manuscrite"""
+    import struct
+    import zlib
+
+    rng = random.Random(seed)
+    pixels = [[255] * width for _ in range(height)]
+    x, y = 20.0, height / 2
+    for _ in range(1500):
+        x = min(width - 3, max(2, x + rng.uniform(-1, 1.6)))
+        y = min(height - 3, max(2, y + rng.uniform(-2, 2)))
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                pixels[int(y) + dy][int(x) + dx] = 20
+    raw = b"".join(b"\x00" + bytes(row) for row in pixels)
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 0, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw)) + chunk(b"IEND", b""))
+
+
+def seed_receipts(count=100):
+    """Demandes d'achat réceptionnées avec signature (bons de réception PDF) ; retourne leurs ids"""
+    import base64
+    from database import engine, create_tables
+    from models import PurchaseRequest, User
+
+    create_tables()
+    with engine.connect() as conn:
+        user_id = conn.execute(User.__table__.select().with_only_columns(User.id).order_by(User.id).limit(1)).scalar()
+    rng = random.Random(42)
+    # Signatures en base64 dans les lignes, comme avant le stockage de fichiers (migration 0004)
+    signatures = ["data:image/png;base64," + base64.b64encode(signature_png(seed=i)).decode() for i in range(10)]
+    received_at = datetime.utcnow() - timedelta(days=3)
+    rows = [{
+        "request_number": f"DA-BENCH-{i:05d}", "item_name": f"Article {i}", "description": "Fourniture de bureau",
+        "category": rng.choice(CATEGORIES), "quantity": rng.randint(1, 50), "unit": "pièce", "status": "received",
+        "justification": "Réapprovisionnement", "requested_by": "Demandeur", "requested_by_user_id": user_id,
+        "department": "Logistique", "requested_at": received_at - timedelta(days=10),
+        "order_number": f"BC-BENCH-{i:05d}", "received_at": received_at, "received_by": "Magasinier",
+        "dg_signature": signatures[(i + 5) % len(signatures)], "receipt_signature": signatures[i % len(signatures)],
+        "receipt_notes": "Livraison conforme",
+    } for i in range(count)]
+    with engine.begin() as conn:
+        ids = conn.execute(PurchaseRequest.__table__.insert().returning(PurchaseRequest.id, sort_by_parameter_order=True), rows).scalars().all()
+    return list(ids)
+
+
+def percentile(values, pct):
+    """Percentile simple (méthode du rang le plus proche)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la résolution de l'utilisateur authentifié (auth.get_current_user)
+
+Compare, sans cache (AUTH_CACHE_TTL=0) puis avec le cache des identités :
+  - le coût de get_current_user seul (jwt.decode + requête SQL, ou lecture du cache)
+  - la latence et le nombre de requêtes SQL d'un appel d'API protégé
+
+Usage : python benchmarks/bench_auth.py [--requests 2000]
+"""
+import argparse
+import time
+
+from _common import use_temporary_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    use_temporary_database()
+    from fastapi.security import HTTPAuthorizationCredentials
+    from fastapi.testclient import TestClient
+    from database import SessionLocal
+    from auth import get_current_user, principal_cache
+    from main import app
+
+    with TestClient(app) as client:
+        token = client.post("/api/auth/login-json", json={"username": "admin", "password": "admin123"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+        for label, ttl in (("sans cache", 0.0), ("avec cache", 60.0)):
+            principal_cache.ttl = ttl
+            principal_cache.clear()
+
+            db = SessionLocal()
+            started = time.perf_counter()
+            for _ in range(args.requests):
+                get_current_user(credentials, db)
+            resolve_us = (time.perf_counter() - started) / args.requests * 1e6
+            db.close()
+
+            started = time.perf_counter()
+            for _ in range(args.requests):
+                response = client.get("/api/purchase-requests/", headers=headers)
+            request_ms = (time.perf_counter() - started) / args.requests * 1000
+
+            print(f"  {label:<11} get_current_user {resolve_us:8.1f} µs   "
+                  f"GET /api/purchase-requests/ {request_ms:6.2f} ms   "
+                  f"{response.headers['x-query-count']} requêtes SQL")
+
+
+if __name__ == "__main__":
+    main()
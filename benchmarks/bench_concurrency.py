@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark de concurrence : latence de /api/stock/items pendant qu'un rapport
+lourd (/api/reports/financial/summary) tourne en parallèle.
+
+Avec des routes `async def` qui utilisent une session synchrone, chaque
+requête du rapport bloque la boucle d'événements et la p99 de la liste du
+stock explose. Avec des routes `def` exécutées dans le pool de threads,
+la liste du stock reste réactive.
+
+Usage : python benchmarks/bench_concurrency.py [--rows 20000] [--requests 200]
+(nécessite httpx : pip install httpx)
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from _common import use_temporary_database, seed, percentile
+
+
+async def measure(client, requests):
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = await client.get("/api/stock/items")
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+async def report_load(client, stop):
+    while not stop.is_set():
+        await client.get("/api/reports/financial/summary")
+
+
+async def run(requests, report_workers):
+    import httpx
+    from main import app
+
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        idle = await measure(client, requests)
+
+        stop = asyncio.Event()
+        background = [asyncio.create_task(report_load(client, stop)) for _ in range(report_workers)]
+        await asyncio.sleep(0.1)
+        loaded = await measure(client, requests)
+        stop.set()
+        await asyncio.gather(*background)
+
+    for label, latencies in (("sans charge", idle), ("avec rapports en parallèle", loaded)):
+        print(f"/api/stock/items {label:>28}: "
+              f"p50={statistics.median(latencies):7.2f} ms  "
+              f"p99={percentile(latencies, 99):7.2f} ms  "
+              f"max={max(latencies):7.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000, help="Nombre d'achats/carburants/entretiens générés")
+    parser.add_argument("--requests", type=int, default=200, help="Nombre de requêtes mesurées")
+    parser.add_argument("--report-workers", type=int, default=4, help="Rapports lancés en parallèle")
+    args = parser.parse_args()
+
+    # Désactiver le cache des rapports : chaque requête doit recalculer le rapport
+    os.environ.setdefault("REPORT_CACHE_TTL", "0")
+    use_temporary_database()
+    seed(purchases=args.rows, fuel_records=args.rows, maintenance_records=args.rows // 2)
+    asyncio.run(run(args.requests, args.report_workers))
+
+
+if __name__ == "__main__":
+    main()
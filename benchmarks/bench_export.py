@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark de l'export en flux : mémoire du worker selon la taille de l'export
+
+Lance le serveur (uvicorn, un worker) dans un processus séparé et télécharge
+en flux chaque scénario, en relevant le pic de mémoire résidente du serveur
+(VmHWM, Linux). Un nouveau serveur est lancé pour chaque scénario.
+
+Scénarios :
+  - liste JSON complète /api/stock-movements/ (document construit en mémoire)
+  - /api/export/stock-movements en CSV et en NDJSON
+  - /api/export/fuel en CSV (historique carburant de plusieurs années)
+
+Usage : python benchmarks/bench_export.py [--rows 200000]
+(nécessite httpx : pip install httpx)
+"""
+import argparse
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+
+from _common import ROOT_DIR, use_temporary_database, seed
+
+SCENARIOS = [
+    ("liste JSON /api/stock-movements/", "/api/stock-movements/"),
+    ("export CSV mouvements", "/api/export/stock-movements?format=csv"),
+    ("export NDJSON mouvements", "/api/export/stock-movements?format=ndjson"),
+    ("export CSV carburant", "/api/export/fuel?format=csv"),
+]
+
+
+def seed_movements(rows):
+    from sqlalchemy import insert
+    from database import engine
+    from models import StockMovement
+
+    rng = random.Random(42)
+    for offset in range(0, rows, 10000):
+        with engine.begin() as connection:
+            connection.execute(insert(StockMovement), [
+                {"stock_item_id": rng.randint(1, 500), "movement_type": rng.choice(["in", "out"]),
+                 "quantity": rng.randint(1, 20), "reason": "Réception fournisseur", "reference": f"BL-{i:07d}"}
+                for i in range(offset, min(offset + 10000, rows))
+            ])
+
+
+def memory_kb(pid, field):
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    return 0
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def run_scenario(workdir, label, url):
+    import httpx
+
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=workdir, env={**os.environ, "PYTHONPATH": ROOT_DIR}, stdout=subprocess.DEVNULL
+    )
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        for _ in range(200):
+            try:
+                httpx.get(base_url + "/health")
+                break
+            except httpx.TransportError:
+                time.sleep(0.1)
+        with httpx.Client(base_url=base_url, timeout=600) as client:
+            token = client.post("/api/auth/login-json", json={"username": "admin", "password": "admin123"}).json()["access_token"]
+            headers = {"Authorization": f"Bearer {token}", "Accept-Encoding": "identity"}
+            baseline = memory_kb(server.pid, "VmRSS")
+
+            started = time.perf_counter()
+            first_byte = None
+            size = 0
+            with client.stream("GET", url, headers=headers) as response:
+                response.raise_for_status()
+                for chunk in response.iter_raw():
+                    if first_byte is None:
+                        first_byte = time.perf_counter() - started
+                    size += len(chunk)
+            elapsed = time.perf_counter() - started
+        peak = memory_kb(server.pid, "VmHWM")
+        print(f"  {label:<34} {size / 1024 / 1024:8.1f} Mo   premier octet {first_byte * 1000:7.0f} ms   "
+              f"total {elapsed:6.1f} s   pic mémoire serveur +{(peak - baseline) / 1024:7.1f} Mo")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200000, help="Nombre de mouvements de stock et de pleins")
+    args = parser.parse_args()
+
+    workdir = use_temporary_database()
+    from database import init_database
+    init_database()
+    seed(purchases=1000, fuel_records=args.rows, maintenance_records=1000)
+    seed_movements(args.rows)
+
+    print(f"{args.rows} lignes par table")
+    for label, url in SCENARIOS:
+        run_scenario(workdir, label, url)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark de l'import CSV en masse (POST /api/import/{entity})
+
+Génère un fichier CSV par entité (articles de stock, fournisseurs, achats)
+avec quelques lignes invalides, l'envoie à l'API et mesure la durée de
+l'import. Vérifie ensuite le nombre de lignes importées, les erreurs
+signalées, la cohérence des agrégats journaliers d'achats et l'entrée en
+stock des achats importés (quantités, mouvements et registre).
+
+Usage : python benchmarks/bench_import.py [--rows 100000]
+"""
+import argparse
+import csv
+import io
+import random
+import time
+from datetime import datetime, timedelta
+
+from _common import use_temporary_database, CATEGORIES, SUPPLIERS
+
+INVALID_EVERY = 1000  # une ligne invalide toutes les INVALID_EVERY lignes
+
+
+def stock_items_csv(rows, rng):
+    yield ["name", "description", "category", "current_quantity", "min_threshold", "max_threshold", "unit", "location"]
+    for i in range(rows):
+        quantity = "-5" if i % INVALID_EVERY == 1 else str(rng.randint(0, 500))
+        yield [f"Article importé {i}", "", rng.choice(CATEGORIES), quantity, "10", "400", "pièce", "Magasin A"]
+
+
+def suppliers_csv(rows, rng):
+    yield ["name", "contact_person", "email", "phone", "city", "country"]
+    for i in range(rows):
+        email = "adresse-invalide" if i % INVALID_EVERY == 1 else f"contact{i}@fournisseur.gn"
+        yield [f"Fournisseur importé {i}", f"Contact {i}", email, "+224 600 000 000", "Conakry", ""]
+
+
+def purchases_csv(rows, rng):
+    start = datetime.utcnow() - timedelta(days=3 * 365)
+    yield ["item_name", "category", "period", "amount", "quantity", "unit_price", "supplier", "purchase_date"]
+    for i in range(rows):
+        quantity = rng.randint(1, 20)
+        unit_price = round(rng.uniform(1, 500), 2)
+        category = "inconnue" if i % INVALID_EVERY == 1 else rng.choice(CATEGORIES)
+        date = start + timedelta(seconds=rng.randint(0, 3 * 365 * 86400))
+        yield [f"Article {rng.randint(0, 499)}", category, "monthly", f"{quantity * unit_price:.2f}",
+               str(quantity), f"{unit_price:.2f}", rng.choice(SUPPLIERS), date.isoformat()]
+
+
+def build_csv(generator):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(generator)
+    return buffer.getvalue().encode("utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000, help="Lignes par fichier")
+    args = parser.parse_args()
+
+    use_temporary_database()
+    from database import init_database, SessionLocal
+    init_database()
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy import func
+    from main import app
+    from models import Purchase, DailyPurchaseRollup, StockItem, StockMovement
+    from ledger import reconcile
+
+    def stock_quantities():
+        db = SessionLocal()
+        try:
+            return {(name, getattr(category, "value", category)): quantity for name, category, quantity in
+                    db.query(StockItem.name, StockItem.category, StockItem.current_quantity)}
+        finally:
+            db.close()
+
+    rng = random.Random(42)
+    with TestClient(app) as client:
+        token = client.post("/api/auth/login-json", json={"username": "admin", "password": "admin123"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        for entity, generator in (("stock-items", stock_items_csv), ("suppliers", suppliers_csv), ("purchases", purchases_csv)):
+            if entity == "purchases":
+                db = SessionLocal()
+                last_purchase_id = db.query(func.coalesce(func.max(Purchase.id), 0)).scalar()
+                db.close()
+                quantities_before = stock_quantities()
+            content = build_csv(generator(args.rows, rng))
+            started = time.perf_counter()
+            response = client.post(f"/api/import/{entity}", headers=headers,
+                                   files={"file": (f"{entity}.csv", content, "text/csv")})
+            elapsed = time.perf_counter() - started
+            response.raise_for_status()
+            result = response.json()
+            print(f"{entity:<12} {result['total_rows']:>8} lignes ({len(content) / 1024 / 1024:.1f} Mo) en {elapsed:6.1f} s "
+                  f"({result['total_rows'] / elapsed:,.0f} lignes/s) : {result['imported']} importées, "
+                  f"{result['rejected']} refusées")
+            if result["errors"]:
+                print(f"             ex. ligne {result['errors'][0]['line']} : {result['errors'][0]['error'][:90]}")
+
+    db = SessionLocal()
+    try:
+        purchases = db.query(func.count(Purchase.id), func.sum(Purchase.amount)).one()
+        rollups = db.query(func.sum(DailyPurchaseRollup.purchase_count), func.sum(DailyPurchaseRollup.total_amount)).one()
+        consistent = purchases[0] == rollups[0] and abs((purchases[1] or 0) - (rollups[1] or 0)) < 0.01
+        print(f"Agrégats d'achats : {rollups[0]} achats ({purchases[0]} en base) - {'cohérents' if consistent else 'INCOHÉRENTS'}")
+
+        # Entrée en stock : hausse de chaque article = quantités achetées importées
+        received = {}
+        for name, category, quantity in db.query(Purchase.item_name, Purchase.category, Purchase.quantity).filter(
+            Purchase.id > last_purchase_id
+        ):
+            key = (name, getattr(category, "value", category))
+            received[key] = received.get(key, 0) + quantity
+        quantities_after = stock_quantities()
+        mismatches = sum(
+            1 for key in set(received) | set(quantities_after)
+            if quantities_after.get(key, 0) - quantities_before.get(key, 0) != received.get(key, 0)
+        )
+        movements = db.query(func.count(StockMovement.id)).filter(StockMovement.reference.like("ACH-%")).scalar()
+        imported = db.query(func.count(Purchase.id)).filter(Purchase.id > last_purchase_id).scalar()
+        drifted = reconcile(db)["drifted"]
+        print(f"Entrée en stock : {len(received)} articles, {mismatches} quantités incohérentes, "
+              f"{movements} mouvements d'entrée pour {imported} achats importés, {drifted} écarts au registre - "
+              f"{'cohérente' if not mismatches and movements >= imported and not drifted else 'INCOHÉRENTE'}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark des tâches en arrière-plan (POST /api/jobs)
+
+Génère N bons de réception PDF :
+  - en ligne, un appel GET /api/pdf/receipt/{id} à la fois (le rendu
+    ReportLab occupe le worker pendant toute la requête) ;
+  - en tâches : N POST /api/jobs puis attente de la fin de toutes les
+    tâches, exécutées en parallèle par le pool de processus.
+
+Affiche la latence des requêtes (rendu en ligne vs mise en file) et le
+débit total. Le premier lot de tâches inclut le démarrage du pool.
+
+Usage : python benchmarks/bench_jobs.py [--receipts 200] [--workers 4]
+"""
+import argparse
+import os
+import time
+
+from _common import use_temporary_database, seed_receipts, percentile
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--receipts", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Processus du pool (JOB_WORKERS)")
+    args = parser.parse_args()
+
+    os.environ["JOB_WORKERS"] = str(args.workers)
+    os.environ.setdefault("JOB_QUEUE_SIZE", str(args.receipts))
+    use_temporary_database()
+    from database import init_database
+    init_database()
+    request_ids = seed_receipts(args.receipts)
+
+    from fastapi.testclient import TestClient
+    from main import app
+
+    with TestClient(app) as client:
+        token = client.post("/api/auth/login-json", json={"username": "admin", "password": "admin123"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        latencies = []
+        started = time.perf_counter()
+        for request_id in request_ids:
+            begin = time.perf_counter()
+            client.get(f"/api/pdf/receipt/{request_id}", headers=headers).raise_for_status()
+            latencies.append(time.perf_counter() - begin)
+        elapsed = time.perf_counter() - started
+        print(f"en ligne        : {args.receipts} PDF en {elapsed:6.2f} s ({args.receipts / elapsed:6.1f}/s), "
+              f"latence p50 {percentile(latencies, 50) * 1000:6.1f} ms")
+
+        for label in ("tâches (froid)", "tâches"):
+            latencies = []
+            started = time.perf_counter()
+            job_ids = []
+            for request_id in request_ids:
+                begin = time.perf_counter()
+                response = client.post("/api/jobs/", json={"kind": "receipt-pdf", "params": {"request_id": request_id}}, headers=headers)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - begin)
+                job_ids.append(response.json()["id"])
+            remaining = set(job_ids)
+            while remaining:
+                for job_id in list(remaining):
+                    if client.get(f"/api/jobs/{job_id}", headers=headers).json()["status"] in ("succeeded", "failed"):
+                        remaining.discard(job_id)
+                time.sleep(0.02)
+            elapsed = time.perf_counter() - started
+            print(f"{label:<15} : {args.receipts} PDF en {elapsed:6.2f} s ({args.receipts / elapsed:6.1f}/s), "
+                  f"mise en file p50 {percentile(latencies, 50) * 1000:6.1f} ms ({args.workers} processus)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark du registre des stocks (ledger.py)
+
+Crée --items articles avec --entries variations chacun réparties sur 3 ans,
+puis mesure :
+  - le surcoût d'écriture d'un mouvement (UPDATE + ligne du registre +
+    commit) comparé au seul UPDATE conditionnel ;
+  - le temps de quantity_as_of() à des dates aléatoires, sans instantané
+    puis avec des instantanés pris chaque mois (toutes les --every
+    variations d'un article) ;
+  - le temps de take_snapshots() et de reconcile() sur tous les articles.
+
+Usage : python benchmarks/bench_ledger.py [--items 500] [--entries 1000] [--every 100]
+"""
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from _common import use_temporary_database, seed, percentile
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--entries", type=int, default=1000)
+    parser.add_argument("--every", type=int, default=100)
+    parser.add_argument("--runs", type=int, default=500)
+    args = parser.parse_args()
+
+    use_temporary_database()
+    seed(purchases=0, fuel_records=0, maintenance_records=0, stock_items=args.items, vehicles=0)
+    from database import SessionLocal, engine
+    from models import LedgerEntryKind, StockItem
+    from inventory import _update, increment_quantity
+    from ledger import entry, record, quantity_as_of, take_snapshots, reconcile
+
+    rng = random.Random(42)
+    db = SessionLocal()
+    try:
+        item_ids = [item_id for item_id, in db.query(StockItem.id).order_by(StockItem.id).all()]
+        now = datetime.utcnow()
+        start = now - timedelta(days=3 * 365)
+
+        # Historique : variations datées, quantités finales cohérentes avec le registre
+        started = time.perf_counter()
+        quantities = {}
+        for item_id in item_ids:
+            dates = sorted(start + timedelta(seconds=rng.uniform(0, (now - start).total_seconds())) for _ in range(args.entries))
+            rows, quantity = [], 0
+            for created_at in dates:
+                delta = rng.randint(1, 50) if quantity < 25 or rng.random() < 0.5 else -rng.randint(1, quantity)
+                quantity += delta
+                rows.append(entry(item_id, delta, LedgerEntryKind.ENTRY if delta > 0 else LedgerEntryKind.EXIT, created_at=created_at))
+            record(db, rows)
+            quantities[item_id] = quantity
+        for item_id, quantity in quantities.items():
+            _update(db, item_id, {StockItem.current_quantity: quantity})
+        db.commit()
+        print(f"{engine.dialect.name}, {len(item_ids)} articles, {len(item_ids) * args.entries} variations "
+              f"créées en {time.perf_counter() - started:.1f} s")
+
+        # Surcoût d'écriture
+        for label, write in (
+            ("UPDATE seul", lambda item_id: _update(db, item_id, {StockItem.current_quantity: StockItem.current_quantity + 1})),
+            ("UPDATE + registre", lambda item_id: increment_quantity(db, item_id, 1)),
+        ):
+            timings = []
+            for _ in range(args.runs):
+                item_id = rng.choice(item_ids)
+                started = time.perf_counter()
+                write(item_id)
+                db.commit()
+                timings.append((time.perf_counter() - started) * 1000)
+            print(f"{label:<18} : médiane {statistics.median(timings):.3f} ms, p99 {percentile(timings, 99):.3f} ms")
+        reconcile(db, repair=True)  # variations des écritures « UPDATE seul »
+        db.commit()
+
+        def measure_as_of():
+            timings = []
+            for _ in range(args.runs):
+                item_id = rng.choice(item_ids)
+                as_of = start + timedelta(seconds=rng.uniform(0, (now - start).total_seconds()))
+                started = time.perf_counter()
+                quantity_as_of(db, item_id, as_of)
+                timings.append((time.perf_counter() - started) * 1000)
+            return statistics.median(timings), percentile(timings, 99)
+
+        median, p99 = measure_as_of()
+        print(f"quantity_as_of sans instantané : médiane {median:.2f} ms, p99 {p99:.2f} ms")
+
+        # Instantanés mensuels, comme le thread périodique au fil de l'historique
+        started = time.perf_counter()
+        taken, passes, month = 0, 0, start
+        while month < now:
+            month += timedelta(days=30)
+            taken += take_snapshots(db, args.every, lag=max(datetime.utcnow() - month, timedelta(0)))
+            db.commit()
+            passes += 1
+        elapsed = time.perf_counter() - started
+        print(f"{taken} instantanés pris en {elapsed:.2f} s ({elapsed / passes * 1000:.0f} ms par passe)")
+        median, p99 = measure_as_of()
+        print(f"quantity_as_of avec instantanés : médiane {median:.2f} ms, p99 {p99:.2f} ms")
+
+        started = time.perf_counter()
+        report = reconcile(db)
+        print(f"reconcile : {report['items_checked']} articles, {report['drifted']} écarts en "
+              f"{(time.perf_counter() - started) * 1000:.0f} ms")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark des listes complètes et allégées (paramètre `fields`)
+
+Pour chaque route de liste, une page de --limit lignes est demandée telle
+quelle puis avec les seules colonnes d'un tableau (fields=...), et les
+lignes par seconde et la taille non compressée par ligne sont relevées.
+Les descriptions, justifications et notes sont remplies d'un paragraphe de
+texte pour représenter des données réelles ; les signatures sont dans le
+stockage de fichiers (migration 0004 appliquée).
+
+Usage : python benchmarks/bench_lists.py [--rows 5000] [--limit 1000] [--runs 10]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from _common import ROOT_DIR, use_temporary_database, seed, seed_receipts, percentile
+
+PARAGRAPH = (
+    "Commande passée suite à la demande du service, livraison attendue sous quinze jours "
+    "avec installation sur site. Prévoir la vérification des références avant réception. "
+) * 3
+
+SCENARIOS = [
+    ("/api/purchase-requests/", "request_number,item_name,quantity,unit,department,status,urgency,requested_at"),
+    ("/api/purchases/", "item_name,category,quantity,unit_price,amount,supplier,purchase_date"),
+    ("/api/suppliers/", "name,contact_person,email,phone,city,is_active"),
+]
+
+
+def seed_text(rows):
+    """Colonnes Text remplies, fournisseurs avec adresse et notes"""
+    from sqlalchemy import insert, update
+    from database import engine
+    from models import Purchase, PurchaseRequest, Supplier
+
+    with engine.begin() as conn:
+        conn.execute(update(Purchase).values(description=PARAGRAPH))
+        conn.execute(update(PurchaseRequest).values(description=PARAGRAPH, justification=PARAGRAPH))
+        conn.execute(insert(Supplier), [{
+            "name": f"Fournisseur bench {i}", "contact_person": "Contact", "email": f"contact{i}@example.com",
+            "phone": "+224 600 00 00 00", "address": "Quartier Almamya, Kaloum", "city": "Conakry",
+            "country": "Guinée", "tax_number": f"NIF-{i:06d}", "payment_terms": "30 jours fin de mois",
+            "notes": PARAGRAPH, "is_active": True,
+        } for i in range(rows)])
+
+
+def measure(client, headers, url, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        response = client.get(url, headers={**headers, "Accept-Encoding": "identity"})
+        timings.append(time.perf_counter() - started)
+        response.raise_for_status()
+    return len(response.json()), len(response.content), timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000, help="Lignes par table")
+    parser.add_argument("--limit", type=int, default=1000, help="Lignes par page")
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    use_temporary_database()
+    os.environ["BLOB_STORE_DIR"] = tempfile.mkdtemp(prefix="bench_blobs_")
+    from database import init_database, engine
+    init_database()
+    seed(purchases=args.rows, fuel_records=0, maintenance_records=0)
+    seed_receipts(args.rows)
+    seed_text(args.rows)
+
+    from alembic import command
+    from alembic.config import Config
+    command.upgrade(Config(os.path.join(ROOT_DIR, "alembic.ini")), "head")
+    engine.dispose()
+
+    from fastapi.testclient import TestClient
+    from main import app
+
+    print(f"Pages de {args.limit} lignes, {args.runs} appels par mesure")
+    with TestClient(app) as client:
+        token = client.post("/api/auth/login-json", json={"username": "admin", "password": "admin123"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        for path, fields in SCENARIOS:
+            print(path)
+            for label, url in (
+                ("complète", f"{path}?limit={args.limit}"),
+                ("fields=", f"{path}?limit={args.limit}&fields={fields}"),
+            ):
+                rows, size, timings = measure(client, headers, url, args.runs)
+                median = statistics.median(timings)
+                print(f"  {label:<9} {rows / median:9.0f} lignes/s (médiane {median * 1000:6.1f} ms, "
+                      f"p95 {percentile(timings, 95) * 1000:6.1f} ms), {size / rows:6.0f} o/ligne")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark d'une vague de connexions (arrivée du matin)
+
+Lance des connexions concurrentes sur /api/auth/login-json pendant qu'un
+client mesure la latence d'une route sans rapport (/api/stock/items).
+Le hachage des mots de passe tourne dans un exécuteur dédié borné
+(PASSWORD_HASH_WORKERS) : la route du stock doit rester réactive.
+
+Usage : python benchmarks/bench_login_storm.py [--concurrency 50] [--seconds 10] [--hash-workers 4]
+(nécessite httpx : pip install httpx)
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from _common import use_temporary_database, percentile
+
+
+async def login_loop(client, stop, latencies, failures):
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = await client.post("/api/auth/login-json", json={"username": "admin", "password": "admin123"})
+        if response.status_code == 200:
+            latencies.append((time.perf_counter() - started) * 1000)
+        else:
+            failures.append(response.status_code)
+
+
+async def probe(client, stop, latencies):
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = await client.get("/api/stock/items")
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(0.01)
+
+
+def describe(label, latencies):
+    return (f"{label}: p50={statistics.median(latencies):7.2f} ms  "
+            f"p99={percentile(latencies, 99):7.2f} ms  max={max(latencies):7.2f} ms")
+
+
+async def run(concurrency, seconds):
+    import httpx
+    from main import app
+
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        idle, stop = [], asyncio.Event()
+        task = asyncio.create_task(probe(client, stop, idle))
+        await asyncio.sleep(min(2.0, seconds))
+        stop.set()
+        await task
+
+        logins, failures, loaded, stop = [], [], [], asyncio.Event()
+        tasks = [asyncio.create_task(login_loop(client, stop, logins, failures)) for _ in range(concurrency)]
+        tasks.append(asyncio.create_task(probe(client, stop, loaded)))
+        started = time.perf_counter()
+        await asyncio.sleep(seconds)
+        stop.set()
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+
+    print(f"Connexions : {len(logins) / elapsed:.1f}/s ({len(logins)} réussies, {len(failures)} échecs)")
+    print("  " + describe("latence connexion", logins))
+    print("  " + describe("/api/stock/items sans charge", idle))
+    print("  " + describe("/api/stock/items pendant la vague", loaded))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=50, help="Connexions simultanées")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--hash-workers", type=int, default=None, help="Taille de l'exécuteur de hachage")
+    args = parser.parse_args()
+
+    if args.hash_workers:
+        os.environ["PASSWORD_HASH_WORKERS"] = str(args.hash_workers)
+    use_temporary_database()
+    from database import init_database
+    init_database()  # utilisateur admin et quelques articles
+    asyncio.run(run(args.concurrency, args.seconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark des pages HTML : import à froid et octets transférés
+
+- Import à froid : durée de `import main` dans un nouveau processus
+  (médiane sur plusieurs lancements), temps propre au module main
+  (-X importtime) et mémoire résidente du processus.
+- Octets transférés : pour chaque page, première visite (page + fichiers
+  /static/ qu'elle référence, avec Accept-Encoding: br, gzip) puis visite
+  suivante avec le cache du navigateur (If-None-Match sur la page, fichiers
+  Cache-Control: immutable non redemandés).
+
+Usage : python benchmarks/bench_pages.py [--runs 5]
+"""
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+
+from _common import ROOT_DIR, use_temporary_database
+
+PAGES = [
+    "/", "/login", "/dashboard", "/purchase-requests", "/purchases", "/vehicles", "/stock", "/reports",
+    "/services", "/service-providers", "/suppliers", "/approval/1", "/new-purchase-request",
+    "/new-vehicle", "/new-service", "/new-supplier",
+]
+STATIC_REFERENCE = re.compile(r'(?:href|src)="(/static/[^"]+)"')
+
+IMPORT_SNIPPET = """
+import resource, sys, time
+sys.path.insert(0, {root!r})
+started = time.perf_counter()
+import main
+elapsed = time.perf_counter() - started
+print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def measure_import(runs):
+    workdir = use_temporary_database()
+    durations, own_durations, peaks = [], [], []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", IMPORT_SNIPPET.format(root=ROOT_DIR)],
+            cwd=workdir, capture_output=True, text=True, check=True
+        )
+        output = result.stdout.split()
+        durations.append(float(output[-2]) * 1000)
+        peaks.append(int(output[-1]))  # Ko
+        # Ligne "import time: self [us] | cumulative | main" : temps propre au module main
+        for line in result.stderr.splitlines():
+            columns = [column.strip() for column in line.split("|")]
+            if len(columns) == 3 and columns[2] == "main":
+                own_durations.append(int(columns[0].split()[-1]) / 1000)
+    print(f"import main : {statistics.median(durations):.0f} ms (médiane sur {runs}), "
+          f"dont module main seul {statistics.median(own_durations):.1f} ms, "
+          f"mémoire résidente du processus {statistics.median(peaks) / 1024:.1f} Mo")
+
+
+def wire_size(response):
+    return int(response.headers.get("content-length", len(response.content)))
+
+
+def measure_pages():
+    from fastapi.testclient import TestClient
+    from main import app
+
+    encodings = {"Accept-Encoding": "br, gzip"}
+    totals = {"raw": 0, "first": 0, "repeat": 0}
+    print(f"\n{'page':<24}{'non compressé':>15}{'1re visite':>12}{'visite suivante':>17}")
+    with TestClient(app) as client:
+        for page in PAGES:
+            response = client.get(page, headers=encodings)
+            raw = len(response.content)
+            first = wire_size(response)
+            repeat_headers = dict(encodings)
+            if "etag" in response.headers:
+                repeat_headers["If-None-Match"] = response.headers["etag"]
+            repeat = wire_size(client.get(page, headers=repeat_headers))
+
+            for url in sorted(set(STATIC_REFERENCE.findall(response.text))):
+                asset = client.get(url, headers=encodings)
+                raw += len(asset.content)
+                first += wire_size(asset)
+                if "immutable" not in asset.headers.get("cache-control", ""):
+                    repeat += wire_size(client.get(url, headers=encodings))
+
+            totals["raw"] += raw
+            totals["first"] += first
+            totals["repeat"] += repeat
+            print(f"{page:<24}{raw:>15,}{first:>12,}{repeat:>17,}")
+    print(f"{'total':<24}{totals['raw']:>15,}{totals['first']:>12,}{totals['repeat']:>17,}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Nombre d'imports à froid")
+    args = parser.parse_args()
+
+    measure_import(args.runs)
+    measure_pages()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Benchmark de l'entrée en stock des achats (création d'achat et facture fournisseur)
+
+Mesure :
+  - la création d'achats un par un (create_purchase) : durée et nombre de
+    requêtes SQL par achat ;
+  - l'enregistrement de factures de N lignes (create_purchase_invoice) ;
+  - des achats concurrents du même article neuf (un thread = une session) :
+    un seul article doit être créé par (nom, catégorie).
+
+Vérifie ensuite que le stock de chaque article est égal à la somme de ses
+mouvements d'entrée et que les agrégats d'achats sont cohérents.
+
+Usage : python benchmarks/bench_purchases.py [--purchases 2000] [--invoice-lines 200] [--threads 16]
+"""
+import argparse
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from _common import use_temporary_database, CATEGORIES, SUPPLIERS
+
+
+def purchase_line(rng, items):
+    quantity = rng.randint(1, 20)
+    unit_price = round(rng.uniform(1, 500), 2)
+    return {
+        "item_name": f"Article {rng.randint(0, items - 1)}", "category": rng.choice(CATEGORIES),
+        "period": "monthly", "quantity": quantity, "unit_price": unit_price,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--purchases", type=int, default=2000, help="Achats créés un par un")
+    parser.add_argument("--invoices", type=int, default=20, help="Factures fournisseur")
+    parser.add_argument("--invoice-lines", type=int, default=200, help="Lignes par facture")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--items", type=int, default=300, help="Articles distincts")
+    args = parser.parse_args()
+
+    use_temporary_database()
+    from sqlalchemy import event, func
+    from database import SessionLocal, create_tables, engine
+    from models import DailyPurchaseRollup, Purchase, StockItem, StockMovement
+    from schemas import PurchaseCreate, PurchaseInvoice
+    from routers.purchases import create_purchase, create_purchase_invoice
+
+    create_tables()
+    statements = [0]
+    event.listen(engine, "before_cursor_execute", lambda *_: statements.__setitem__(0, statements[0] + 1))
+
+    def run(function, payload):
+        session = SessionLocal()
+        try:
+            return function(payload, db=session)
+        finally:
+            session.close()
+
+    rng = random.Random(42)
+    singles = []
+    for _ in range(args.purchases):
+        line = purchase_line(rng, args.items)
+        singles.append(PurchaseCreate(**line, amount=line["quantity"] * line["unit_price"], total=0,
+                                      supplier=rng.choice(SUPPLIERS)))
+    statements[0] = 0
+    started = time.perf_counter()
+    for purchase in singles:
+        run(create_purchase, purchase)
+    elapsed = time.perf_counter() - started
+    print(f"achats un par un : {args.purchases} en {elapsed:.2f} s ({elapsed / args.purchases * 1000:.2f} ms/achat, "
+          f"{statements[0] / args.purchases:.1f} requêtes SQL/achat)")
+
+    invoices = [
+        PurchaseInvoice(supplier=rng.choice(SUPPLIERS), lines=[purchase_line(rng, args.items) for _ in range(args.invoice_lines)])
+        for _ in range(args.invoices)
+    ]
+    statements[0] = 0
+    started = time.perf_counter()
+    for invoice in invoices:
+        run(create_purchase_invoice, invoice)
+    elapsed = time.perf_counter() - started
+    lines = args.invoices * args.invoice_lines
+    print(f"factures         : {args.invoices} x {args.invoice_lines} lignes en {elapsed:.2f} s "
+          f"({elapsed / lines * 1000:.2f} ms/ligne, {statements[0] / args.invoices:.1f} requêtes SQL/facture)")
+
+    # Achats concurrents d'articles qui n'existent pas encore
+    concurrent = [
+        PurchaseCreate(item_name=f"Nouvel article {i % 8}", category="other", period="monthly",
+                       amount=10, quantity=1, unit_price=10, total=0)
+        for i in range(args.threads * 20)
+    ]
+
+    def send(purchase):
+        try:
+            run(create_purchase, purchase)
+            return "ok"
+        except Exception as exc:  # verrou SQLite expiré, etc.
+            return type(exc).__name__
+
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        outcomes = list(pool.map(send, concurrent))
+    counts = {}
+    for outcome in outcomes:
+        counts[outcome] = counts.get(outcome, 0) + 1
+    print(f"achats concurrents ({args.threads} threads) : " + ", ".join(f"{name}: {count}" for name, count in sorted(counts.items())))
+
+    db = SessionLocal()
+    try:
+        errors = 0
+        created = db.query(func.count(StockItem.id)).filter(StockItem.name.like("Nouvel article %")).scalar()
+        if created != 8:
+            errors += 1
+        print(f"  {'✅' if created == 8 else '❌'} {created} articles créés pour 8 articles distincts")
+
+        movements = dict(db.query(StockMovement.stock_item_id, func.sum(StockMovement.quantity)).group_by(StockMovement.stock_item_id))
+        mismatched = [
+            item_id for item_id, quantity in db.query(StockItem.id, StockItem.current_quantity)
+            if quantity != movements.get(item_id, 0)
+        ]
+        if mismatched:
+            errors += 1
+        print(f"  {'❌' if mismatched else '✅'} stock = somme des entrées pour {len(movements) - len(mismatched)}/{len(movements)} articles")
+
+        purchases = db.query(func.count(Purchase.id), func.sum(Purchase.amount)).one()
+        rollups = db.query(func.sum(DailyPurchaseRollup.purchase_count), func.sum(DailyPurchaseRollup.total_amount)).one()
+        consistent = purchases[0] == rollups[0] and abs((purchases[1] or 0) - (rollups[1] or 0)) < 0.01
+        if not consistent:
+            errors += 1
+        print(f"  {'✅' if consistent else '❌'} agrégats : {rollups[0]} achats ({purchases[0]} en base)")
+    finally:
+        db.close()
+
+    if errors:
+        sys.exit("Entrées en stock incohérentes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark des bons de réception PDF (bons par seconde)
+
+Scénarios :
+  - rendu d'un bon à la fois, styles reconstruits à chaque bon (comme avant) ;
+  - rendu d'un bon à la fois, styles réutilisés ;
+  - GET /api/pdf/receipts (ZIP) sans cache : rendu en parallèle par le pool
+    de processus (démarrage du pool inclus) ;
+  - le même lot une seconde fois (cache adressé par contenu) ;
+  - le même lot en un seul PDF fusionné (pypdf).
+
+Usage : python benchmarks/bench_receipts.py [--receipts 500] [--workers 4]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from _common import use_temporary_database, seed_receipts
+
+
+def report(label, count, elapsed, size=None):
+    extra = f", {size / 1024 / 1024:.1f} Mo" if size is not None else ""
+    print(f"  {label:<42} {count} bons en {elapsed:6.2f} s : {count / elapsed:7.1f} bons/s{extra}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--receipts", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Processus du pool (JOB_WORKERS)")
+    args = parser.parse_args()
+
+    cache_dir = tempfile.mkdtemp(prefix="bench_receipts_cache_")
+    os.environ["RECEIPT_CACHE_DIR"] = cache_dir
+    os.environ["JOB_WORKERS"] = str(args.workers)
+    use_temporary_database()
+    from database import init_database, SessionLocal
+    init_database()
+    request_ids = seed_receipts(args.receipts)
+
+    from sqlalchemy.orm import joinedload
+    from models import PurchaseRequest
+    import receipts
+
+    db = SessionLocal()
+    try:
+        datas = [
+            receipts.receipt_data(request)
+            for request in db.query(PurchaseRequest).options(joinedload(PurchaseRequest.supplier)).filter(
+                PurchaseRequest.id.in_(request_ids)
+            )
+        ]
+    finally:
+        db.close()
+
+    print(f"{args.receipts} bons de réception, {args.workers} processus")
+    sample = datas[:min(100, len(datas))]
+    started = time.perf_counter()
+    for data in sample:
+        receipts._styles.cache_clear()
+        receipts.render_receipt(data)
+    report("un par un, styles reconstruits", len(sample), time.perf_counter() - started)
+
+    started = time.perf_counter()
+    for data in sample:
+        receipts.render_receipt(data)
+    report("un par un, styles réutilisés", len(sample), time.perf_counter() - started)
+
+    from fastapi.testclient import TestClient
+    from main import app
+
+    try:
+        with TestClient(app) as client:
+            token = client.post("/api/auth/login-json", json={"username": "admin", "password": "admin123"}).json()["access_token"]
+            headers = {"Authorization": f"Bearer {token}"}
+            for label, url in (
+                ("lot ZIP, sans cache (rendu en parallèle)", "/api/pdf/receipts?format=zip"),
+                ("lot ZIP, depuis le cache", "/api/pdf/receipts?format=zip"),
+                ("lot PDF fusionné, depuis le cache", "/api/pdf/receipts?format=pdf"),
+            ):
+                started = time.perf_counter()
+                response = client.get(url, headers=headers)
+                response.raise_for_status()
+                report(label, args.receipts, time.perf_counter() - started, len(response.content))
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark des rapports : agrégation en Python (ancienne version, chargement
+de chaque ligne en objet ORM) contre agrégation SQL (GROUP BY / SUM / COUNT)
+et agrégats journaliers matérialisés pour les rapports par période.
+
+Mesure la latence et le pic mémoire (tracemalloc) de :
+  - rapport des achats par période (annuel)
+  - rapport des coûts véhicules
+  - résumé financier
+
+Usage : python benchmarks/bench_reports.py [--rows 1000000]
+"""
+import argparse
+import time
+import tracemalloc
+from datetime import datetime
+
+from _common import use_temporary_database, seed
+
+
+def legacy_purchase_period(db, start_date, end_date):
+    from models import Purchase
+    purchases = db.query(Purchase).filter(
+        Purchase.purchase_date >= start_date, Purchase.purchase_date <= end_date
+    ).all()
+    total_amount = sum(p.amount for p in purchases)
+    categories, suppliers = {}, {}
+    for purchase in purchases:
+        entry = categories.setdefault(purchase.category, {"count": 0, "amount": 0.0})
+        entry["count"] += 1
+        entry["amount"] += purchase.amount
+        if purchase.supplier:
+            entry = suppliers.setdefault(purchase.supplier, {"count": 0, "amount": 0.0})
+            entry["count"] += 1
+            entry["amount"] += purchase.amount
+    return {"total_amount": total_amount, "total_items": len(purchases), "categories": categories}
+
+
+def legacy_vehicle_costs(db):
+    from models import MaintenanceRecord, FuelRecord, Vehicle
+    maintenance_records = db.query(MaintenanceRecord).all()
+    fuel_records = db.query(FuelRecord).all()
+    costs = {}
+    for record in maintenance_records:
+        costs.setdefault(record.vehicle_id, {"maintenance": 0.0, "fuel": 0.0})["maintenance"] += record.cost
+    for record in fuel_records:
+        costs.setdefault(record.vehicle_id, {"maintenance": 0.0, "fuel": 0.0})["fuel"] += record.total_cost
+    for vid in costs:
+        db.query(Vehicle).filter(Vehicle.id == vid).first()
+    return {
+        "total_maintenance_cost": sum(r.cost for r in maintenance_records),
+        "total_fuel_cost": sum(r.total_cost for r in fuel_records),
+    }
+
+
+def legacy_financial_summary(db):
+    from models import Purchase, MaintenanceRecord, FuelRecord
+    return {
+        "purchases": sum(p.amount for p in db.query(Purchase).all()),
+        "maintenance": sum(r.cost for r in db.query(MaintenanceRecord).all()),
+        "fuel": sum(r.total_cost for r in db.query(FuelRecord).all()),
+    }
+
+
+def measure(label, func):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = func()
+    elapsed = (time.perf_counter() - started) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<8} {elapsed:10.1f} ms   pic mémoire {peak / 1024 / 1024:8.1f} Mo")
+    return result
+
+
+def check(expected, actual):
+    if abs(expected - actual) > max(1e-6 * abs(expected), 0.01):
+        raise SystemExit(f"Résultats différents : {expected} != {actual}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000000, help="Nombre total de lignes (achats + carburant + entretiens)")
+    args = parser.parse_args()
+
+    use_temporary_database()
+    seed(purchases=args.rows // 2, fuel_records=args.rows * 3 // 10, maintenance_records=args.rows // 5)
+
+    from database import SessionLocal
+    from models import PurchasePeriod
+    from routers.reports import get_purchase_period_report, get_vehicle_costs_report, get_financial_summary
+
+    year = datetime.utcnow().year - 1
+    db = SessionLocal()
+    try:
+        print(f"Rapport annuel des achats ({year})")
+        old = measure("ancien", lambda: legacy_purchase_period(db, datetime(year, 1, 1), datetime(year, 12, 31, 23, 59, 59, 999999)))
+        db.expunge_all()
+        new = measure("nouveau", lambda: get_purchase_period_report(
+            PurchasePeriod.ANNUAL, year, None, None, include_purchases=False, db=db
+        ))
+        check(old["total_amount"], new["summary"]["total_amount"])
+
+        print("Coûts des véhicules")
+        db.expunge_all()
+        old = measure("ancien", lambda: legacy_vehicle_costs(db))
+        db.expunge_all()
+        new = measure("nouveau", lambda: get_vehicle_costs_report(None, None, None, db=db))
+        check(old["total_fuel_cost"], new["summary"]["total_fuel_cost"])
+
+        print("Résumé financier")
+        db.expunge_all()
+        old = measure("ancien", lambda: legacy_financial_summary(db))
+        db.expunge_all()
+        new = measure("nouveau", lambda: get_financial_summary(None, None, db=db))
+        check(old["purchases"], new["expenses"]["purchases"])
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la recherche plein texte (GET /api/search)
+
+Crée --items articles de stock (noms et descriptions en français, avec
+accents), des fournisseurs, prestataires et véhicules, puis mesure :
+  - la construction de l'index (ensure_search_index sur une base existante) ;
+  - le temps de chaque recherche (search.search, médiane et p95), comparé à
+    une recherche ilike('%mot%') sur le nom et la description des articles ;
+  - le surcoût des triggers sur l'insertion d'articles.
+
+Usage : python benchmarks/bench_search.py [--items 100000] [--runs 50]
+"""
+import argparse
+import random
+import statistics
+import time
+
+from _common import use_temporary_database, percentile, CATEGORIES
+
+NOUNS = [
+    "Papier", "Stylo", "Cartouche", "Câble", "Écran", "Clavier", "Souris", "Pneu", "Filtre", "Huile",
+    "Batterie", "Ampoule", "Gant", "Détergent", "Savon", "Classeur", "Agrafeuse", "Chaise", "Bureau",
+    "Extincteur", "Casque", "Gilet", "Serrure", "Cadenas", "Rallonge", "Disjoncteur", "Plaquette", "Courroie",
+]
+QUALIFIERS = [
+    "réfléchissant", "étanche", "électrique", "à gazole", "de sécurité", "renforcé", "A4", "A3", "noir",
+    "bleu", "grand modèle", "économique", "professionnel", "24 pouces", "USB", "HDMI", "5W30", "12V",
+]
+BRANDS = ["Bic", "HP", "Michelin", "Total", "Bosch", "Legrand", "Schneider", "Dell", "Canon", "Castrol"]
+QUERIES = [
+    ("rare (nom complet)", "extincteur étanche bosch"),
+    ("mot courant", "papier"),
+    ("préfixe 3 lettres", "cab"),
+    ("préfixe 2 lettres", "ex"),
+    ("sans accents", "reflechissant"),
+    ("deux mots", "filtre 5w30"),
+    ("aucun résultat", "zzzz"),
+]
+
+
+def seed_catalogue(items, rng):
+    from sqlalchemy import insert
+    from database import engine
+    from models import StockItem, Supplier, ServiceProvider, Vehicle
+
+    def item(i):
+        name = f"{rng.choice(NOUNS)} {rng.choice(QUALIFIERS)} {rng.choice(BRANDS)} {i}"
+        return {
+            "name": name, "description": f"{name} — référence {rng.randint(1000, 99999)}, conditionnement unitaire",
+            "category": rng.choice(CATEGORIES), "current_quantity": rng.randint(0, 500), "min_threshold": 10,
+            "max_threshold": 400, "unit": "pièce", "location": f"Magasin {rng.randint(1, 20)}", "is_active": True,
+        }
+
+    with engine.begin() as conn:
+        for offset in range(0, items, 10000):
+            conn.execute(insert(StockItem), [item(i) for i in range(offset, min(offset + 10000, items))])
+        conn.execute(insert(Supplier), [{
+            "name": f"{rng.choice(['Société', 'Établissements', 'Comptoir'])} {rng.choice(BRANDS)} {i}",
+            "city": rng.choice(["Conakry", "Kindia", "Labé", "Kankan"]), "is_active": True,
+        } for i in range(items // 20)])
+        conn.execute(insert(ServiceProvider), [{
+            "name": f"Garage {rng.choice(BRANDS)} {i}", "service_type": rng.choice(["Mécanique", "Électricité", "Carrosserie"]),
+            "city": "Conakry", "is_active": True,
+        } for i in range(items // 100)])
+        conn.execute(insert(Vehicle), [{
+            "plate_number": f"RC-{i:05d}-{rng.choice('ABCDEFGH')}", "brand": rng.choice(["Toyota", "Ford", "Nissan"]),
+            "model": "Modèle", "status": "active",
+        } for i in range(items // 100)])
+
+
+def timed(function, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = function()
+        timings.append((time.perf_counter() - started) * 1000)
+    return result, timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=100000)
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    use_temporary_database()
+    from database import create_tables, SessionLocal, engine
+    from models import StockItem
+    from sqlalchemy import insert, or_
+    import search
+
+    create_tables()
+    rng = random.Random(42)
+    seed_catalogue(args.items, rng)
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        search.ensure_search_index(db)
+        print(f"{engine.dialect.name}, {args.items} articles : index construit en {time.perf_counter() - started:.2f} s")
+
+        print(f"{'recherche':<22} {'résultats':>9} {'médiane':>9} {'p95':>9}   ilike (sans classement)")
+        for label, query in QUERIES:
+            results, timings = timed(lambda: search.search(db, query), args.runs)
+            word = query.split()[0]
+            _, baseline = timed(lambda: db.query(StockItem.id).filter(or_(
+                StockItem.name.ilike(f"%{word}%"), StockItem.description.ilike(f"%{word}%")
+            )).limit(20).all(), max(3, args.runs // 10))
+            print(f"{label:<22} {len(results):>9} {statistics.median(timings):7.2f} ms {percentile(timings, 95):6.2f} ms"
+                  f"   {statistics.median(baseline):7.2f} ms")
+
+        # Surcoût des triggers à l'écriture
+        rows = [{"name": f"Article trigger {i}", "category": "other", "description": "Test"} for i in range(2000)]
+        started = time.perf_counter()
+        db.execute(insert(StockItem), rows)
+        db.commit()
+        with_triggers = time.perf_counter() - started
+        db.execute(search.text("DELETE FROM stock_items WHERE name LIKE 'Article trigger%'"))
+        db.commit()
+        for spec in search.ENTITIES.values():
+            if engine.dialect.name == "postgresql":
+                db.execute(search.text(f"DROP TRIGGER IF EXISTS search_index_{spec['table']} ON {spec['table']}"))
+                continue
+            for operation in ("insert", "update", "delete"):
+                db.execute(search.text(f"DROP TRIGGER IF EXISTS search_index_{spec['table']}_{operation}"))
+        db.commit()
+        started = time.perf_counter()
+        db.execute(insert(StockItem), [{**row, "name": row["name"] + " bis"} for row in rows])
+        db.commit()
+        without = time.perf_counter() - started
+        print(f"insertion de {len(rows)} articles : {without * 1000:.0f} ms sans index, "
+              f"{with_triggers * 1000:.0f} ms avec ({(with_triggers - without) / len(rows) * 1e6:.0f} µs par ligne)")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
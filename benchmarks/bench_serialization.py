@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la sérialisation JSON et de la compression des réponses
+
+Pour les listes les plus volumineuses :
+  - /api/stock-movements/ (liste complète, response_model)
+  - /api/reports/purchases/period (tableau `purchases` d'objets ORM)
+  - /api/purchases/reports/category/{category} (objets ORM)
+
+mesure :
+  - la sérialisation : jsonable_encoder + json (ancienne chaîne) contre
+    orjson (FastJSONResponse) ; pour les routes avec response_model, la
+    validation Pydantic est commune aux deux et seul le rendu est comparé
+  - la taille de la réponse et le temps de compression gzip / brotli
+  - la latence de bout en bout selon Accept-Encoding
+
+Usage : python benchmarks/bench_serialization.py [--rows 20000] [--requests 10]
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+
+from _common import use_temporary_database, seed
+
+
+def timed(func, repeat=5):
+    """Durée médiane en millisecondes et dernier résultat"""
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        durations.append((time.perf_counter() - started) * 1000)
+    return statistics.median(durations), result
+
+
+def seed_movements(rows):
+    from sqlalchemy import insert
+    from database import engine
+    from models import StockMovement
+
+    rng = random.Random(42)
+    with engine.begin() as connection:
+        connection.execute(insert(StockMovement), [
+            {"stock_item_id": rng.randint(1, 500), "movement_type": rng.choice(["in", "out"]),
+             "quantity": rng.randint(1, 20), "reason": "Réception fournisseur", "reference": f"BL-{i:06d}"}
+            for i in range(rows)
+        ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000, help="Nombre d'achats et de mouvements de stock")
+    parser.add_argument("--requests", type=int, default=10, help="Requêtes par mesure de latence")
+    args = parser.parse_args()
+
+    use_temporary_database()
+    from database import init_database
+    init_database()
+    seed(purchases=args.rows, fuel_records=100, maintenance_records=100)
+    seed_movements(args.rows)
+
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+    from fastapi.testclient import TestClient
+    from compression import ENCODINGS, _Compressor
+    from database import SessionLocal
+    from main import app
+    from models import PurchaseCategory, PurchasePeriod
+    from serialization import FastJSONResponse
+    from routers.purchases import get_purchases_by_category
+    from routers.reports import get_purchase_period_report
+
+    year = time.gmtime().tm_year - 1
+    db = SessionLocal()
+    endpoints = [
+        ("/api/stock-movements/", None),
+        (f"/api/reports/purchases/period?period=annual&year={year}", lambda: get_purchase_period_report.__wrapped__.__wrapped__(
+            period=PurchasePeriod.ANNUAL, year=year, month=None, week=None, include_purchases=True, db=db)),
+        ("/api/purchases/reports/category/equipment", lambda: get_purchases_by_category.__wrapped__(
+            category=PurchaseCategory("equipment"), start_date=None, end_date=None, db=db, current_user=None)),
+    ]
+
+    with TestClient(app) as client:
+        token = client.post("/api/auth/login-json", json={"username": "admin", "password": "admin123"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        for url, call in endpoints:
+            body = client.get(url, headers={**headers, "Accept-Encoding": "identity"}).content
+            print(f"\n{url}  ({len(body):,} octets)")
+
+            # Sérialisation
+            content = call() if call else json.loads(body)
+            if call:
+                before, _ = timed(lambda: JSONResponse(jsonable_encoder(content)).body)
+            else:
+                before, _ = timed(lambda: JSONResponse(content).body)
+            after, _ = timed(lambda: FastJSONResponse(content).body)
+            label = "jsonable_encoder + json" if call else "json"
+            print(f"  sérialisation   {label:<24} {before:8.1f} ms   orjson {after:7.1f} ms   (x{before / after:.1f})")
+
+            # Compression
+            for encoding in ENCODINGS:
+                duration, compressed = timed(lambda: _Compressor(encoding).finish(body))
+                print(f"  compression     {encoding:<24} {duration:8.1f} ms   {len(compressed):>10,} octets "
+                      f"({len(compressed) / len(body):.1%})")
+
+            # Latence de bout en bout
+            for encoding in ("identity",) + ENCODINGS:
+                request_headers = {**headers, "Accept-Encoding": encoding}
+                latency, response = timed(lambda: client.get(url, headers=request_headers), args.requests)
+                size = int(response.headers.get("content-length", len(response.content)))
+                print(f"  requête         {encoding:<24} {latency:8.1f} ms   {size:>10,} octets transférés")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
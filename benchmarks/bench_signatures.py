@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark des signatures avant / après leur déplacement hors de la base
+
+Les demandes d'achat sont créées avec leurs signatures en base64 dans les
+lignes (dg_signature, receipt_signature), comme avant la migration 0004.
+Mesures de GET /api/purchase-requests/ (taille non compressée et temps de
+réponse), puis la migration est appliquée et les mesures refaites : réponse
+complète (images en base64, relues dans le stockage) et réponse avec les
+URL signées à la place des images (paramètre fields) ; enfin le
+téléchargement d'une signature par son URL signée, sans en-tête
+Authorization (comme une balise <img>).
+
+Usage : python benchmarks/bench_signatures.py [--requests 1000] [--runs 10]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from _common import ROOT_DIR, use_temporary_database, seed_receipts, percentile
+
+
+def measure(client, headers, label, runs, url="/api/purchase-requests/"):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        response = client.get(url, headers={**headers, "Accept-Encoding": "identity"})
+        timings.append((time.perf_counter() - started) * 1000)
+        response.raise_for_status()
+    rows = len(response.json())
+    size = len(response.content)
+    print(f"  {label:<8} {rows} demandes : {size / 1024:9.1f} Ko ({size / rows:7.0f} o/demande), "
+          f"médiane {statistics.median(timings):7.1f} ms, p95 {percentile(timings, 95):7.1f} ms")
+    return response, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    use_temporary_database()
+    os.environ["BLOB_STORE_DIR"] = tempfile.mkdtemp(prefix="bench_blobs_")
+    os.environ["RECEIPT_CACHE_MAX_FILES"] = "0"
+    from database import init_database, engine
+    init_database()
+    seed_receipts(args.requests)
+
+    from alembic import command
+    from alembic.config import Config
+    from fastapi.testclient import TestClient
+    from main import app
+
+    print(f"GET /api/purchase-requests/ ({args.runs} appels par mesure)")
+    with TestClient(app) as client:
+        token = client.post("/api/auth/login-json", json={"username": "admin", "password": "admin123"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        _, before = measure(client, headers, "avant", args.runs)
+
+        started = time.perf_counter()
+        command.upgrade(Config(os.path.join(ROOT_DIR, "alembic.ini")), "head")
+        print(f"  migration 0004 : {time.perf_counter() - started:.2f} s, "
+              f"{len(os.listdir(os.environ['BLOB_STORE_DIR']))} répertoires de fichiers")
+        engine.dispose()
+
+        measure(client, headers, "après", args.runs)
+        from schemas import PurchaseRequest
+        fields = [name for name in PurchaseRequest.model_fields if name not in ("dg_signature", "receipt_signature")]
+        response, after = measure(client, headers, "URL", args.runs, f"/api/purchase-requests/?fields={','.join(fields)}")
+        print(f"  taille divisée par {before / after:.1f} avec les URL signées")
+
+        url = response.json()[0]["receipt_signature_url"]
+        image = client.get(url)
+        image.raise_for_status()
+        cached = client.get(url, headers={"If-None-Match": image.headers["etag"]})
+        print(f"  {url[:40]}... : {len(image.content)} o ({image.headers['content-type']}, "
+              f"{image.headers['cache-control']}), revalidation {cached.status_code}")
+
+
+if __name__ == "__main__":
+    main()
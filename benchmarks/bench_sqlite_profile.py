@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark du profil de production SQLite (SQLITE_PROFILE=production)
+
+Simule plusieurs workers uvicorn (processus) servant chacun des requêtes
+dans leur pool de threads, avec une charge mixte lectures / écritures :
+  - lecture : page de mouvements d'un article + fiche de l'article
+  - écriture : mouvement de stock (UPDATE conditionnel + INSERT, commit)
+
+Chaque configuration (default, production) tourne sur sa propre copie de la
+base, le mode WAL étant persistant dans le fichier.
+
+Usage : python benchmarks/bench_sqlite_profile.py [--workers 4] [--threads 8] [--seconds 10] [--write-ratio 0.2]
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import tempfile
+import threading
+import time
+
+from _common import percentile
+
+ITEMS = 200
+
+
+def _seed():
+    from database import SessionLocal, create_tables
+    from models import StockItem
+
+    create_tables()
+    db = SessionLocal()
+    db.add_all(StockItem(name=f"Article {i}", category="other", current_quantity=10000) for i in range(ITEMS))
+    db.commit()
+    db.close()
+
+
+def _worker(threads, seconds, write_ratio, seed, results):
+    from database import SessionLocal
+    from models import StockItem, StockMovement
+    from inventory import apply_movement
+
+    stats = {"reads": 0, "writes": 0, "errors": 0, "latencies": []}
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+
+    def loop(thread_seed):
+        rng = random.Random(thread_seed)
+        local = {"reads": 0, "writes": 0, "errors": 0, "latencies": []}
+        while time.monotonic() < deadline:
+            item_id = rng.randint(1, ITEMS)
+            db = SessionLocal()
+            started = time.perf_counter()
+            try:
+                if rng.random() < write_ratio:
+                    movement_type = rng.choice(["in", "out"])
+                    apply_movement(db, item_id, movement_type, 1)
+                    db.add(StockMovement(stock_item_id=item_id, movement_type=movement_type, quantity=1))
+                    db.commit()
+                    local["writes"] += 1
+                else:
+                    db.query(StockMovement).filter(StockMovement.stock_item_id == item_id).order_by(
+                        StockMovement.created_at.desc(), StockMovement.id.desc()
+                    ).limit(50).all()
+                    db.query(StockItem).filter(StockItem.id == item_id).first()
+                    local["reads"] += 1
+                local["latencies"].append((time.perf_counter() - started) * 1000)
+            except Exception:  # "database is locked", délai du pool dépassé
+                db.rollback()
+                local["errors"] += 1
+            finally:
+                db.close()
+        with lock:
+            for key in ("reads", "writes", "errors"):
+                stats[key] += local[key]
+            stats["latencies"].extend(local["latencies"])
+
+    pool = [threading.Thread(target=loop, args=(seed * 1000 + i,)) for i in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    results.put(stats)
+
+
+def run_configuration(profile, args):
+    os.chdir(tempfile.mkdtemp(prefix=f"bench_sqlite_{profile}_"))
+    os.environ["SQLITE_PROFILE"] = profile
+    context = multiprocessing.get_context("spawn")
+
+    seeder = context.Process(target=_seed)
+    seeder.start()
+    seeder.join()
+
+    results = context.Queue()
+    workers = [
+        context.Process(target=_worker, args=(args.threads, args.seconds, args.write_ratio, i, results))
+        for i in range(args.workers)
+    ]
+    for worker in workers:
+        worker.start()
+    collected = [results.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+
+    reads = sum(s["reads"] for s in collected)
+    writes = sum(s["writes"] for s in collected)
+    errors = sum(s["errors"] for s in collected)
+    latencies = [value for s in collected for value in s["latencies"]]
+    print(f"  {profile:<11} {(reads + writes) / args.seconds:8.0f} op/s "
+          f"(lectures {reads / args.seconds:.0f}/s, écritures {writes / args.seconds:.0f}/s)   "
+          f"erreurs {errors:5d}   p50 {percentile(latencies, 50):6.1f} ms   p99 {percentile(latencies, 99):7.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4, help="Nombre de processus (workers uvicorn)")
+    parser.add_argument("--threads", type=int, default=8, help="Threads par processus")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    args = parser.parse_args()
+
+    os.environ.pop("DATABASE_URL", None)
+    print(f"{args.workers} processus x {args.threads} threads, {args.seconds:.0f} s, {args.write_ratio:.0%} d'écritures")
+    for profile in ("default", "production"):
+        run_configuration(profile, args)
+
+
+if __name__ == "__main__":
+    main()
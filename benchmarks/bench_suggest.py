@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark des suggestions au fil de la frappe (GET /api/suggest)
+
+Crée le même catalogue que bench_search.py (--items articles, fournisseurs,
+véhicules), puis mesure :
+  - la construction des index en mémoire (load_suggestions) et leur taille ;
+  - le temps d'une recherche dans l'index (médiane et p99) pour des saisies
+    de 1 à plusieurs caractères, comparé à une requête SQL
+    name LIKE 'saisie%' ... LIMIT 10 ;
+  - le temps d'une requête HTTP complète (authentification comprise) ;
+  - le coût d'un renommage appliqué à l'index (validation d'une transaction).
+
+Usage : python benchmarks/bench_suggest.py [--items 100000] [--runs 2000]
+"""
+import argparse
+import random
+import statistics
+import time
+import tracemalloc
+
+from _common import use_temporary_database, percentile
+from bench_search import seed_catalogue
+
+QUERIES = [
+    ("stock_item", "p"),
+    ("stock_item", "pap"),
+    ("stock_item", "cable hd"),
+    ("stock_item", "refl"),
+    ("stock_item", "bosch 12"),
+    ("stock_item", "zzzz"),
+    ("supplier", "etab"),
+    ("vehicle", "rc001"),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=100000)
+    parser.add_argument("--runs", type=int, default=2000)
+    args = parser.parse_args()
+
+    use_temporary_database()
+    from database import init_database, SessionLocal, engine
+    from models import StockItem, SuggestEntity, Supplier, Vehicle
+    from suggest import ENTITIES, PrefixIndex, suggestion_index, load_suggestions
+
+    init_database()  # utilisateurs par défaut (admin) pour la mesure HTTP
+    seed_catalogue(args.items, random.Random(42))
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        load_suggestions(db, SessionLocal)
+        elapsed = time.perf_counter() - started
+        # Mémoire : index reconstruits sous tracemalloc (lignes lues exclues)
+        rows = {entity: suggestion_index._rows(db, entity) for entity in ENTITIES}
+        tracemalloc.start()
+        indexes = []
+        for entity, spec in ENTITIES.items():
+            index = PrefixIndex(spec["compact"])
+            index.build((item_id, label) for item_id, label, state in rows[entity] if spec["active"](state))
+            indexes.append(index)
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del rows, indexes
+        keys = sum(size["keys"] for size in suggestion_index.stats()["entities"].values())
+        print(f"{engine.dialect.name}, {args.items} articles : index construits en {elapsed:.2f} s, "
+              f"{memory / 1024 / 1024:.1f} Mo, {keys} clés")
+
+        columns = {"stock_item": StockItem.name, "supplier": Supplier.name, "vehicle": Vehicle.plate_number}
+        print(f"{'entité':<11} {'saisie':<10} {'résultats':>9} {'médiane':>10} {'p99':>10}   LIKE 'saisie%'")
+        for entity, query in QUERIES:
+            timings = []
+            for _ in range(args.runs):
+                started = time.perf_counter()
+                results = suggestion_index.suggest(SuggestEntity(entity), query, 10)
+                timings.append((time.perf_counter() - started) * 1e6)
+            column = columns[entity]
+            baseline = []
+            for _ in range(20):
+                started = time.perf_counter()
+                db.query(column).filter(column.ilike(f"{query}%")).limit(10).all()
+                baseline.append((time.perf_counter() - started) * 1e6)
+            print(f"{entity:<11} {query:<10} {len(results):>9} {statistics.median(timings):7.1f} µs "
+                  f"{percentile(timings, 99):7.1f} µs   {statistics.median(baseline):7.0f} µs")
+
+        # Renommage d'un article : correction de l'index à la validation
+        item = db.query(StockItem).order_by(StockItem.id).first()
+        timings = []
+        for i in range(200):
+            item.name = f"Article renommé {i}"
+            started = time.perf_counter()
+            db.commit()
+            timings.append((time.perf_counter() - started) * 1000)
+        print(f"renommage d'un article (commit compris) : médiane {statistics.median(timings):.2f} ms")
+    finally:
+        db.close()
+
+    # Requête HTTP complète, utilisateur en cache
+    from fastapi.testclient import TestClient
+    from main import app
+    with TestClient(app) as client:
+        token = client.post("/api/auth/login-json", json={"username": "admin", "password": "admin123"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        timings = []
+        for _ in range(min(args.runs, 500)):
+            started = time.perf_counter()
+            response = client.get("/api/suggest", params={"entity": "stock_item", "q": "pap"}, headers=headers)
+            timings.append((time.perf_counter() - started) * 1000)
+        print(f"GET /api/suggest : médiane {statistics.median(timings):.2f} ms, p99 {percentile(timings, 99):.2f} ms, "
+              f"{response.headers.get('X-Query-Count')} requête SQL")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Vérification des budgets de requêtes SQL (régression N+1)
+
+Appelle chaque route déclarée avec @query_budget sur une base temporaire,
+avec QUERY_BUDGET_STRICT=1 : une route qui dépasse son budget échoue
+(QueryBudgetExceeded). Les routes budgétées sont lues dans l'application ;
+une route budgétée absente de ROUTES est aussi un échec, pour qu'un nouveau
+budget soit vérifié dès son ajout.
+
+Usage : python benchmarks/check_query_budgets.py [--rows 2000]
+Code de sortie non nul si une route dépasse son budget.
+"""
+import argparse
+import os
+import sys
+
+from _common import use_temporary_database, seed, seed_receipts
+
+# Chemin de la route -> URL appelée (paramètres obligatoires renseignés)
+ROUTES = {
+    "/api/purchase-requests/": "/api/purchase-requests/",
+    "/api/purchase-requests/{request_id}": "/api/purchase-requests/1",
+    "/api/purchase-requests/dashboard/stats": "/api/purchase-requests/dashboard/stats",
+    "/api/search": "/api/search?q=papier",
+    "/api/suggest": "/api/suggest?entity=stock_item&q=pa",
+    "/api/vehicles/": "/api/vehicles/",
+    "/api/vehicles/{vehicle_id}/maintenance": "/api/vehicles/1/maintenance",
+    "/api/vehicles/maintenance/upcoming": "/api/vehicles/maintenance/upcoming",
+    "/api/vehicles/{vehicle_id}/fuel": "/api/vehicles/1/fuel",
+    "/api/vehicles/{vehicle_id}/fuel/stats": "/api/vehicles/1/fuel/stats",
+    "/api/vehicles/stats/summary": "/api/vehicles/stats/summary",
+    "/api/vehicles/{vehicle_id}/history": "/api/vehicles/1/history",
+    "/api/reports/dashboard": "/api/reports/dashboard",
+    "/api/reports/purchases/period": "/api/reports/purchases/period?period=monthly&year=2024&month=3",
+    "/api/reports/stock/analysis": "/api/reports/stock/analysis",
+    "/api/reports/vehicles/costs": "/api/reports/vehicles/costs?start_date=2024-01-01T00:00:00&end_date=2024-06-30T12:00:00",
+    "/api/reports/financial/summary": "/api/reports/financial/summary",
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2000, help="Nombre de lignes par table historique")
+    args = parser.parse_args()
+
+    os.environ["QUERY_BUDGET_STRICT"] = "1"  # lu à la construction du middleware
+    use_temporary_database()
+    from database import init_database
+    init_database()  # utilisateur admin et données de démonstration
+    seed(purchases=args.rows, fuel_records=args.rows, maintenance_records=args.rows)
+    seed_receipts(100)  # demandes d'achat reçues, avec signatures
+
+    from fastapi.routing import APIRoute
+    from fastapi.testclient import TestClient
+    from main import app
+    from query_counter import QueryBudgetExceeded
+
+    budgets = {
+        route.path: route.endpoint.query_budget
+        for route in app.routes
+        if isinstance(route, APIRoute) and hasattr(route.endpoint, "query_budget")
+    }
+
+    failures = 0
+    for path in sorted(set(budgets) - set(ROUTES)):
+        print(f"❌ {path} : route budgétée absente de ROUTES")
+        failures += 1
+    for path in sorted(set(ROUTES) - set(budgets)):
+        print(f"❌ {path} : route sans budget, à retirer de ROUTES")
+        failures += 1
+
+    with TestClient(app) as client:
+        token = client.post("/api/auth/login-json", json={"username": "admin", "password": "admin123"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        for path, url in ROUTES.items():
+            if path not in budgets:
+                continue
+            try:
+                response = client.get(url, headers=headers)
+            except QueryBudgetExceeded as e:
+                print(f"❌ {e}")
+                failures += 1
+                continue
+            if response.status_code != 200:
+                print(f"❌ {url} : HTTP {response.status_code}")
+                failures += 1
+                continue
+            print(f"✅ {url} : {response.headers['x-query-count']} requêtes SQL (budget {budgets[path]})")
+
+    if failures:
+        sys.exit(f"{failures} route(s) hors budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Vérification des plans de requête (régression des index)
+
+Appelle les routes principales sur une base temporaire, capture les requêtes
+SQL qu'elles exécutent et vérifie avec EXPLAIN QUERY PLAN que la table visée
+est lue par un index et non par un parcours complet (SCAN sans index).
+
+Usage : python benchmarks/check_query_plans.py [--rows 20000]
+Code de sortie non nul si une route fait un parcours complet.
+"""
+import argparse
+import sys
+
+from _common import use_temporary_database, seed
+
+# (route, table dont la lecture doit passer par un index)
+ROUTES = [
+    ("/api/stock/movements", "stock_movements"),
+    ("/api/stock/movements?item_id=1", "stock_movements"),
+    ("/api/stock-movements/?limit=50", "stock_movements"),
+    ("/api/purchases/", "purchases"),
+    ("/api/purchases/?start_date=2024-01-01T00:00:00&end_date=2024-03-31T00:00:00", "purchases"),
+    ("/api/suppliers/1/purchases", "purchases"),
+    ("/api/maintenance/", "maintenance_records"),
+    ("/api/maintenance/reminders/", "maintenance_records"),
+    ("/api/vehicles/maintenance/upcoming", "maintenance_records"),
+    ("/api/vehicles/1/maintenance", "maintenance_records"),
+    ("/api/vehicles/1/fuel", "fuel_records"),
+    ("/api/vehicles/1/fuel?start_date=2024-01-01T00:00:00", "fuel_records"),
+    ("/api/breakdowns/", "breakdowns"),
+    ("/api/purchase-requests/", "purchase_requests"),
+    ("/api/purchase-requests/?status_filter=pending&department=Informatique", "purchase_requests"),
+]
+
+
+def full_scans(connection, statement, parameters, table):
+    """Lignes du plan qui parcourent `table` sans index"""
+    plan = connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).fetchall()
+    details = [row[-1] for row in plan]
+    return [
+        detail for detail in details
+        if detail.split(" ")[:2] == ["SCAN", table] and "USING" not in detail
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000, help="Nombre de lignes par table historique")
+    args = parser.parse_args()
+
+    use_temporary_database()
+    from database import init_database
+    init_database()  # utilisateur admin et données de démonstration
+    seed(purchases=args.rows, fuel_records=args.rows, maintenance_records=args.rows)
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event
+    from database import engine
+    from main import app
+
+    with engine.begin() as connection:
+        connection.exec_driver_sql("ANALYZE")
+
+    captured = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    failures = 0
+    with TestClient(app) as client, engine.connect() as connection:
+        token = client.post("/api/auth/login-json", json={"username": "admin", "password": "admin123"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        for url, table in ROUTES:
+            captured.clear()
+            response = client.get(url, headers=headers)
+            if response.status_code != 200:
+                print(f"❌ {url} : HTTP {response.status_code}")
+                failures += 1
+                continue
+
+            scans = []
+            for statement, parameters in list(captured):
+                if statement.lstrip().upper().startswith("SELECT") and f"FROM {table}" in statement:
+                    scans.extend(full_scans(connection, statement, parameters, table))
+            if scans:
+                print(f"❌ {url} : {'; '.join(sorted(set(scans)))}")
+                failures += 1
+            else:
+                print(f"✅ {url}")
+
+    if failures:
+        sys.exit(f"{failures} route(s) sans index")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test de charge des mouvements de stock concurrents
+
+Lance des milliers d'entrées et de sorties en parallèle (un thread = une
+session, comme les requêtes servies par le pool de threads) sur quelques
+articles, puis vérifie que le registre est cohérent :
+  quantité initiale + entrées - sorties enregistrées == quantité en stock
+et qu'aucune quantité n'est devenue négative.
+
+Usage : python benchmarks/stress_stock_movements.py [--movements 5000] [--threads 32]
+"""
+import argparse
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from _common import use_temporary_database
+
+INITIAL_QUANTITY = 50
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--movements", type=int, default=5000)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--items", type=int, default=4)
+    args = parser.parse_args()
+
+    use_temporary_database()
+    from fastapi import HTTPException
+    from sqlalchemy import func
+    from database import SessionLocal, create_tables
+    from models import StockItem, StockMovement
+    from schemas import StockMovementCreate
+    from routers.stock import create_stock_movement
+
+    create_tables()
+    db = SessionLocal()
+    item_ids = []
+    for i in range(args.items):
+        item = StockItem(name=f"Article {i}", category="other", current_quantity=INITIAL_QUANTITY)
+        db.add(item)
+        db.flush()
+        item_ids.append(item.id)
+    db.commit()
+    db.close()
+
+    rng = random.Random(7)
+    movements = [
+        StockMovementCreate(
+            stock_item_id=rng.choice(item_ids),
+            movement_type=rng.choice(["in", "out", "out"]),  # plus de sorties que d'entrées
+            quantity=rng.randint(1, 5)
+        )
+        for _ in range(args.movements)
+    ]
+
+    def send(movement):
+        session = SessionLocal()
+        try:
+            create_stock_movement(movement, db=session)
+            return "ok"
+        except HTTPException:
+            return "refusé"
+        except Exception as exc:  # verrou SQLite expiré, etc.
+            return type(exc).__name__
+        finally:
+            session.close()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        outcomes = list(pool.map(send, movements))
+    elapsed = time.perf_counter() - started
+
+    counts = {}
+    for outcome in outcomes:
+        counts[outcome] = counts.get(outcome, 0) + 1
+    print(f"{args.movements} mouvements, {args.threads} threads : {elapsed:.2f} s ({args.movements / elapsed:.0f}/s)")
+    print("  " + ", ".join(f"{name}: {count}" for name, count in sorted(counts.items())))
+
+    db = SessionLocal()
+    errors = 0
+    for item_id in item_ids:
+        def total(movement_type):
+            return db.query(func.coalesce(func.sum(StockMovement.quantity), 0)).filter(
+                StockMovement.stock_item_id == item_id, StockMovement.movement_type == movement_type
+            ).scalar()
+        expected = INITIAL_QUANTITY + total("in") - total("out")
+        actual = db.query(StockItem.current_quantity).filter(StockItem.id == item_id).scalar()
+        status = "✅" if expected == actual and actual >= 0 else "❌"
+        if status == "❌":
+            errors += 1
+        print(f"  {status} article {item_id} : registre {expected}, stock {actual}")
+    db.close()
+
+    if errors:
+        sys.exit("Registre incohérent")
+
+
+if __name__ == "__main__":
+    main()
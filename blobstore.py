@@ -0,0 +1,152 @@
+"""
+Stockage des images de signature hors de la base (système de fichiers)
+
+Chaque image est enregistrée une seule fois dans BLOB_STORE_DIR sous
+l'empreinte SHA-256 de son contenu ; la ligne ne garde qu'une référence
+"sha256:<empreinte>" (71 caractères au lieu de dizaines de Ko de base64).
+Deux signatures identiques partagent le même fichier. Le contenu d'une
+référence ne change jamais : il peut être mis en cache indéfiniment par le
+navigateur (GET /api/signatures/{empreinte}).
+
+Les lignes écrites avant la migration 0004 contiennent encore l'image en
+base64 : signature_bytes() accepte les deux formes.
+
+Une balise <img> ne peut pas envoyer l'en-tête Authorization : l'URL
+donnée par signature_url() porte un jeton signé (HMAC avec SECRET_KEY) et
+une date d'expiration. L'expiration est arrondie à SIGNATURE_URL_TTL pour
+que l'URL d'une image reste la même d'une réponse à l'autre (cache du
+navigateur).
+"""
+from fastapi import HTTPException
+from typing import Optional
+from auth import SECRET_KEY
+import base64
+import binascii
+import hashlib
+import hmac
+import os
+import re
+import tempfile
+import time
+
+BLOB_STORE_DIR = os.path.abspath(os.getenv("BLOB_STORE_DIR", "blobs"))
+REFERENCE_PREFIX = "sha256:"
+MAX_SIGNATURE_SIZE = 2 * 1024 * 1024  # octets, après décodage
+SIGNATURE_URL_TTL = int(os.getenv("SIGNATURE_URL_TTL", "3600"))  # secondes
+
+_DIGEST = re.compile(r"^[0-9a-f]{64}$")
+_MEDIA_TYPES = (
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF8", "image/gif"),
+    (b"RIFF", "image/webp"),
+)
+
+
+def is_reference(value: Optional[str]) -> bool:
+    return bool(value) and value.startswith(REFERENCE_PREFIX)
+
+
+def is_digest(digest: str) -> bool:
+    return bool(_DIGEST.match(digest))
+
+
+def blob_path(digest: str) -> str:
+    return os.path.join(BLOB_STORE_DIR, digest[:2], digest)
+
+
+def put(data: bytes) -> str:
+    """Enregistrer un contenu (s'il n'existe pas déjà) ; retourne sa référence"""
+    digest = hashlib.sha256(data).hexdigest()
+    path = blob_path(digest)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Écriture atomique : un lecteur concurrent ne voit jamais de fichier partiel
+        descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(descriptor, "wb") as output:
+            output.write(data)
+        os.replace(temporary, path)
+    return REFERENCE_PREFIX + digest
+
+
+def get(digest: str) -> Optional[bytes]:
+    """Contenu d'une empreinte (None si absent)"""
+    if not is_digest(digest):
+        return None
+    try:
+        with open(blob_path(digest), "rb") as blob:
+            return blob.read()
+    except OSError:
+        return None
+
+
+def media_type(data: bytes) -> str:
+    for magic, kind in _MEDIA_TYPES:
+        if data.startswith(magic):
+            return kind
+    return "application/octet-stream"
+
+
+def decode_signature(value: str) -> bytes:
+    """Image d'une signature en base64 (avec ou sans préfixe data:image/...;base64,) ; ValueError si invalide"""
+    encoded = value.split(",", 1)[1] if "," in value else value
+    try:
+        return base64.b64decode(encoded.strip(), validate=True)
+    except binascii.Error as error:
+        raise ValueError(f"Signature invalide: {error}")
+
+
+def store_signature(value: Optional[str]) -> Optional[str]:
+    """Enregistrer une signature reçue par l'API ; retourne la référence à stocker dans la ligne"""
+    if not value:
+        return None
+    try:
+        data = decode_signature(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Signature invalide (image base64 attendue)")
+    if len(data) > MAX_SIGNATURE_SIZE:
+        raise HTTPException(status_code=400, detail="Signature trop volumineuse")
+    return put(data)
+
+
+def signature_bytes(value: Optional[str]) -> Optional[bytes]:
+    """Image d'une signature stockée (référence, ou base64 pour les lignes non migrées)"""
+    if not value:
+        return None
+    if is_reference(value):
+        return get(value[len(REFERENCE_PREFIX):])
+    return decode_signature(value)
+
+
+def signature_data(value: Optional[str]) -> Optional[str]:
+    """Image d'une signature en base64 (data:image/...;base64,...), comme avant la migration 0004"""
+    if not is_reference(value):
+        return value
+    data = get(value[len(REFERENCE_PREFIX):])
+    if data is None:
+        return None
+    return f"data:{media_type(data)};base64,{base64.b64encode(data).decode('ascii')}"
+
+
+def _token(digest: str, expires: int) -> str:
+    message = f"{digest}:{expires}".encode()
+    return hmac.new(SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
+
+
+def signature_url(value: Optional[str]) -> Optional[str]:
+    """URL signée de l'image d'une signature stockée par référence (None sinon)
+
+    Valable entre SIGNATURE_URL_TTL et deux fois SIGNATURE_URL_TTL.
+    """
+    if not is_reference(value):
+        return None
+    digest = value[len(REFERENCE_PREFIX):]
+    expires = (int(time.time()) // SIGNATURE_URL_TTL + 2) * SIGNATURE_URL_TTL
+    return f"/api/signatures/{digest}?expires={expires}&token={_token(digest, expires)}"
+
+
+def valid_token(digest: str, expires: Optional[int], token: Optional[str]) -> bool:
+    """Jeton d'une URL donnée par signature_url() : authentique et non expiré"""
+    if expires is None or not token or expires < time.time():
+        return False
+    return hmac.compare_digest(token, _token(digest, expires))
@@ -0,0 +1,173 @@
+"""
+Cache en mémoire (TTL + LRU) pour les rapports calculés
+
+Les réponses des rapports sont mises en cache par route et paramètres.
+Chaque entrée déclare les tables dont elle dépend : quand une transaction
+qui a écrit dans l'une de ces tables est validée, les entrées concernées
+sont invalidées.
+
+Le cache est propre à chaque processus : avec plusieurs workers, une
+écriture n'invalide que le worker qui l'a traitée, les autres se mettent
+à jour au plus tard après REPORT_CACHE_TTL secondes.
+"""
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from collections import OrderedDict
+from datetime import datetime, date
+from enum import Enum
+from functools import wraps
+from typing import Any, Callable, Iterable, Optional
+import inspect
+import os
+import threading
+import time
+
+
+class ReportCache:
+    """Cache LRU borné avec expiration et invalidation par table"""
+
+    def __init__(self, maxsize: int = 256, ttl: float = 30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # clé -> (expiration, tables, valeur)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.endpoints = {}  # route -> {"hits": n, "misses": n}
+
+    def get(self, key: tuple) -> Any:
+        """Retourne la valeur en cache ou None (compte un succès ou un échec)"""
+        with self._lock:
+            endpoint_stats = self.endpoints.setdefault(key[0], {"hits": 0, "misses": 0})
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                endpoint_stats["hits"] += 1
+                return entry[2]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            endpoint_stats["misses"] += 1
+            return None
+
+    def set(self, key: tuple, value: Any, tables: Iterable[str]):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, frozenset(tables), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate_tables(self, tables: Iterable[str]):
+        """Supprime les entrées qui dépendent d'au moins une des tables modifiées"""
+        tables = set(tables)
+        if not tables:
+            return
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if entry[1] & tables]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = len(self._entries)
+            endpoints = {name: dict(counts) for name, counts in self.endpoints.items()}
+        lookups = self.hits + self.misses
+        return {
+            "size": size,
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "endpoints": endpoints
+        }
+
+
+report_cache = ReportCache(
+    maxsize=int(os.getenv("REPORT_CACHE_SIZE", "256")),
+    ttl=float(os.getenv("REPORT_CACHE_TTL", "30"))
+)
+
+
+def _key_part(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def cached_report(*tables: str, cache: Optional[ReportCache] = None):
+    """Décorateur de route : met le résultat en cache, clé = route + paramètres
+
+    Les paramètres `db` et `current_user` ne font pas partie de la clé.
+    """
+    def decorator(func: Callable):
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            target = cache or report_cache
+            arguments = signature.bind(*args, **kwargs)
+            arguments.apply_defaults()
+            key = (func.__name__,) + tuple(
+                (name, _key_part(value))
+                for name, value in arguments.arguments.items()
+                if name not in ("db", "current_user")
+            )
+            value = target.get(key)
+            if value is None:
+                value = func(*args, **kwargs)
+                target.set(key, value, tables)
+            return value
+
+        return wrapper
+    return decorator
+
+
+# === Événements d'invalidation ===
+# Les tables écrites pendant une transaction sont mémorisées dans session.info
+# puis transmises au cache une fois la transaction validée.
+
+def _written_tables(session: Session) -> set:
+    return session.info.setdefault("written_tables", set())
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_tables(session, flush_context):
+    written = _written_tables(session)
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        table = getattr(obj, "__tablename__", None)
+        if table:
+            written.add(table)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_tables(orm_execute_state):
+    if orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None:
+            _written_tables(orm_execute_state.session).add(table.name)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    written = session.info.pop("written_tables", None)
+    if written:
+        report_cache.invalidate_tables(written)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop("written_tables", None)
@@ -0,0 +1,152 @@
+"""
+Compression des réponses (brotli ou gzip) selon Accept-Encoding
+
+Les réponses textuelles (JSON, HTML, CSV...) dont le corps dépasse
+COMPRESSION_MIN_SIZE octets sont compressées avec l'encodage préféré du
+client : brotli si le module est installé, sinon gzip. Les réponses en flux
+(plusieurs messages) sont compressées morceau par morceau, chaque morceau
+étant envoyé dès qu'il est prêt.
+
+Les corps volumineux sont compressés dans le pool de threads pour ne pas
+bloquer la boucle d'évènements pendant plusieurs dizaines de millisecondes.
+
+Les réponses déjà compressées (fichiers statiques précompressés, PDF,
+images) sont transmises telles quelles.
+"""
+from starlette.datastructures import Headers, MutableHeaders
+from typing import Optional
+import anyio
+import os
+import zlib
+
+try:
+    import brotli
+except ImportError:  # brotli est optionnel : gzip seulement
+    brotli = None
+
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+# Les niveaux élevés de brotli sont trop lents pour des réponses dynamiques
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "4"))
+# Au-delà de cette taille, la compression passe dans le pool de threads
+THREADED_COMPRESSION_SIZE = 64 * 1024
+
+COMPRESSIBLE_TYPES = (
+    "text/", "application/json", "application/x-ndjson", "application/javascript",
+    "application/xml", "image/svg+xml",
+)
+
+# Encodages proposés, par ordre de préférence
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: str, available) -> Optional[str]:
+    """Premier encodage de `available` accepté par le client (None : sans compression)"""
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip()] = quality
+    for encoding in available:
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+class _Compressor:
+    """Compression incrémentale : `compress` pour un morceau, `finish` pour terminer"""
+
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self._brotli = None
+            self._gzip = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        # Vider le tampon à chaque morceau pour que le client le reçoive aussitôt
+        if self._brotli is not None:
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._gzip.compress(data) + self._gzip.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        if self._brotli is not None:
+            return self._brotli.process(data) + self._brotli.finish()
+        return self._gzip.compress(data) + self._gzip.flush()
+
+
+async def _run(func, data: bytes) -> bytes:
+    if len(data) >= THREADED_COMPRESSION_SIZE:
+        return await anyio.to_thread.run_sync(func, data)
+    return func(data)
+
+
+class CompressionMiddleware:
+    """Middleware ASGI : compresse les réponses textuelles selon Accept-Encoding"""
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""), ENCODINGS)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        compressor = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, compressor, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message  # envoyé avec le premier morceau du corps
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                headers = MutableHeaders(raw=start_message["headers"])
+                content_type = headers.get("content-type", "")
+                if (
+                    "content-encoding" in headers
+                    or not content_type.startswith(COMPRESSIBLE_TYPES)
+                    or (not more_body and len(body) < self.minimum_size)
+                ):
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+
+                compressor = _Compressor(encoding)
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                if not more_body:
+                    body = await _run(compressor.finish, body)
+                    headers["Content-Length"] = str(len(body))
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                # Réponse en flux : longueur inconnue
+                if "content-length" in headers:
+                    del headers["Content-Length"]
+                await send(start_message)
+
+            body = await _run(compressor.compress if more_body else compressor.finish, body)
+            await send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
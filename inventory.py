@@ -0,0 +1,394 @@
+"""
+Mise à jour atomique des quantités en stock
+
+Les quantités ne sont jamais lues en Python puis réécrites : chaque mouvement
+est appliqué par un seul UPDATE conditionnel, exécuté par la base sous le
+verrou d'écriture de la ligne (SQLite comme PostgreSQL). Deux sorties
+concurrentes ne peuvent donc pas passer toutes les deux la vérification de
+stock disponible, et aucune mise à jour n'est perdue.
+
+Chaque variation appliquée est enregistrée dans le registre des stocks
+(ledger.py) dans la même transaction.
+"""
+from fastapi import HTTPException
+from sqlalchemy import Index, bindparam, func, insert, inspect, update
+from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import List, Optional
+from models import LedgerEntryKind, StockItem, StockLedgerEntry, StockMovement
+from ledger import entry, lock_item, record
+
+# Les deux routeurs de mouvements utilisent des vocabulaires différents
+INCOMING_TYPES = ("in", "entry")
+OUTGOING_TYPES = ("out", "exit")
+ADJUSTMENT_TYPE = "adjustment"
+
+MAX_BATCH_SIZE = 1000
+BATCH_ATTEMPTS = 3
+
+
+def _update(db: Session, stock_item_id: int, values: dict, *conditions) -> bool:
+    values[StockItem.updated_at] = datetime.utcnow()
+    updated = db.query(StockItem).filter(StockItem.id == stock_item_id, *conditions).update(
+        values, synchronize_session=False
+    )
+    return updated == 1
+
+
+def increment_quantity(db: Session, stock_item_id: int, quantity: int, kind: LedgerEntryKind = LedgerEntryKind.ENTRY,
+                       movement_id: Optional[int] = None, reason: Optional[str] = None) -> bool:
+    """Ajouter une quantité au stock (False si l'article n'existe pas)"""
+    if not _update(db, stock_item_id, {StockItem.current_quantity: StockItem.current_quantity + quantity}):
+        return False
+    record(db, [entry(stock_item_id, quantity, kind, movement_id, reason)])
+    return True
+
+
+def decrement_quantity(db: Session, stock_item_id: int, quantity: int, kind: LedgerEntryKind = LedgerEntryKind.EXIT,
+                       movement_id: Optional[int] = None, reason: Optional[str] = None) -> bool:
+    """Retirer une quantité si le stock est suffisant (False sinon)"""
+    if not _update(
+        db, stock_item_id,
+        {StockItem.current_quantity: StockItem.current_quantity - quantity},
+        StockItem.current_quantity >= quantity
+    ):
+        return False
+    record(db, [entry(stock_item_id, -quantity, kind, movement_id, reason)])
+    return True
+
+
+def set_quantity(db: Session, stock_item_id: int, quantity: int, movement_id: Optional[int] = None,
+                 reason: Optional[str] = None) -> Optional[int]:
+    """Fixer la quantité en stock (inventaire) ; retourne l'ancienne quantité (None si l'article n'existe pas)
+
+    La ligne est verrouillée avant de lire l'ancienne quantité : la variation
+    enregistrée (nouvelle - ancienne) est exacte même avec des mouvements
+    concurrents.
+    """
+    if not lock_item(db, stock_item_id):
+        return None
+    previous = available_quantity(db, stock_item_id)
+    _update(db, stock_item_id, {StockItem.current_quantity: quantity})
+    if quantity != previous:
+        record(db, [entry(stock_item_id, quantity - previous, LedgerEntryKind.ADJUSTMENT, movement_id, reason)])
+    return previous
+
+
+def apply_movement(db: Session, stock_item_id: int, movement_type: str, quantity: int,
+                   movement_id: Optional[int] = None) -> bool:
+    """Appliquer un mouvement au stock ; False si une sortie dépasse le stock disponible
+
+    Les types de mouvement inconnus ne modifient pas la quantité.
+    """
+    if movement_type in INCOMING_TYPES:
+        return increment_quantity(db, stock_item_id, quantity, movement_id=movement_id)
+    if movement_type in OUTGOING_TYPES:
+        return decrement_quantity(db, stock_item_id, quantity, movement_id=movement_id)
+    if movement_type == ADJUSTMENT_TYPE:
+        return set_quantity(db, stock_item_id, quantity, movement_id) is not None
+    return True
+
+
+def movement_delta(db: Session, movement: StockMovement) -> int:
+    """Variation de stock produite par un mouvement
+
+    Somme de ses variations dans le registre ; pour un mouvement antérieur au
+    registre, variation déduite de son type (un ajustement ancien n'a pas
+    conservé la quantité qu'il remplaçait et compte pour 0).
+    """
+    deltas = db.query(StockLedgerEntry.delta).filter(StockLedgerEntry.movement_id == movement.id).all()
+    if deltas:
+        return sum(delta for delta, in deltas)
+    if movement.movement_type in INCOMING_TYPES:
+        return movement.quantity
+    if movement.movement_type in OUTGOING_TYPES:
+        return -movement.quantity
+    return 0
+
+
+def reverse_movement(db: Session, movement: StockMovement) -> Optional[int]:
+    """Annuler l'effet d'un mouvement sur le stock par une variation inverse
+
+    Retourne la variation appliquée, ou None si le stock disponible ne permet
+    pas de retirer ce que le mouvement avait ajouté.
+    """
+    delta = -movement_delta(db, movement)
+    reason = f"Annulation du mouvement {movement.id}"
+    if delta > 0:
+        increment_quantity(db, movement.stock_item_id, delta, LedgerEntryKind.REVERSAL, movement.id, reason)
+    elif delta < 0 and not decrement_quantity(db, movement.stock_item_id, -delta, LedgerEntryKind.REVERSAL, movement.id, reason):
+        return None
+    return delta
+
+
+def available_quantity(db: Session, stock_item_id: int) -> int:
+    """Quantité actuellement en stock (pour les messages d'erreur)"""
+    return db.query(StockItem.current_quantity).filter(StockItem.id == stock_item_id).scalar() or 0
+
+
+# === Mouvements en lot ===
+# Le lot est simulé ligne par ligne à partir des quantités lues, puis appliqué
+# avec un UPDATE par article (exécuté en executemany) et un INSERT groupé des
+# mouvements. Chaque UPDATE est conditionné au stock minimal supposé par la
+# simulation (ou, s'il y a un ajustement, à la quantité lue : la variation
+# enregistrée au registre pour l'ajustement en dépend) : si une écriture
+# concurrente l'a invalidé, le lot est annulé puis simulé à nouveau.
+
+def _plan_batch(lines: list, quantities: dict):
+    """Retourne (erreur par ligne, variation par ligne, plan par article)
+
+    Plan d'un article : `required` (stock minimal nécessaire avant le lot),
+    `delta` (variation nette) ou `final` (quantité finale s'il y a un ajustement).
+    """
+    errors: List[Optional[str]] = [None] * len(lines)
+    deltas = [0] * len(lines)
+    plans = {}
+    simulated = dict(quantities)
+    for index, line in enumerate(lines):
+        item_id, quantity = line.stock_item_id, line.quantity
+        if item_id not in simulated:
+            errors[index] = "Article non trouvé"
+            continue
+        if line.movement_type not in INCOMING_TYPES + OUTGOING_TYPES + (ADJUSTMENT_TYPE,):
+            errors[index] = f"Type de mouvement invalide: {line.movement_type}"
+            continue
+        if line.movement_type in OUTGOING_TYPES and simulated[item_id] < quantity:
+            errors[index] = f"Stock insuffisant. Disponible: {simulated[item_id]}, Demandé: {quantity}"
+            continue
+
+        plan = plans.setdefault(item_id, {"required": 0, "delta": 0, "adjusted": False})
+        before = simulated[item_id]
+        if line.movement_type in INCOMING_TYPES:
+            simulated[item_id] += quantity
+            plan["delta"] += quantity
+        elif line.movement_type in OUTGOING_TYPES:
+            if not plan["adjusted"]:
+                plan["required"] = max(plan["required"], quantity - plan["delta"])
+            simulated[item_id] -= quantity
+            plan["delta"] -= quantity
+        else:
+            simulated[item_id] = quantity
+            plan["adjusted"] = True
+        deltas[index] = simulated[item_id] - before
+
+    for item_id, plan in plans.items():
+        plan["final"] = simulated[item_id] if plan["adjusted"] else None
+        plan["expected"] = quantities[item_id]
+    return errors, deltas, plans
+
+
+def _line_kind(movement_type: str) -> LedgerEntryKind:
+    if movement_type in INCOMING_TYPES:
+        return LedgerEntryKind.ENTRY
+    if movement_type in OUTGOING_TYPES:
+        return LedgerEntryKind.EXIT
+    return LedgerEntryKind.ADJUSTMENT
+
+
+def _apply_plans(db: Session, plans: dict) -> bool:
+    """Appliquer les variations ; False si une écriture concurrente a invalidé la simulation"""
+    table = StockItem.__table__
+    now = datetime.utcnow()
+    relative = [
+        {"item_id": item_id, "required": plan["required"], "delta": plan["delta"]}
+        for item_id, plan in plans.items() if plan["final"] is None
+    ]
+    absolute = [
+        {"item_id": item_id, "expected": plan["expected"], "final": plan["final"]}
+        for item_id, plan in plans.items() if plan["final"] is not None
+    ]
+    updated = 0
+    if relative:
+        updated += db.execute(
+            update(table).where(table.c.id == bindparam("item_id"), table.c.current_quantity >= bindparam("required"))
+            .values(current_quantity=table.c.current_quantity + bindparam("delta"), updated_at=now),
+            relative
+        ).rowcount
+    if absolute:
+        updated += db.execute(
+            update(table).where(table.c.id == bindparam("item_id"), table.c.current_quantity == bindparam("expected"))
+            .values(current_quantity=bindparam("final"), updated_at=now),
+            absolute
+        ).rowcount
+    return updated == len(plans)
+
+
+def apply_movement_batch(db: Session, lines: list, all_or_nothing: bool = True) -> List[dict]:
+    """Appliquer un lot de mouvements dans la transaction courante (sans commit)
+
+    Retourne un résultat par ligne. En mode tout-ou-rien, rien n'est écrit
+    dès qu'une ligne est refusée.
+    """
+    if len(lines) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"Lot trop volumineux ({len(lines)} lignes, maximum {MAX_BATCH_SIZE})")
+
+    item_ids = {line.stock_item_id for line in lines}
+    for _ in range(BATCH_ATTEMPTS):
+        quantities = dict(
+            db.query(StockItem.id, StockItem.current_quantity).filter(StockItem.id.in_(item_ids)).all()
+        )
+        errors, deltas, plans = _plan_batch(lines, quantities)
+        accepted = [index for index, error in enumerate(errors) if error is None]
+        if all_or_nothing and len(accepted) < len(lines):
+            accepted = []
+        elif not _apply_plans(db, plans):
+            db.rollback()
+            continue
+
+        movement_ids = {}
+        if accepted:
+            rows = [lines[index].dict() for index in accepted]
+            ids = db.scalars(insert(StockMovement).returning(StockMovement.id, sort_by_parameter_order=True), rows).all()
+            movement_ids = dict(zip(accepted, ids))
+            record(db, [
+                entry(lines[index].stock_item_id, deltas[index], _line_kind(lines[index].movement_type), movement_id)
+                for index, movement_id in movement_ids.items() if deltas[index]
+            ])
+
+        return [
+            {
+                "index": index,
+                "stock_item_id": line.stock_item_id,
+                "status": "applied" if index in movement_ids else "rejected",
+                "movement_id": movement_ids.get(index),
+                "error": errors[index] or (None if index in movement_ids else "Lot annulé")
+            }
+            for index, line in enumerate(lines)
+        ]
+
+    raise HTTPException(status_code=409, detail="Stock modifié pendant le traitement du lot, veuillez réessayer")
+
+
+# === Entrée en stock des achats ===
+# L'article de stock d'un achat est identifié par (nom, catégorie), clé de
+# l'index unique ux_stock_items_name_category : un seul INSERT ... ON CONFLICT
+# DO UPDATE crée l'article ou ajoute la quantité, sans lecture préalable et
+# sans risque de doublon si deux achats du même article arrivent en même temps.
+# Une base créée avant cet index le reçoit au démarrage (ensure_stock_item_identity) ;
+# tant qu'il manque, l'article est cherché puis créé ou complété.
+
+IDENTITY_INDEX = "ux_stock_items_name_category"
+PREVIOUS_IDENTITY_INDEX = "ix_stock_items_name_category"
+
+_identity_index = None  # présence de l'index unique, vérifiée une fois par processus
+
+NEW_ITEM_DEFAULTS = {
+    "min_threshold": 5,  # Seuil par défaut
+    "max_threshold": 100,  # Seuil par défaut
+    "unit": "pièce",  # Unité par défaut
+    "location": "Stock général",
+    "is_active": True,
+}
+
+
+def _has_identity_index(db: Session) -> bool:
+    global _identity_index
+    if _identity_index is None:
+        indexes = inspect(db.get_bind()).get_indexes(StockItem.__tablename__)
+        _identity_index = any(index["name"] == IDENTITY_INDEX for index in indexes)
+    return _identity_index
+
+
+def ensure_stock_item_identity(db: Session):
+    """Créer l'index unique (nom, catégorie) sur une base existante (comme la migration 0003)
+
+    Si des articles en double existent, l'index n'est pas créé : l'erreur les
+    liste pour qu'ils soient fusionnés (quantités et mouvements), et l'entrée
+    en stock des achats utilise la recherche préalable en attendant.
+    """
+    global _identity_index
+    _identity_index = None
+    if _has_identity_index(db):
+        return
+    duplicates = db.query(StockItem.name, StockItem.category, func.count(StockItem.id)).group_by(
+        StockItem.name, StockItem.category
+    ).having(func.count(StockItem.id) > 1).all()
+    if duplicates:
+        listing = ", ".join(f"{name} ({category}) x{count}" for name, category, count in duplicates[:20])
+        raise RuntimeError(
+            f"{len(duplicates)} articles de stock en double (même nom et catégorie) : {listing}. "
+            f"Fusionnez-les pour créer l'index {IDENTITY_INDEX}."
+        )
+    connection = db.connection()
+    next(index for index in StockItem.__table__.indexes if index.name == IDENTITY_INDEX).create(connection)
+    if any(index["name"] == PREVIOUS_IDENTITY_INDEX for index in inspect(connection).get_indexes(StockItem.__tablename__)):
+        Index(PREVIOUS_IDENTITY_INDEX, StockItem.name, StockItem.category).drop(connection)
+    db.commit()
+    _identity_index = True
+
+
+def _upsert_stock_items(db: Session, rows: List[dict]) -> dict:
+    """Créer les articles ou ajouter leurs quantités ; retourne {(nom, catégorie): id}"""
+    table = StockItem.__table__
+    dialect = db.get_bind().dialect.name
+    if dialect not in ("sqlite", "postgresql") or not _has_identity_index(db):
+        item_ids = {}
+        for row in rows:
+            item_id = db.query(StockItem.id).filter(
+                StockItem.name == row["name"], StockItem.category == row["category"]
+            ).order_by(StockItem.id).limit(1).scalar()
+            if item_id is None:
+                item_id = db.execute(insert(table).returning(table.c.id), row).scalar_one()
+            else:
+                # variations enregistrées par receive_purchases, une par achat
+                _update(db, item_id, {StockItem.current_quantity: StockItem.current_quantity + row["current_quantity"]})
+            item_ids[(row["name"], row["category"])] = item_id
+        return item_ids
+
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as upsert
+    else:
+        from sqlalchemy.dialects.postgresql import insert as upsert
+    statement = upsert(table)
+    statement = statement.on_conflict_do_update(
+        index_elements=["name", "category"],
+        set_={
+            "current_quantity": table.c.current_quantity + statement.excluded.current_quantity,
+            "updated_at": statement.excluded.updated_at
+        }
+    ).returning(table.c.id, table.c.name, table.c.category)
+    return {(name, category): item_id for item_id, name, category in db.execute(statement, rows)}
+
+
+def receive_purchases(db: Session, purchases: list):
+    """Entrer en stock des achats déjà insérés (avec id) dans la transaction courante (sans commit)
+
+    Les quantités sont regroupées par article, puis un mouvement d'entrée
+    référençant l'achat, et sa variation au registre, sont créés pour chaque
+    achat.
+    """
+    now = datetime.utcnow()
+    items = {}
+    for purchase in purchases:
+        category = getattr(purchase.category, "value", purchase.category)
+        row = items.get((purchase.item_name, category))
+        if row is None:
+            items[(purchase.item_name, category)] = {
+                "name": purchase.item_name,
+                "description": purchase.description or f"Achat du {(purchase.purchase_date or now).strftime('%d/%m/%Y')}",
+                "category": category,
+                "current_quantity": purchase.quantity,
+                "created_at": now,
+                "updated_at": now,
+                **NEW_ITEM_DEFAULTS
+            }
+        else:
+            row["current_quantity"] += purchase.quantity
+
+    item_ids = _upsert_stock_items(db, list(items.values()))
+    movements = [
+        {
+            "stock_item_id": item_ids[(purchase.item_name, getattr(purchase.category, "value", purchase.category))],
+            "movement_type": "entry",
+            "quantity": purchase.quantity,
+            "reason": f"Achat - {purchase.item_name}",
+            "reference": f"ACH-{purchase.id}",
+            "created_at": now
+        }
+        for purchase in purchases
+    ]
+    ids = db.scalars(insert(StockMovement).returning(StockMovement.id, sort_by_parameter_order=True), movements).all()
+    record(db, [
+        entry(movement["stock_item_id"], movement["quantity"], LedgerEntryKind.ENTRY, movement_id, created_at=now)
+        for movement, movement_id in zip(movements, ids)
+    ])
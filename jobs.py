@@ -0,0 +1,283 @@
+"""
+Tâches en arrière-plan : bons de réception PDF, rapports lourds et
+réconciliation du registre des stocks
+
+Les tâches sont enregistrées dans la table jobs puis exécutées par un pool
+de processus borné (JOB_WORKERS processus, JOB_QUEUE_SIZE tâches en file au
+plus par worker uvicorn) : le rendu ReportLab et les gros rapports quittent
+le chemin des requêtes et utilisent tous les cœurs, sans courtier externe.
+
+Le processus qui exécute une tâche la réserve par un UPDATE conditionnel
+(pending -> running), avec sa propre session : une tâche n'est exécutée
+qu'une fois, même si plusieurs workers uvicorn la soumettent au démarrage.
+Le résultat (ou l'erreur) est enregistré dans la table, puis téléchargé par
+GET /api/jobs/{id}/download.
+"""
+from fastapi import HTTPException
+from fastapi.responses import Response
+from pydantic import BaseModel, ConfigDict, ValidationError, create_model
+from pydantic.fields import FieldInfo
+from pydantic_core import PydanticUndefined
+from sqlalchemy.orm import Session
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Callable, Dict, Tuple
+import inspect
+import multiprocessing
+import os
+import threading
+
+from database import SessionLocal
+from models import Job, JobKind, JobStatus
+from serialization import dumps
+from routers import reports
+from receipts import cached_receipt, get_received_request, receipt_data, receipt_filename
+from ledger import reconcile, take_snapshots
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", str(os.cpu_count() or 1)))
+JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", "100"))
+JOB_RETENTION_HOURS = float(os.getenv("JOB_RETENTION_HOURS", "24"))  # résultats conservés
+JOB_TIMEOUT = float(os.getenv("JOB_TIMEOUT", "3600"))  # secondes avant qu'une tâche "running" soit abandonnée
+
+FINISHED = (JobStatus.SUCCEEDED.value, JobStatus.FAILED.value)
+
+# Rapports disponibles en tâche : nom -> route de routers/reports.py
+REPORTS = {
+    "purchases-period": reports.get_purchase_period_report,
+    "stock-analysis": reports.get_stock_analysis,
+    "vehicle-costs": reports.get_vehicle_costs_report,
+    "financial-summary": reports.get_financial_summary,
+}
+
+
+def _params_model(name: str, route: Callable):
+    """Modèle de validation construit à partir des paramètres de la route"""
+    fields = {}
+    for parameter in inspect.signature(route).parameters.values():
+        if parameter.name in ("db", "current_user"):
+            continue
+        default = parameter.default
+        if isinstance(default, FieldInfo):  # Query(...)
+            default = default.default
+        if default is inspect.Parameter.empty or default is PydanticUndefined:
+            default = ...
+        fields[parameter.name] = (parameter.annotation, default)
+    return create_model(f"{name}-params", __config__=ConfigDict(extra="forbid"), **fields)
+
+
+REPORT_PARAMS = {name: _params_model(name, route) for name, route in REPORTS.items()}
+
+
+class _ReceiptParams(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    request_id: int
+
+
+class _ReconcileParams(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    repair: bool = False  # enregistrer les écarts comme variations de correction
+
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc'])}: {detail['msg']}" for detail in error.errors()
+    )
+
+
+def validate_params(kind: JobKind, params: dict) -> dict:
+    """Valider les paramètres d'une tâche ; retourne leur forme JSON enregistrée en base"""
+    try:
+        if kind == JobKind.RECEIPT_PDF:
+            return _ReceiptParams(**params).model_dump(mode="json")
+        if kind == JobKind.STOCK_RECONCILE:
+            return _ReconcileParams(**params).model_dump(mode="json")
+        params = dict(params)
+        name = params.pop("report", None)
+        if name not in REPORTS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Rapport inconnu: {name}. Rapports disponibles: {', '.join(REPORTS)}"
+            )
+        return {"report": name, **REPORT_PARAMS[name](**params).model_dump(mode="json")}
+    except ValidationError as error:
+        raise HTTPException(status_code=400, detail=f"Paramètres invalides: {_validation_message(error)}")
+
+
+# === Traitements (exécutés dans les processus du pool) ===
+# Chaque traitement retourne (contenu, type MIME, nom de fichier).
+
+def _receipt_pdf(db: Session, params: dict) -> Tuple[bytes, str, str]:
+    data = receipt_data(get_received_request(db, params["request_id"]))
+    return cached_receipt(data), "application/pdf", receipt_filename(data)
+
+
+def _report(db: Session, params: dict) -> Tuple[bytes, str, str]:
+    params = dict(params)
+    name = params.pop("report")
+    arguments = dict(REPORT_PARAMS[name](**params))
+    value = REPORTS[name](db=db, **arguments)
+    content = value.body if isinstance(value, Response) else dumps(value)  # routes @fast_json
+    return content, "application/json", f"rapport_{name}_{datetime.utcnow():%Y%m%d_%H%M%S}.json"
+
+
+def _stock_reconcile(db: Session, params: dict) -> Tuple[bytes, str, str]:
+    """Instantanés en attente, puis comparaison registre / quantités en stock (validés avec la tâche)"""
+    snapshots = take_snapshots(db)
+    result = {**reconcile(db, _ReconcileParams(**params).repair), "snapshots_taken": snapshots}
+    return dumps(result), "application/json", f"reconciliation_stock_{datetime.utcnow():%Y%m%d_%H%M%S}.json"
+
+
+HANDLERS: Dict[JobKind, Callable[[Session, dict], Tuple[bytes, str, str]]] = {
+    JobKind.RECEIPT_PDF: _receipt_pdf,
+    JobKind.REPORT: _report,
+    JobKind.STOCK_RECONCILE: _stock_reconcile,
+}
+
+
+def run_job(job_id: int):
+    """Exécuter une tâche en attente et enregistrer son résultat"""
+    db = SessionLocal()
+    try:
+        claimed = db.query(Job).filter(Job.id == job_id, Job.status == JobStatus.PENDING.value).update(
+            {Job.status: JobStatus.RUNNING.value, Job.started_at: datetime.utcnow()}, synchronize_session=False
+        )
+        db.commit()
+        if not claimed:
+            return
+
+        job = db.query(Job).filter(Job.id == job_id).one()
+        try:
+            content, media_type, filename = HANDLERS[JobKind(job.kind)](db, job.params)
+            values = {
+                Job.status: JobStatus.SUCCEEDED.value,
+                Job.result: content,
+                Job.result_media_type: media_type,
+                Job.result_filename: filename,
+                Job.result_size: len(content)
+            }
+        except HTTPException as error:
+            db.rollback()
+            values = {Job.status: JobStatus.FAILED.value, Job.error: str(error.detail)}
+        except Exception as error:
+            db.rollback()
+            values = {Job.status: JobStatus.FAILED.value, Job.error: f"{type(error).__name__}: {error}"}
+        values[Job.finished_at] = datetime.utcnow()
+        db.query(Job).filter(Job.id == job_id).update(values, synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+# === Pool de processus (processus de l'application) ===
+
+_executor = None
+_executor_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(JOB_QUEUE_SIZE)
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Pool de processus partagé (tâches, rendu des bons de réception en lot)"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawn : pas de fork d'un processus multi-thread (pool SQLAlchemy, threads uvicorn)
+            _executor = ProcessPoolExecutor(max_workers=JOB_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _executor
+
+
+def _mark_failed(job_id: int, message: str):
+    db = SessionLocal()
+    try:
+        db.query(Job).filter(Job.id == job_id, Job.status.notin_(FINISHED)).update(
+            {Job.status: JobStatus.FAILED.value, Job.error: message, Job.finished_at: datetime.utcnow()},
+            synchronize_session=False
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def _job_done(job_id: int, future):
+    global _executor
+    _slots.release()
+    if future.cancelled():  # arrêt de l'application : la tâche reste en attente
+        return
+    error = future.exception()
+    if error is None:
+        return
+    if isinstance(error, BrokenProcessPool):
+        with _executor_lock:
+            _executor = None  # un processus a été tué : nouveau pool à la prochaine soumission
+    _mark_failed(job_id, f"{type(error).__name__}: {error}")
+
+
+def _submit(job_id: int) -> bool:
+    """Soumettre une tâche au pool ; False si la file est pleine"""
+    if not _slots.acquire(blocking=False):
+        return False
+    try:
+        future = get_executor().submit(run_job, job_id)
+    except Exception:
+        _slots.release()
+        raise
+    future.add_done_callback(partial(_job_done, job_id))
+    return True
+
+
+def _purge_expired(db: Session):
+    cutoff = datetime.utcnow() - timedelta(hours=JOB_RETENTION_HOURS)
+    db.query(Job).filter(Job.status.in_(FINISHED), Job.created_at < cutoff).delete(synchronize_session=False)
+
+
+def enqueue_job(db: Session, kind: JobKind, params: dict, user_id: int) -> Job:
+    """Enregistrer une tâche (paramètres déjà validés) et la soumettre au pool"""
+    if not _slots.acquire(blocking=False):
+        raise HTTPException(status_code=503, detail="File d'attente des tâches pleine, veuillez réessayer plus tard")
+    _slots.release()
+
+    _purge_expired(db)
+    job = Job(kind=kind.value, status=JobStatus.PENDING.value, params=params, created_by_user_id=user_id)
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    try:
+        submitted = _submit(job.id)
+    except Exception as error:
+        _mark_failed(job.id, f"{type(error).__name__}: {error}")
+        raise HTTPException(status_code=503, detail="Impossible de démarrer la tâche")
+    if not submitted:
+        _mark_failed(job.id, "File d'attente des tâches pleine")
+        raise HTTPException(status_code=503, detail="File d'attente des tâches pleine, veuillez réessayer plus tard")
+    return job
+
+
+def start_jobs():
+    """Au démarrage : abandonner les tâches bloquées et relancer celles restées en attente"""
+    db = SessionLocal()
+    try:
+        _purge_expired(db)
+        stale = datetime.utcnow() - timedelta(seconds=JOB_TIMEOUT)
+        db.query(Job).filter(Job.status == JobStatus.RUNNING.value, Job.started_at < stale).update(
+            {Job.status: JobStatus.FAILED.value, Job.error: "Tâche interrompue", Job.finished_at: datetime.utcnow()},
+            synchronize_session=False
+        )
+        db.commit()
+        pending = [job_id for (job_id,) in db.query(Job.id).filter(Job.status == JobStatus.PENDING.value).order_by(Job.id)]
+    finally:
+        db.close()
+    for job_id in pending:
+        if not _submit(job_id):
+            break
+
+
+def shutdown_jobs():
+    """Arrêt de l'application : les tâches non démarrées restent en attente en base"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
@@ -0,0 +1,259 @@
+"""
+Registre des variations de stock (stock_ledger) et quantités à une date
+
+Chaque changement de StockItem.current_quantity ajoute, dans la même
+transaction, une ligne au registre avec sa variation signée : entrée (+),
+sortie (-), ajustement d'inventaire (nouvelle quantité - ancienne),
+annulation d'un mouvement supprimé (opposé de ses variations), quantité à la
+création d'un article. Les lignes du registre ne sont jamais modifiées ni
+supprimées : la quantité d'un article à n'importe quelle date est la somme
+de ses variations jusqu'à cette date.
+
+Pour ne pas additionner tout l'historique, des instantanés par article
+(stock_snapshots) figent cette somme à une date : quantity_as_of() part de
+l'instantané le plus proche et n'ajoute que les variations suivantes. Un
+instantané est pris pour un article dès qu'il a LEDGER_SNAPSHOT_EVERY
+variations depuis le précédent, toutes les LEDGER_SNAPSHOT_INTERVAL
+secondes. Il ne couvre que les variations plus anciennes que
+LEDGER_SNAPSHOT_LAG secondes : une transaction encore en cours ne peut plus
+ajouter de variation avant la date d'un instantané.
+
+reconcile() compare le registre et current_quantity pour tous les articles
+(tâche stock-reconcile, voir jobs.py) ; avec repair, l'écart est enregistré
+comme variation de correction.
+
+Les quantités antérieures au démarrage du registre ne sont pas
+reconstituées : ensure_ledger() enregistre alors un solde d'ouverture daté
+du démarrage.
+"""
+from sqlalchemy import event, func, insert, literal, select, update
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+from typing import List, Optional
+import logging
+import os
+import threading
+
+from models import LedgerEntryKind, StockItem, StockLedgerEntry, StockSnapshot
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_EVERY = int(os.getenv("LEDGER_SNAPSHOT_EVERY", "100"))  # variations depuis l'instantané précédent
+SNAPSHOT_INTERVAL = float(os.getenv("LEDGER_SNAPSHOT_INTERVAL", "3600"))  # secondes, 0 pour désactiver
+SNAPSHOT_LAG = timedelta(seconds=float(os.getenv("LEDGER_SNAPSHOT_LAG", "300")))
+EPOCH = datetime(1970, 1, 1)  # date d'un article sans instantané
+
+
+def entry(stock_item_id: int, delta: int, kind: LedgerEntryKind, movement_id: Optional[int] = None,
+          reason: Optional[str] = None, created_at: Optional[datetime] = None) -> dict:
+    """Ligne du registre à passer à record()"""
+    return {
+        "stock_item_id": stock_item_id,
+        "delta": delta,
+        "kind": kind.value,
+        "movement_id": movement_id,
+        "reason": reason,
+        "created_at": created_at or datetime.utcnow(),
+    }
+
+
+def record(db: Session, entries: List[dict]):
+    """Ajouter des variations au registre dans la transaction courante (sans commit)"""
+    if entries:
+        db.execute(insert(StockLedgerEntry), entries)
+
+
+def lock_item(db: Session, stock_item_id: int) -> bool:
+    """Verrouiller la ligne d'un article jusqu'à la fin de la transaction (False s'il n'existe pas)
+
+    UPDATE sans effet : verrou de ligne (PostgreSQL) ou d'écriture (SQLite).
+    Les lectures suivantes de la transaction voient la dernière quantité
+    validée, qui ne peut plus changer (et passent par l'écrivain avec le
+    profil de production SQLite).
+    """
+    updated = db.execute(
+        update(StockItem).where(StockItem.id == stock_item_id).values(updated_at=StockItem.updated_at)
+    ).rowcount
+    return updated == 1
+
+
+# === Lectures ===
+
+def _last_snapshots():
+    """Dernier instantané de chaque article (stock_item_id, taken_at, quantity)
+
+    Sans instantané : date EPOCH et quantité 0. Les variations suivantes sont
+    lues par des sous-requêtes par article (parcours d'intervalle de l'index
+    (stock_item_id, created_at) du registre) plutôt que par une jointure, que
+    PostgreSQL exécute en parcourant tout le registre.
+    """
+    latest = select(StockSnapshot).where(
+        StockSnapshot.stock_item_id == StockItem.id
+    ).order_by(StockSnapshot.taken_at.desc()).limit(1)
+    return select(
+        StockItem.id.label("stock_item_id"),
+        func.coalesce(latest.with_only_columns(StockSnapshot.taken_at).scalar_subquery(), EPOCH).label("taken_at"),
+        func.coalesce(latest.with_only_columns(StockSnapshot.quantity).scalar_subquery(), 0).label("quantity"),
+    ).subquery()
+
+
+def quantity_as_of(db: Session, stock_item_id: int, as_of: datetime) -> int:
+    """Quantité d'un article à une date : instantané le plus proche + variations suivantes"""
+    snapshot = db.query(StockSnapshot.taken_at, StockSnapshot.quantity).filter(
+        StockSnapshot.stock_item_id == stock_item_id, StockSnapshot.taken_at <= as_of
+    ).order_by(StockSnapshot.taken_at.desc()).first()
+    deltas = db.query(func.coalesce(func.sum(StockLedgerEntry.delta), 0)).filter(
+        StockLedgerEntry.stock_item_id == stock_item_id, StockLedgerEntry.created_at <= as_of
+    )
+    if snapshot is None:
+        return int(deltas.scalar())
+    return snapshot.quantity + int(deltas.filter(StockLedgerEntry.created_at > snapshot.taken_at).scalar())
+
+
+def reconcile(db: Session, repair: bool = False, limit: int = 1000) -> dict:
+    """Articles dont current_quantity diffère du solde du registre
+
+    Les deux valeurs sont lues par une seule requête, donc dans le même état
+    validé de la base. Avec `repair`, chaque écart est revérifié sous verrou
+    puis enregistré comme variation de correction (sans commit).
+    """
+    snapshots = _last_snapshots()
+    total = select(func.coalesce(func.sum(StockLedgerEntry.delta), 0)).where(
+        StockLedgerEntry.stock_item_id == snapshots.c.stock_item_id, StockLedgerEntry.created_at > snapshots.c.taken_at
+    ).scalar_subquery()
+    balances = select(
+        snapshots.c.stock_item_id, (snapshots.c.quantity + total).label("ledger_quantity")
+    ).subquery()
+    current = func.coalesce(StockItem.current_quantity, 0)
+    rows = db.execute(
+        select(StockItem.id, StockItem.name, current.label("current_quantity"), balances.c.ledger_quantity)
+        .join(balances, balances.c.stock_item_id == StockItem.id)
+        .where(current != balances.c.ledger_quantity)
+        .order_by(StockItem.id)
+    ).all()
+    checked = db.query(func.count(StockItem.id)).scalar()
+
+    corrected = 0
+    if repair:
+        now = datetime.utcnow()
+        for row in rows:
+            if not lock_item(db, row.id):
+                continue
+            quantity = db.query(current).filter(StockItem.id == row.id).scalar()
+            drift = quantity - quantity_as_of(db, row.id, now)
+            if drift:
+                record(db, [entry(row.id, drift, LedgerEntryKind.CORRECTION, reason="Réconciliation", created_at=now)])
+                corrected += 1
+
+    return {
+        "checked_at": datetime.utcnow().isoformat(),
+        "items_checked": checked,
+        "drifted": len(rows),
+        "corrected": corrected,
+        "items": [
+            {
+                "stock_item_id": row.id,
+                "name": row.name,
+                "current_quantity": row.current_quantity,
+                "ledger_quantity": row.ledger_quantity,
+                "drift": row.current_quantity - row.ledger_quantity,
+            }
+            for row in rows[:limit]
+        ],
+        "items_truncated": len(rows) > limit,
+    }
+
+
+# === Instantanés ===
+
+def take_snapshots(db: Session, every: int = SNAPSHOT_EVERY, lag: timedelta = SNAPSHOT_LAG) -> int:
+    """Instantané des articles ayant au moins `every` variations depuis le précédent (sans commit)
+
+    Une seule requête INSERT ... SELECT ; retourne le nombre d'instantanés pris.
+    """
+    cutoff = datetime.utcnow() - lag
+    snapshots = _last_snapshots()
+    window = (
+        StockLedgerEntry.stock_item_id == snapshots.c.stock_item_id,
+        StockLedgerEntry.created_at > snapshots.c.taken_at,
+        StockLedgerEntry.created_at <= cutoff,
+    )
+    totals = select(
+        snapshots.c.stock_item_id,
+        snapshots.c.quantity,
+        select(func.sum(StockLedgerEntry.delta)).where(*window).scalar_subquery().label("total"),
+        select(func.count(StockLedgerEntry.id)).where(*window).scalar_subquery().label("entries"),
+    ).subquery()
+    pending = select(
+        totals.c.stock_item_id, literal(cutoff).label("taken_at"), (totals.c.quantity + totals.c.total).label("quantity")
+    ).where(totals.c.entries >= every)
+    return db.execute(
+        insert(StockSnapshot).from_select(["stock_item_id", "taken_at", "quantity"], pending)
+    ).rowcount
+
+
+def ensure_ledger(db: Session):
+    """Démarrer le registre d'une base existante : solde d'ouverture de chaque article
+
+    Ne fait rien si le registre contient déjà des variations.
+    """
+    if db.query(StockLedgerEntry.id).first() is not None:
+        return
+    now = datetime.utcnow()
+    opening = select(
+        StockItem.id, StockItem.current_quantity, literal(LedgerEntryKind.OPENING.value),
+        literal("Solde d'ouverture"), literal(now)
+    ).where(
+        StockItem.current_quantity != 0,
+        ~select(StockLedgerEntry.id).exists()  # un autre worker a démarré le registre entre-temps
+    )
+    db.execute(insert(StockLedgerEntry).from_select(["stock_item_id", "delta", "kind", "reason", "created_at"], opening))
+    db.commit()
+
+
+_stop = threading.Event()
+
+
+def _snapshot_loop(session_factory):
+    while not _stop.wait(SNAPSHOT_INTERVAL):
+        db = session_factory()
+        try:
+            taken = take_snapshots(db)
+            db.commit()
+            if taken:
+                logger.info("%d instantanés de stock enregistrés", taken)
+        except Exception:
+            db.rollback()
+            logger.exception("Instantanés de stock impossibles")
+        finally:
+            db.close()
+
+
+def start_snapshots(session_factory):
+    """Prendre les instantanés périodiquement (thread de fond du worker)"""
+    if SNAPSHOT_INTERVAL <= 0:
+        return
+    _stop.clear()
+    threading.Thread(target=_snapshot_loop, args=(session_factory,), name="ledger-snapshots", daemon=True).start()
+
+
+def stop_snapshots():
+    _stop.set()
+
+
+# === Registre en ajout seul ===
+
+@event.listens_for(StockItem, "after_insert")
+def _record_initial_quantity(mapper, connection, target):
+    """Article créé par l'ORM avec une quantité : variation initiale"""
+    if target.current_quantity:
+        connection.execute(insert(StockLedgerEntry), entry(
+            target.id, target.current_quantity, LedgerEntryKind.INITIAL, reason="Création de l'article",
+            created_at=target.created_at
+        ))
+
+
+@event.listens_for(StockLedgerEntry, "before_update")
+@event.listens_for(StockLedgerEntry, "before_delete")
+def _refuse_changes(mapper, connection, target):
+    raise ValueError("Le registre des stocks est en ajout seul : enregistrer une variation inverse")
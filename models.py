@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, Boolean, ForeignKey, Text, UniqueConstraint, Index, JSON, LargeBinary
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime
 from enum import Enum
 
@@ -34,9 +34,70 @@ class VehicleStatus(str, Enum):
     MAINTENANCE = "maintenance"
     OUT_OF_SERVICE = "out_of_service"
 
+class BatchMode(str, Enum):
+    ALL_OR_NOTHING = "all_or_nothing"  # une ligne refusée annule tout le lot
+    BEST_EFFORT = "best_effort"        # les lignes valides sont appliquées
+
+class ExportEntity(str, Enum):
+    PURCHASES = "purchases"
+    STOCK_MOVEMENTS = "stock-movements"
+    FUEL = "fuel"
+    MAINTENANCE = "maintenance"
+
+class ExportFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+class ImportEntity(str, Enum):
+    STOCK_ITEMS = "stock-items"
+    SUPPLIERS = "suppliers"
+    PURCHASES = "purchases"
+
+class ReceiptBatchFormat(str, Enum):
+    ZIP = "zip"  # un fichier PDF par bon
+    PDF = "pdf"  # un seul PDF fusionné
+
+class SearchEntity(str, Enum):
+    STOCK_ITEM = "stock_item"
+    SUPPLIER = "supplier"
+    SERVICE_PROVIDER = "service_provider"
+    VEHICLE = "vehicle"
+    SERVICE = "service"
+
+class SuggestEntity(str, Enum):
+    STOCK_ITEM = "stock_item"
+    SUPPLIER = "supplier"
+    VEHICLE = "vehicle"
+
+class JobKind(str, Enum):
+    RECEIPT_PDF = "receipt-pdf"          # bon de réception signé
+    REPORT = "report"                    # rapport JSON (voir jobs.REPORTS)
+    STOCK_RECONCILE = "stock-reconcile"  # écarts entre le registre et les quantités en stock
+
+class LedgerEntryKind(str, Enum):
+    OPENING = "opening"        # solde d'ouverture des articles existants (démarrage du registre)
+    INITIAL = "initial"        # quantité à la création de l'article
+    ENTRY = "entry"
+    EXIT = "exit"
+    ADJUSTMENT = "adjustment"  # inventaire : écart avec la quantité précédente
+    REVERSAL = "reversal"      # annulation d'un mouvement supprimé
+    CORRECTION = "correction"  # écart corrigé par la réconciliation
+
+class JobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
 # Modèle pour les achats
 class Purchase(Base):
     __tablename__ = "purchases"
+    __table_args__ = (
+        Index("ix_purchases_purchase_date_category", "purchase_date", "category"),
+        Index("ix_purchases_supplier_purchase_date", "supplier", "purchase_date"),
+        Index("ix_purchases_item_name_category_unit_price", "item_name", "category", "unit_price"),  # valorisation du stock
+        Index("ix_purchases_created_at_id", "created_at", "id"),  # pagination
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     item_name = Column(String(255), nullable=False)
@@ -58,6 +119,9 @@ class Purchase(Base):
 # Modèle pour le stock
 class StockItem(Base):
     __tablename__ = "stock_items"
+    __table_args__ = (
+        Index("ux_stock_items_name_category", "name", "category", unique=True),  # identité de l'article (entrée en stock des achats)
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
@@ -82,6 +146,10 @@ class StockItem(Base):
 # Modèle pour les mouvements de stock
 class StockMovement(Base):
     __tablename__ = "stock_movements"
+    __table_args__ = (
+        Index("ix_stock_movements_stock_item_id_created_at", "stock_item_id", "created_at", "id"),
+        Index("ix_stock_movements_created_at_id", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     stock_item_id = Column(Integer, ForeignKey("stock_items.id"), nullable=False)
@@ -96,6 +164,33 @@ class StockMovement(Base):
     stock_item = relationship("StockItem", back_populates="stock_movements")
     user = relationship("User")
 
+# Registre des variations de stock (ajout seul, voir ledger.py)
+class StockLedgerEntry(Base):
+    __tablename__ = "stock_ledger"
+    __table_args__ = (
+        Index("ix_stock_ledger_stock_item_id_created_at", "stock_item_id", "created_at", "id"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    stock_item_id = Column(Integer, ForeignKey("stock_items.id"), nullable=False)
+    delta = Column(Integer, nullable=False)  # Variation signée de la quantité
+    kind = Column(String(20), nullable=False)  # LedgerEntryKind
+    movement_id = Column(Integer, index=True)  # Mouvement d'origine (sans clé étrangère : le registre survit au mouvement)
+    reason = Column(String(255))
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+# Quantité d'un article à une date : somme des variations jusqu'à taken_at inclus
+class StockSnapshot(Base):
+    __tablename__ = "stock_snapshots"
+    __table_args__ = (
+        UniqueConstraint("stock_item_id", "taken_at", name="uq_stock_snapshot"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    stock_item_id = Column(Integer, ForeignKey("stock_items.id"), nullable=False)
+    taken_at = Column(DateTime, nullable=False)
+    quantity = Column(Integer, nullable=False)
+
 # Modèle pour les véhicules
 class Vehicle(Base):
     __tablename__ = "vehicles"
@@ -122,6 +217,11 @@ class Vehicle(Base):
 # Modèle pour les enregistrements de maintenance
 class MaintenanceRecord(Base):
     __tablename__ = "maintenance_records"
+    __table_args__ = (
+        Index("ix_maintenance_records_next_service_due", "next_service_due"),
+        Index("ix_maintenance_records_service_date_id", "service_date", "id"),  # pagination
+        Index("ix_maintenance_records_vehicle_id_service_date", "vehicle_id", "service_date", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     vehicle_id = Column(Integer, ForeignKey("vehicles.id"))
@@ -142,6 +242,10 @@ class MaintenanceRecord(Base):
 # Modèle pour les pannes et dépannages
 class Breakdown(Base):
     __tablename__ = "breakdowns"
+    __table_args__ = (
+        Index("ix_breakdowns_vehicle_id_breakdown_date", "vehicle_id", "breakdown_date", "id"),
+        Index("ix_breakdowns_breakdown_date_id", "breakdown_date", "id"),  # pagination
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     vehicle_id = Column(Integer, ForeignKey("vehicles.id"))
@@ -182,6 +286,10 @@ class ServiceProvider(Base):
 # Modèle pour les enregistrements de carburant
 class FuelRecord(Base):
     __tablename__ = "fuel_records"
+    __table_args__ = (
+        Index("ix_fuel_records_vehicle_id_refuel_date", "vehicle_id", "refuel_date"),
+        Index("ix_fuel_records_refuel_date", "refuel_date"),  # export chronologique
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     vehicle_id = Column(Integer, ForeignKey("vehicles.id"))
@@ -247,6 +355,11 @@ class Supplier(Base):
 # Modèle pour les demandes d'achat avec workflow de validation
 class PurchaseRequest(Base):
     __tablename__ = "purchase_requests"
+    __table_args__ = (
+        Index("ix_purchase_requests_status_department", "status", "department"),
+        Index("ix_purchase_requests_requested_by_user_id_created_at", "requested_by_user_id", "created_at", "id"),
+        Index("ix_purchase_requests_created_at_id", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     request_number = Column(String(50), unique=True, nullable=False, index=True)  # Numéro de demande
@@ -312,3 +425,52 @@ class Service(Base):
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+# Agrégats journaliers des achats (par jour, catégorie et fournisseur)
+class DailyPurchaseRollup(Base):
+    __tablename__ = "daily_purchase_rollups"
+    __table_args__ = (
+        UniqueConstraint("day", "category", "supplier", name="uq_daily_purchase_rollup"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    day = Column(Date, nullable=False, index=True)
+    category = Column(String(50), nullable=False)
+    supplier = Column(String(255), nullable=False, default="")  # "" si aucun fournisseur
+    purchase_count = Column(Integer, nullable=False, default=0)
+    total_amount = Column(Float, nullable=False, default=0.0)
+
+# Agrégats journaliers des coûts véhicules (carburant et maintenance)
+class DailyVehicleCostRollup(Base):
+    __tablename__ = "daily_vehicle_cost_rollups"
+    __table_args__ = (
+        UniqueConstraint("day", "vehicle_id", "cost_type", name="uq_daily_vehicle_cost_rollup"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    day = Column(Date, nullable=False, index=True)
+    vehicle_id = Column(Integer, ForeignKey("vehicles.id"))
+    cost_type = Column(String(20), nullable=False)  # "fuel" ou "maintenance"
+    record_count = Column(Integer, nullable=False, default=0)
+    total_cost = Column(Float, nullable=False, default=0.0)
+
+# Tâches en arrière-plan (PDF, rapports lourds) exécutées par jobs.py
+class Job(Base):
+    __tablename__ = "jobs"
+    __table_args__ = (
+        Index("ix_jobs_status_created_at", "status", "created_at"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(50), nullable=False)  # JobKind
+    status = Column(String(20), nullable=False, default="pending")  # JobStatus
+    params = Column(JSON, nullable=False, default=dict)
+    error = Column(Text)
+    result = deferred(Column(LargeBinary))  # chargé seulement pour le téléchargement
+    result_media_type = Column(String(100))
+    result_filename = Column(String(255))
+    result_size = Column(Integer)
+    created_by_user_id = Column(Integer, ForeignKey("users.id"))
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
@@ -0,0 +1,81 @@
+"""
+Pagination par curseur (keyset) pour les listes
+
+Au lieu de OFFSET, la page suivante est sélectionnée par une condition sur
+la clé de tri et l'identifiant de la dernière ligne reçue : le coût d'une
+page ne dépend plus de sa profondeur dans l'historique.
+
+Le curseur de la page suivante est renvoyé dans l'en-tête X-Next-Cursor
+(absent sur la dernière page) pour garder le corps des réponses inchangé.
+Le paramètre `skip` reste accepté pour la compatibilité.
+"""
+from fastapi import HTTPException, Response
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query
+from datetime import datetime
+from typing import Optional
+import base64
+import json
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(key, row_id: int) -> str:
+    """Curseur opaque à partir de la clé de tri et de l'identifiant"""
+    if isinstance(key, datetime):
+        key = {"dt": key.isoformat()}
+    payload = json.dumps({"k": key, "id": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    """Retourne (clé de tri, identifiant) ou lève une erreur 400"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        key = payload["k"]
+        if isinstance(key, dict):
+            key = datetime.fromisoformat(key["dt"])
+        return key, int(payload["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Curseur de pagination invalide")
+
+
+def paginate(
+    query: Query,
+    key_column,
+    id_column,
+    limit: int,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    response: Optional[Response] = None,
+    descending: bool = True
+) -> list:
+    """Appliquer la pagination par curseur (ou par offset si `skip` est fourni)
+
+    Les lignes sont triées par (key_column, id_column). Quand une page
+    suivante existe, son curseur est placé dans l'en-tête de la réponse.
+    """
+    if cursor:
+        key, row_id = decode_cursor(cursor)
+        if descending:
+            query = query.filter(or_(key_column < key, and_(key_column == key, id_column < row_id)))
+        else:
+            query = query.filter(or_(key_column > key, and_(key_column == key, id_column > row_id)))
+    elif skip:
+        query = query.offset(skip)
+
+    if descending:
+        query = query.order_by(key_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(key_column.asc(), id_column.asc())
+
+    rows = query.limit(limit + 1).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        if response is not None:
+            last = rows[-1]
+            response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+                getattr(last, key_column.key), getattr(last, id_column.key)
+            )
+    return rows
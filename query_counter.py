@@ -0,0 +1,83 @@
+"""
+Compteur de requêtes SQL par requête HTTP et budgets par route
+
+Chaque requête HTTP compte les requêtes SQL qu'elle exécute (en-tête
+X-Query-Count). Une route peut déclarer un budget avec @query_budget(n) :
+en cas de dépassement, un avertissement est journalisé, ou la requête
+échoue si QUERY_BUDGET_STRICT=1 (à activer pendant les tests pour
+détecter les régressions N+1). benchmarks/check_query_budgets.py appelle
+toutes les routes budgétées dans ce mode.
+"""
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from contextvars import ContextVar
+from typing import Callable, Optional
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+_query_count: ContextVar[Optional[list]] = ContextVar("query_count", default=None)
+
+
+class QueryBudgetExceeded(Exception):
+    """Une route a exécuté plus de requêtes SQL que son budget"""
+
+
+def query_budget(max_queries: int):
+    """Déclarer le nombre maximal de requêtes SQL d'une route"""
+    def decorator(func: Callable):
+        func.query_budget = max_queries
+        return func
+    return decorator
+
+
+def current_query_count() -> int:
+    counter = _query_count.get()
+    return counter[0] if counter is not None else 0
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    counter = _query_count.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+class QueryCounterMiddleware:
+    """Middleware ASGI : compte les requêtes SQL et vérifie le budget de la route"""
+
+    def __init__(self, app, strict: Optional[bool] = None):
+        self.app = app
+        self.strict = strict if strict is not None else os.getenv("QUERY_BUDGET_STRICT", "0") == "1"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        counter = [0]
+        token = _query_count.set(counter)
+
+        async def send_with_count(message):
+            if message["type"] == "http.response.start":
+                self._check_budget(scope, counter[0])
+                headers = list(message.get("headers", []))
+                headers.append((b"x-query-count", str(counter[0]).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_count)
+        finally:
+            _query_count.reset(token)
+
+    def _check_budget(self, scope, count: int):
+        route = scope.get("route")
+        budget = getattr(getattr(route, "endpoint", None), "query_budget", None)
+        if budget is None or count <= budget:
+            return
+        message = f"{scope.get('method')} {scope.get('path')} : {count} requêtes SQL (budget {budget})"
+        if self.strict:
+            raise QueryBudgetExceeded(message)
+        logger.warning("Budget de requêtes dépassé - %s", message)
@@ -0,0 +1,273 @@
+"""
+Bons de réception PDF : rendu et cache adressé par contenu
+
+Le rendu part d'un dictionnaire de valeurs déjà formatées (receipt_data),
+qui peut être envoyé tel quel à un processus du pool de jobs.py. Les
+styles ReportLab sont construits une seule fois par processus.
+
+Cache : chaque PDF est enregistré dans RECEIPT_CACHE_DIR sous l'empreinte
+SHA-256 de ses données (et de RECEIPT_LAYOUT_VERSION). Toute modification
+de la demande d'achat (réception, signature, fournisseur...) change
+l'empreinte : l'ancien fichier n'est plus jamais lu et finit par être
+supprimé quand le cache dépasse RECEIPT_CACHE_MAX_FILES fichiers. Le
+répertoire est partagé par les workers uvicorn et les processus du pool.
+"""
+from fastapi import HTTPException
+from sqlalchemy.orm import Session, joinedload
+from datetime import datetime
+from functools import lru_cache
+from typing import List, Optional
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER
+
+from models import PurchaseRequest
+from blobstore import signature_bytes
+
+RECEIPT_CACHE_DIR = os.getenv("RECEIPT_CACHE_DIR", os.path.join(tempfile.gettempdir(), "gestion_stock_receipts"))
+RECEIPT_CACHE_MAX_FILES = int(os.getenv("RECEIPT_CACHE_MAX_FILES", "10000"))  # 0 pour désactiver le cache
+RECEIPT_LAYOUT_VERSION = 1  # à incrémenter quand la mise en page change
+
+_PRUNE_EVERY = 100  # écritures entre deux vérifications de la taille du cache
+_writes = 0
+_writes_lock = threading.Lock()
+
+
+def get_received_request(db: Session, request_id: int) -> PurchaseRequest:
+    """Demande d'achat réceptionnée (404 ou 400 sinon)"""
+    request = db.query(PurchaseRequest).options(joinedload(PurchaseRequest.supplier)).filter(
+        PurchaseRequest.id == request_id
+    ).first()
+    if not request:
+        raise HTTPException(status_code=404, detail="Demande d'achat non trouvée")
+
+    if request.status != "received":
+        raise HTTPException(status_code=400, detail="Cette demande n'a pas encore été reçue")
+    return request
+
+
+def receipt_filename(data: dict) -> str:
+    return f"bon_reception_{data['request_number']}.pdf"
+
+
+def receipt_data(request: PurchaseRequest) -> dict:
+    """Valeurs affichées sur le bon de réception"""
+    return {
+        "request_number": request.request_number,
+        "item_name": request.item_name,
+        "description": request.description or "N/A",
+        "quantity": f"{request.quantity} {request.unit}",
+        "category": request.category,
+        "department": request.department,
+        "requested_by": request.requested_by,
+        "requested_at": request.requested_at.strftime("%d/%m/%Y à %H:%M"),
+        "order_number": request.order_number or "N/A",
+        "supplier": request.supplier.name if request.supplier else "N/A",
+        "received_at": request.received_at.strftime("%d/%m/%Y à %H:%M"),
+        "received_by": request.received_by,
+        "receipt_notes": request.receipt_notes or "Aucune note",
+        "signature": request.receipt_signature,  # référence "sha256:..." : l'empreinte suit l'image
+    }
+
+
+def receipt_key(data: dict) -> str:
+    """Empreinte du bon de réception (nom du fichier en cache, ETag)"""
+    content = json.dumps([RECEIPT_LAYOUT_VERSION, data], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _styles() -> dict:
+    """Styles du document, construits une fois par processus"""
+    styles = getSampleStyleSheet()
+    return {
+        "title": ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=18,
+            spaceAfter=30,
+            alignment=TA_CENTER,
+            textColor=colors.darkblue
+        ),
+        "header": ParagraphStyle(
+            'Header',
+            parent=styles['Heading2'],
+            fontSize=14,
+            spaceAfter=12,
+            textColor=colors.darkblue
+        ),
+        "normal": ParagraphStyle(
+            'Normal',
+            parent=styles['Normal'],
+            fontSize=10,
+            spaceAfter=6
+        ),
+        "footer": ParagraphStyle('Footer', parent=styles['Normal'], fontSize=8, alignment=TA_CENTER),
+        "request_table": TableStyle([
+            ('BACKGROUND', (0, 0), (-1, -1), colors.lightgrey),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+            ('BACKGROUND', (0, 0), (0, -1), colors.lightblue),
+            ('TEXTCOLOR', (0, 0), (0, -1), colors.darkblue),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ]),
+        "reception_table": TableStyle([
+            ('BACKGROUND', (0, 0), (-1, -1), colors.lightgreen),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+            ('BACKGROUND', (0, 0), (0, -1), colors.green),
+            ('TEXTCOLOR', (0, 0), (0, -1), colors.white),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ]),
+    }
+
+
+def render_receipt(data: dict) -> bytes:
+    """Construire le PDF du bon de réception signé"""
+    styles = _styles()
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
+
+    # En-tête
+    story = [Paragraph("BON DE RÉCEPTION", styles["title"]), Spacer(1, 20)]
+
+    # Informations de la demande
+    story.append(Paragraph("INFORMATIONS DE LA COMMANDE", styles["header"]))
+    request_table = Table([
+        ["Numéro de demande:", data["request_number"]],
+        ["Article demandé:", data["item_name"]],
+        ["Description:", data["description"]],
+        ["Quantité:", data["quantity"]],
+        ["Catégorie:", data["category"]],
+        ["Service demandeur:", data["department"]],
+        ["Demandé par:", data["requested_by"]],
+        ["Date de demande:", data["requested_at"]],
+        ["Numéro de commande:", data["order_number"]],
+        ["Fournisseur:", data["supplier"]]
+    ], colWidths=[2*inch, 4*inch])
+    request_table.setStyle(styles["request_table"])
+    story.append(request_table)
+    story.append(Spacer(1, 20))
+
+    # Informations de réception
+    story.append(Paragraph("INFORMATIONS DE RÉCEPTION", styles["header"]))
+    reception_table = Table([
+        ["Date de réception:", data["received_at"]],
+        ["Reçu par:", data["received_by"]],
+        ["Notes de réception:", data["receipt_notes"]],
+        ["Statut:", "REÇU"]
+    ], colWidths=[2*inch, 4*inch])
+    reception_table.setStyle(styles["reception_table"])
+    story.append(reception_table)
+    story.append(Spacer(1, 20))
+
+    # Signature
+    signature = data["signature"]
+    if signature:
+        story.append(Paragraph("SIGNATURE ÉLECTRONIQUE", styles["header"]))
+        story.append(Spacer(1, 10))
+
+        try:
+            # Image lue telle quelle dans le stockage des signatures
+            signature_data = signature_bytes(signature)
+            if signature_data is None:
+                raise FileNotFoundError(signature)
+            story.append(Image(io.BytesIO(signature_data), width=4*inch, height=1.5*inch))
+        except Exception as e:
+            story.append(Paragraph(f"Erreur lors du chargement de la signature: {str(e)}", styles["normal"]))
+
+    story.append(Spacer(1, 30))
+
+    # Pied de page
+    story.append(Paragraph(f"Document généré le {datetime.now().strftime('%d/%m/%Y à %H:%M')}", styles["footer"]))
+
+    doc.build(story)
+    return buffer.getvalue()
+
+
+# === Cache ===
+
+def _cache_path(key: str) -> str:
+    return os.path.join(RECEIPT_CACHE_DIR, key[:2], f"{key}.pdf")
+
+
+def is_cached(key: str) -> bool:
+    return RECEIPT_CACHE_MAX_FILES > 0 and os.path.exists(_cache_path(key))
+
+
+def read_cached(key: str) -> Optional[bytes]:
+    """PDF en cache (None si absent)"""
+    if RECEIPT_CACHE_MAX_FILES <= 0:
+        return None
+    try:
+        with open(_cache_path(key), "rb") as cached:
+            return cached.read()
+    except OSError:
+        return None
+
+
+def _prune():
+    """Supprimer les fichiers les plus anciens au-delà de RECEIPT_CACHE_MAX_FILES (90 % conservés)"""
+    entries = []
+    for directory in os.scandir(RECEIPT_CACHE_DIR):
+        if directory.is_dir():
+            entries.extend((entry.stat().st_mtime, entry.path) for entry in os.scandir(directory.path))
+    if len(entries) <= RECEIPT_CACHE_MAX_FILES:
+        return
+    entries.sort()
+    for _, path in entries[:len(entries) - RECEIPT_CACHE_MAX_FILES * 9 // 10]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _store(key: str, content: bytes):
+    global _writes
+    if RECEIPT_CACHE_MAX_FILES <= 0:
+        return
+    path = _cache_path(key)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Écriture atomique : un lecteur concurrent ne voit jamais de fichier partiel
+        descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(descriptor, "wb") as output:
+            output.write(content)
+        os.replace(temporary, path)
+    except OSError:
+        return  # cache indisponible (disque plein, droits) : le PDF est quand même servi
+    with _writes_lock:
+        _writes += 1
+        prune = _writes % _PRUNE_EVERY == 0
+    if prune:
+        _prune()
+
+
+def cached_receipt(data: dict) -> bytes:
+    """PDF du bon de réception, rendu seulement s'il n'est pas en cache"""
+    key = receipt_key(data)
+    content = read_cached(key)
+    if content is None:
+        content = render_receipt(data)
+        _store(key, content)
+    return content
+
+
+def render_receipts(datas: List[dict]) -> List[bytes]:
+    """Rendre (et mettre en cache) un lot de bons : exécuté dans un processus du pool"""
+    return [cached_receipt(data) for data in datas]
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Agrégats journaliers matérialisés pour les achats, le carburant et la maintenance
+
+Les routes d'écriture mettent à jour les agrégats de façon incrémentale dans
+la même transaction que la ligne source. Les rapports par période lisent
+ensuite au plus une ligne par jour et par clé au lieu d'une ligne par achat.
+
+Reconstruction complète : python rollups.py
+"""
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import func, insert, select, literal, or_
+from sqlalchemy.orm import Session
+from datetime import datetime, date, time, timedelta
+from typing import Optional, List, Tuple, Any, Dict
+from models import Purchase, FuelRecord, MaintenanceRecord, DailyPurchaseRollup, DailyVehicleCostRollup
+
+
+def _day(value: Optional[datetime]) -> date:
+    return (value or datetime.utcnow()).date()
+
+
+def _increment(db: Session, model, key: dict, values: dict):
+    """Ajouter des valeurs à une ligne d'agrégat (créée si nécessaire)"""
+    _add(db, model, [{**key, **values}], list(key), list(values))
+
+
+def _add(db: Session, model, rows: List[dict], key_fields: List[str], value_fields: List[str]):
+    """Ajouter des lignes (clé + valeurs) aux agrégats, créées si nécessaire
+
+    Un seul INSERT ... ON CONFLICT DO UPDATE exécuté en lot (SQLite et
+    PostgreSQL) : deux premières écritures concurrentes sur la même clé
+    s'additionnent au lieu de violer la contrainte d'unicité. Les autres
+    bases, et les clés contenant NULL (que la contrainte ne compare pas),
+    passent par un UPDATE puis un INSERT si aucune ligne n'existait.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        fallback = [row for row in rows if any(row[field] is None for field in key_fields)]
+        rows = [row for row in rows if all(row[field] is not None for field in key_fields)]
+    else:
+        fallback, rows = rows, []
+
+    for row in fallback:
+        updated = db.query(model).filter_by(**{field: row[field] for field in key_fields}).update(
+            {getattr(model, field): getattr(model, field) + row[field] for field in value_fields},
+            synchronize_session=False
+        )
+        if not updated:
+            db.add(model(**row))
+            db.flush()
+
+    if not rows:
+        return
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as upsert
+    else:
+        from sqlalchemy.dialects.postgresql import insert as upsert
+    statement = upsert(model)
+    statement = statement.on_conflict_do_update(
+        index_elements=key_fields,
+        set_={field: getattr(model, field) + getattr(statement.excluded, field) for field in value_fields}
+    )
+    db.execute(statement, rows)
+
+
+def record_purchase(db: Session, purchase: Purchase, sign: int = 1):
+    """Répercuter un achat sur les agrégats (sign=-1 pour le retirer)"""
+    _increment(db, DailyPurchaseRollup, {
+        "day": _day(purchase.purchase_date),
+        "category": getattr(purchase.category, "value", purchase.category),
+        "supplier": purchase.supplier or ""
+    }, {
+        "purchase_count": sign,
+        "total_amount": sign * (purchase.amount or 0.0)
+    })
+
+
+def record_purchases(db: Session, purchases: List[dict]):
+    """Répercuter un lot d'achats (dictionnaires de colonnes) sur les agrégats
+
+    Les achats sont regroupés par jour et par clé, puis tous les groupes
+    sont ajoutés en une seule instruction (voir _add).
+    """
+    totals = {}
+    for purchase in purchases:
+        key = (
+            _day(purchase.get("purchase_date")),
+            getattr(purchase["category"], "value", purchase["category"]),
+            purchase.get("supplier") or ""
+        )
+        count, amount = totals.get(key, (0, 0.0))
+        totals[key] = (count + 1, amount + (purchase.get("amount") or 0.0))
+
+    _add(db, DailyPurchaseRollup, [
+        {"day": day, "category": category, "supplier": supplier, "purchase_count": count, "total_amount": amount}
+        for (day, category, supplier), (count, amount) in totals.items()
+    ], ["day", "category", "supplier"], ["purchase_count", "total_amount"])
+
+
+def record_fuel(db: Session, fuel_record: FuelRecord, sign: int = 1):
+    """Répercuter un ravitaillement sur les agrégats"""
+    _increment(db, DailyVehicleCostRollup, {
+        "day": _day(fuel_record.refuel_date),
+        "vehicle_id": fuel_record.vehicle_id,
+        "cost_type": "fuel"
+    }, {
+        "record_count": sign,
+        "total_cost": sign * (fuel_record.total_cost or 0.0)
+    })
+
+
+def record_maintenance(db: Session, maintenance: MaintenanceRecord, sign: int = 1):
+    """Répercuter un entretien sur les agrégats"""
+    _increment(db, DailyVehicleCostRollup, {
+        "day": _day(maintenance.service_date),
+        "vehicle_id": maintenance.vehicle_id,
+        "cost_type": "maintenance"
+    }, {
+        "record_count": sign,
+        "total_cost": sign * (maintenance.cost or 0.0)
+    })
+
+
+def rebuild_rollups(db: Session):
+    """Recalculer tous les agrégats à partir des tables sources"""
+    db.query(DailyPurchaseRollup).delete(synchronize_session=False)
+    db.query(DailyVehicleCostRollup).delete(synchronize_session=False)
+
+    purchase_day = func.date(Purchase.purchase_date)
+    supplier = func.coalesce(Purchase.supplier, "")
+    db.execute(insert(DailyPurchaseRollup).from_select(
+        ["day", "category", "supplier", "purchase_count", "total_amount"],
+        select(
+            purchase_day, Purchase.category, supplier,
+            func.count(), func.coalesce(func.sum(Purchase.amount), 0.0)
+        ).where(Purchase.purchase_date.isnot(None)).group_by(purchase_day, Purchase.category, supplier)
+    ))
+
+    for cost_type, day_column, vehicle_column, cost_column in (
+        ("fuel", FuelRecord.refuel_date, FuelRecord.vehicle_id, FuelRecord.total_cost),
+        ("maintenance", MaintenanceRecord.service_date, MaintenanceRecord.vehicle_id, MaintenanceRecord.cost),
+    ):
+        record_day = func.date(day_column)
+        db.execute(insert(DailyVehicleCostRollup).from_select(
+            ["day", "vehicle_id", "cost_type", "record_count", "total_cost"],
+            select(
+                record_day, vehicle_column, literal(cost_type),
+                func.count(), func.coalesce(func.sum(cost_column), 0.0)
+            ).where(day_column.isnot(None)).group_by(record_day, vehicle_column)
+        ))
+
+    db.commit()
+
+
+def ensure_rollups(db: Session):
+    """Reconstruire les agrégats s'ils sont vides alors que des données existent (premier démarrage)"""
+    if db.query(DailyPurchaseRollup.id).first() or db.query(DailyVehicleCostRollup.id).first():
+        return
+    if db.query(Purchase.id).first() or db.query(FuelRecord.id).first() or db.query(MaintenanceRecord.id).first():
+        rebuild_rollups(db)
+
+
+def purchase_period_totals(db: Session, start_date: datetime, end_date: datetime) -> Tuple[float, int]:
+    """Montant total et nombre d'achats sur une période (bornes incluses, au jour près)"""
+    total, count = db.query(
+        func.coalesce(func.sum(DailyPurchaseRollup.total_amount), 0.0),
+        func.coalesce(func.sum(DailyPurchaseRollup.purchase_count), 0)
+    ).filter(
+        DailyPurchaseRollup.day >= start_date.date(),
+        DailyPurchaseRollup.day <= end_date.date()
+    ).one()
+    return float(total), int(count)
+
+
+def purchase_period_breakdown(
+    db: Session,
+    key_column,
+    start_date: datetime,
+    end_date: datetime,
+    filters: Optional[list] = None,
+    limit: Optional[int] = None
+) -> List[Tuple[Any, int, float]]:
+    """Nombre d'achats et montant par clé (catégorie ou fournisseur), triés par montant décroissant"""
+    amount = func.sum(DailyPurchaseRollup.total_amount)
+    query = db.query(
+        key_column,
+        func.sum(DailyPurchaseRollup.purchase_count),
+        amount
+    ).filter(
+        DailyPurchaseRollup.day >= start_date.date(),
+        DailyPurchaseRollup.day <= end_date.date(),
+        *(filters or [])
+    ).group_by(key_column).having(func.sum(DailyPurchaseRollup.purchase_count) > 0).order_by(amount.desc())
+    if limit:
+        query = query.limit(limit)
+    return [(key, int(count), float(total)) for key, count, total in query.all()]
+
+
+VEHICLE_COST_SOURCES = (
+    ("maintenance", MaintenanceRecord.service_date, MaintenanceRecord.vehicle_id, MaintenanceRecord.cost),
+    ("fuel", FuelRecord.refuel_date, FuelRecord.vehicle_id, FuelRecord.total_cost),
+)
+
+
+def vehicle_cost_totals(
+    db: Session,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    vehicle_id: Optional[int] = None
+) -> Dict[str, List[Tuple[Any, int, float]]]:
+    """Nombre et coût des entretiens et ravitaillements par véhicule (bornes incluses, à l'instant près)
+
+    Retourne {"maintenance": [...], "fuel": [...]}, listes de (vehicle_id,
+    nombre, coût) triées par coût décroissant. Les jours entiers de la plage
+    sont lus dans les agrégats ; les jours partiels aux bornes (début après
+    minuit, jour de fin jusqu'à end_date) dans les tables sources.
+    """
+    first_day = None
+    if start_date is not None:
+        first_day = start_date.date() if start_date.time() == time.min else start_date.date() + timedelta(days=1)
+    end_day = end_date.date() if end_date is not None else None  # exclu : jour partiel
+    has_full_days = first_day is None or end_day is None or first_day < end_day
+
+    totals = {cost_type: {} for cost_type, *_ in VEHICLE_COST_SOURCES}
+    if has_full_days:
+        query = db.query(
+            DailyVehicleCostRollup.vehicle_id,
+            DailyVehicleCostRollup.cost_type,
+            func.sum(DailyVehicleCostRollup.record_count),
+            func.coalesce(func.sum(DailyVehicleCostRollup.total_cost), 0.0)
+        )
+        if first_day is not None:
+            query = query.filter(DailyVehicleCostRollup.day >= first_day)
+        if end_day is not None:
+            query = query.filter(DailyVehicleCostRollup.day < end_day)
+        if vehicle_id:
+            query = query.filter(DailyVehicleCostRollup.vehicle_id == vehicle_id)
+        query = query.group_by(
+            DailyVehicleCostRollup.vehicle_id, DailyVehicleCostRollup.cost_type
+        ).having(func.sum(DailyVehicleCostRollup.record_count) > 0)
+        for key, cost_type, count, amount in query.all():
+            totals[cost_type][key] = (int(count), float(amount))
+
+    for cost_type, date_column, vehicle_column, cost_column in VEHICLE_COST_SOURCES:
+        conditions = []
+        if start_date is not None:
+            conditions.append(date_column >= start_date)
+        if end_date is not None:
+            conditions.append(date_column <= end_date)
+        if vehicle_id:
+            conditions.append(vehicle_column == vehicle_id)
+        if has_full_days:
+            edges = []
+            if first_day is not None:
+                edges.append(date_column < datetime.combine(first_day, time.min))
+            if end_day is not None:
+                edges.append(date_column >= datetime.combine(end_day, time.min))
+            if not edges:
+                continue  # plage entière dans les agrégats
+            conditions.append(or_(*edges))
+        rows = db.query(
+            vehicle_column, func.count(), func.coalesce(func.sum(cost_column), 0.0)
+        ).filter(*conditions).group_by(vehicle_column).all()
+        for key, count, amount in rows:
+            previous_count, previous_amount = totals[cost_type].get(key, (0, 0.0))
+            totals[cost_type][key] = (previous_count + int(count), previous_amount + float(amount))
+
+    return {
+        cost_type: sorted(
+            ((key, count, amount) for key, (count, amount) in values.items()), key=lambda row: row[2], reverse=True
+        )
+        for cost_type, values in totals.items()
+    }
+
+
+def detach_vehicle(db: Session, vehicle_id: int):
+    """Rattacher les agrégats d'un véhicule supprimé à « aucun véhicule », comme ses entretiens et ravitaillements"""
+    db.query(DailyVehicleCostRollup).filter(DailyVehicleCostRollup.vehicle_id == vehicle_id).update(
+        {DailyVehicleCostRollup.vehicle_id: None}, synchronize_session=False
+    )
+
+
+if __name__ == "__main__":
+    from database import SessionLocal, create_tables
+
+    create_tables()
+    db = SessionLocal()
+    try:
+        print("🔄 Reconstruction des agrégats journaliers...")
+        rebuild_rollups(db)
+        print(f"✅ {db.query(DailyPurchaseRollup).count()} agrégats d'achats, "
+              f"{db.query(DailyVehicleCostRollup).count()} agrégats de coûts véhicules")
+    finally:
+        db.close()
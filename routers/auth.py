@@ -1,19 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
+from typing import Optional
 from database import get_db
 from models import User, UserRole
 from schemas import UserCreate, UserUpdate, User as UserSchema, UserLogin, Token
 from auth import (
-    verify_password, get_password_hash, create_access_token, 
-    get_current_active_user, require_admin, ACCESS_TOKEN_EXPIRE_MINUTES
+    verify_password, verify_and_update_password, get_password_hash, create_access_token, 
+    get_current_active_user, require_admin, invalidate_user, ACCESS_TOKEN_EXPIRE_MINUTES
 )
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
 @router.post("/register", response_model=UserSchema)
-async def register_user(
+def register_user(
     user: UserCreate, 
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin)
@@ -52,16 +54,36 @@ async def register_user(
     
     return db_user
 
+def _find_user(db: Session, username: str) -> Optional[User]:
+    """Charger l'utilisateur puis rendre la connexion au pool pendant le hachage"""
+    user = db.query(User).filter(User.username == username).first()
+    if user is not None:
+        db.expunge(user)
+    db.rollback()
+    return user
+
+def _record_login(db: Session, user: User, new_hash: Optional[str]):
+    values = {User.last_login: datetime.utcnow()}
+    if new_hash:
+        values[User.hashed_password] = new_hash
+    db.query(User).filter(User.id == user.id).update(values, synchronize_session=False)
+    db.commit()
+    if new_hash:
+        invalidate_user(user.id)
+
+# Les routes de connexion sont asynchrones : pendant le calcul du hachage,
+# elles n'occupent pas de thread du pool des routes synchrones.
 @router.post("/login", response_model=Token)
 async def login_user(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
     """Connexion utilisateur"""
-    # Vérifier les identifiants
-    user = db.query(User).filter(User.username == form_data.username).first()
+    # Vérifier les identifiants (requête SQL dans le pool de threads, hachage dans l'exécuteur dédié)
+    user = await run_in_threadpool(_find_user, db, form_data.username)
     
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    valid, new_hash = await verify_and_update_password(form_data.password, user.hashed_password) if user else (False, None)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Nom d'utilisateur ou mot de passe incorrect",
@@ -80,9 +102,8 @@ async def login_user(
         data={"sub": user.username}, expires_delta=access_token_expires
     )
     
-    # Mettre à jour la dernière connexion
-    user.last_login = datetime.utcnow()
-    db.commit()
+    # Mettre à jour la dernière connexion (et le hachage si ses paramètres ont changé)
+    await run_in_threadpool(_record_login, db, user, new_hash)
     
     return {
         "access_token": access_token,
@@ -95,10 +116,11 @@ async def login_user_json(
     db: Session = Depends(get_db)
 ):
     """Connexion utilisateur avec JSON"""
-    # Vérifier les identifiants
-    user = db.query(User).filter(User.username == user_login.username).first()
+    # Vérifier les identifiants (requête SQL dans le pool de threads, hachage dans l'exécuteur dédié)
+    user = await run_in_threadpool(_find_user, db, user_login.username)
     
-    if not user or not verify_password(user_login.password, user.hashed_password):
+    valid, new_hash = await verify_and_update_password(user_login.password, user.hashed_password) if user else (False, None)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Nom d'utilisateur ou mot de passe incorrect",
@@ -117,9 +139,8 @@ async def login_user_json(
         data={"sub": user.username}, expires_delta=access_token_expires
     )
     
-    # Mettre à jour la dernière connexion
-    user.last_login = datetime.utcnow()
-    db.commit()
+    # Mettre à jour la dernière connexion (et le hachage si ses paramètres ont changé)
+    await run_in_threadpool(_record_login, db, user, new_hash)
     
     return {
         "access_token": access_token,
@@ -132,7 +153,7 @@ async def get_current_user_info(current_user: User = Depends(get_current_active_
     return current_user
 
 @router.put("/me", response_model=UserSchema)
-async def update_current_user(
+def update_current_user(
     user_update: UserUpdate,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -145,18 +166,20 @@ async def update_current_user(
             detail="Vous ne pouvez pas modifier votre propre rôle"
         )
     
+    user = db.get(User, current_user.id)
     update_data = user_update.dict(exclude_unset=True)
     for field, value in update_data.items():
-        setattr(current_user, field, value)
+        setattr(user, field, value)
     
-    current_user.updated_at = datetime.utcnow()
+    user.updated_at = datetime.utcnow()
     db.commit()
-    db.refresh(current_user)
+    db.refresh(user)
+    invalidate_user(user.id)
     
-    return current_user
+    return user
 
 @router.get("/users", response_model=list[UserSchema])
-async def get_users(
+def get_users(
     skip: int = 0,
     limit: int = 100,
     current_user: User = Depends(require_admin),
@@ -167,7 +190,7 @@ async def get_users(
     return users
 
 @router.get("/users/{user_id}", response_model=UserSchema)
-async def get_user(
+def get_user(
     user_id: int,
     current_user: User = Depends(require_admin),
     db: Session = Depends(get_db)
@@ -179,7 +202,7 @@ async def get_user(
     return user
 
 @router.put("/users/{user_id}", response_model=UserSchema)
-async def update_user(
+def update_user(
     user_id: int,
     user_update: UserUpdate,
     current_user: User = Depends(require_admin),
@@ -197,11 +220,12 @@ async def update_user(
     user.updated_at = datetime.utcnow()
     db.commit()
     db.refresh(user)
+    invalidate_user(user_id)
     
     return user
 
 @router.delete("/users/{user_id}")
-async def delete_user(
+def delete_user(
     user_id: int,
     current_user: User = Depends(require_admin),
     db: Session = Depends(get_db)
@@ -219,11 +243,12 @@ async def delete_user(
     
     db.delete(user)
     db.commit()
+    invalidate_user(user_id)
     
     return {"message": "Utilisateur supprimé avec succès"}
 
 @router.post("/change-password")
-async def change_password(
+def change_password(
     current_password: str,
     new_password: str,
     current_user: User = Depends(get_current_active_user),
@@ -238,8 +263,10 @@ async def change_password(
         )
     
     # Mettre à jour le mot de passe
-    current_user.hashed_password = get_password_hash(new_password)
-    current_user.updated_at = datetime.utcnow()
+    user = db.get(User, current_user.id)
+    user.hashed_password = get_password_hash(new_password)
+    user.updated_at = datetime.utcnow()
     db.commit()
+    invalidate_user(user.id)
     
     return {"message": "Mot de passe modifié avec succès"}
@@ -0,0 +1,120 @@
+"""
+Export en flux (CSV ou NDJSON) des achats, mouvements de stock, pleins et maintenances
+
+Les lignes sont lues par lots de EXPORT_BATCH_SIZE avec yield_per (curseur
+côté serveur sur PostgreSQL) et chaque lot est envoyé dès qu'il est encodé :
+la mémoire du worker reste constante quelle que soit la taille de l'export.
+Les lignes sont lues comme de simples tuples de colonnes, sans objets ORM.
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import DateTime, select
+from datetime import datetime
+from typing import Iterator, Optional
+import csv
+import io
+from database import SessionLocal
+from models import (
+    ExportEntity, ExportFormat, FuelRecord, MaintenanceRecord, Purchase, PurchaseCategory, StockMovement, User
+)
+from auth import get_current_active_user
+from serialization import dumps
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+EXPORT_BATCH_SIZE = 1000
+
+# Entité -> (modèle, colonne de date pour le tri et la période, filtres acceptés)
+EXPORTS = {
+    ExportEntity.PURCHASES: (Purchase, Purchase.purchase_date, {"category": Purchase.category}),
+    ExportEntity.STOCK_MOVEMENTS: (StockMovement, StockMovement.created_at, {"item_id": StockMovement.stock_item_id}),
+    ExportEntity.FUEL: (FuelRecord, FuelRecord.refuel_date, {"vehicle_id": FuelRecord.vehicle_id}),
+    ExportEntity.MAINTENANCE: (MaintenanceRecord, MaintenanceRecord.service_date, {"vehicle_id": MaintenanceRecord.vehicle_id}),
+}
+
+MEDIA_TYPES = {ExportFormat.CSV: "text/csv; charset=utf-8", ExportFormat.NDJSON: "application/x-ndjson"}
+
+
+def _stream_batches(statement) -> Iterator[list]:
+    """Lots de lignes de la requête, avec une session propre au flux
+
+    La session de get_db est fermée avant l'envoi de la réponse : le
+    générateur ouvre la sienne et la ferme à la fin du flux (ou si le
+    client se déconnecte).
+    """
+    db = SessionLocal()
+    try:
+        result = db.execute(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        for batch in result.partitions():
+            yield batch
+    finally:
+        db.close()
+
+
+def _csv_rows(batch: list, datetime_indexes: list) -> Iterator[list]:
+    """Dates au format ISO 8601, comme dans l'export NDJSON"""
+    for row in batch:
+        row = list(row)
+        for index in datetime_indexes:
+            if row[index] is not None:
+                row[index] = row[index].isoformat()
+        yield row
+
+
+def _csv_chunks(table, batches: Iterator[list]) -> Iterator[bytes]:
+    datetime_indexes = [index for index, column in enumerate(table.columns) if isinstance(column.type, DateTime)]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([column.key for column in table.columns])
+    yield buffer.getvalue().encode("utf-8")
+    for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(_csv_rows(batch, datetime_indexes))
+        yield buffer.getvalue().encode("utf-8")
+
+
+def _ndjson_chunks(table, batches: Iterator[list]) -> Iterator[bytes]:
+    columns = [column.key for column in table.columns]
+    for batch in batches:
+        yield b"".join(dumps(dict(zip(columns, row))) + b"\n" for row in batch)
+
+
+@router.get("/{entity}")
+def export_entity(
+    entity: ExportEntity,
+    format: ExportFormat = ExportFormat.CSV,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    category: Optional[PurchaseCategory] = Query(None, description="Achats uniquement"),
+    vehicle_id: Optional[int] = Query(None, description="Pleins et maintenances uniquement"),
+    item_id: Optional[int] = Query(None, description="Mouvements de stock uniquement"),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Exporter toutes les lignes d'une entité (CSV ou NDJSON), par ordre chronologique"""
+    model, date_column, allowed_filters = EXPORTS[entity]
+    table = model.__table__
+    statement = select(table)
+
+    filters = {"category": category.value if category else None, "vehicle_id": vehicle_id, "item_id": item_id}
+    for name, value in filters.items():
+        if value is None:
+            continue
+        if name not in allowed_filters:
+            raise HTTPException(status_code=400, detail=f"Filtre non disponible pour l'export {entity.value}: {name}")
+        statement = statement.where(allowed_filters[name] == value)
+
+    if start_date:
+        statement = statement.where(date_column >= start_date)
+    if end_date:
+        statement = statement.where(date_column <= end_date)
+    statement = statement.order_by(date_column, table.c.id)
+
+    batches = _stream_batches(statement)
+    chunks = _csv_chunks(table, batches) if format == ExportFormat.CSV else _ndjson_chunks(table, batches)
+    filename = f"{entity.value}_{datetime.utcnow():%Y%m%d}.{format.value}"
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
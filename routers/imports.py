@@ -0,0 +1,206 @@
+"""
+Import en masse (CSV) des articles de stock, fournisseurs et achats
+
+Le fichier envoyé est lu ligne par ligne, sans être chargé en mémoire.
+Chaque ligne est validée avec le schéma de création de schemas.py (cellules
+vides = valeur par défaut du schéma), puis les lignes valides sont insérées
+par lots de IMPORT_CHUNK_SIZE (INSERT en masse), une transaction par lot :
+un fichier de 100 000 lignes ne fait qu'une centaine de commits.
+Comme avec POST /purchases/, les achats importés sont entrés en stock
+(quantités, mouvements d'entrée et registre) dans la transaction du lot.
+
+Les lignes invalides sont ignorées et signalées avec leur numéro de ligne
+dans le fichier (l'en-tête est la ligne 1). Le séparateur (virgule ou
+point-virgule) est détecté sur la ligne d'en-tête.
+"""
+from fastapi import APIRouter, Depends, File, UploadFile
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from pydantic import ValidationError
+from enum import Enum
+from typing import Iterator, List, Tuple
+import csv
+import io
+from database import get_db
+from models import ImportEntity, LedgerEntryKind, Purchase, StockItem, Supplier, User, UserRole
+from schemas import ImportResult, PurchaseCreate, StockItemCreate, SupplierCreate
+from auth import require_role
+from rollups import record_purchases
+from ledger import entry, record
+from inventory import receive_purchases
+from cache import report_cache
+from suggest import suggestion_index
+
+router = APIRouter(prefix="/import", tags=["import"])
+
+IMPORT_CHUNK_SIZE = 2000
+MAX_REPORTED_ERRORS = 1000
+
+# Entité -> (modèle, schéma de validation d'une ligne)
+IMPORTS = {
+    ImportEntity.STOCK_ITEMS: (StockItem, StockItemCreate),
+    ImportEntity.SUPPLIERS: (Supplier, SupplierCreate),
+    ImportEntity.PURCHASES: (Purchase, PurchaseCreate),
+}
+
+
+class _Report:
+    """Compteurs de l'import et premières erreurs"""
+
+    def __init__(self):
+        self.total_rows = 0
+        self.imported = 0
+        self.rejected = 0
+        self.errors = []
+
+    def reject(self, line: int, error: str):
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "error": error})
+
+
+def _read_rows(upload: UploadFile) -> Iterator[Tuple[int, dict]]:
+    """(numéro de ligne, cellules non vides) pour chaque ligne du fichier"""
+    text = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+    header = text.readline()
+    delimiter = ";" if header.count(";") > header.count(",") else ","
+    fieldnames = [name.strip() for name in next(csv.reader([header], delimiter=delimiter), [])]
+    reader = csv.DictReader(text, fieldnames=fieldnames, delimiter=delimiter)
+    for row in reader:
+        # Les cellules en trop (clé None) et manquantes (valeur None) sont ignorées
+        yield reader.line_num + 1, {
+            name: value.strip() for name, value in row.items()
+            if name and value is not None and value.strip() != ""
+        }
+
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc'])}: {detail['msg']}" for detail in error.errors()
+    )
+
+
+def _prepare(entity: ImportEntity, schema, row: dict) -> dict:
+    """Valider une ligne et la convertir en colonnes du modèle"""
+    if entity == ImportEntity.PURCHASES:
+        row.setdefault("total", 0)  # recalculé ci-dessous, comme dans create_purchase
+    values = {
+        name: value.value if isinstance(value, Enum) else value
+        for name, value in schema(**row).dict().items()
+    }
+    if entity == ImportEntity.PURCHASES:
+        values["total"] = values["quantity"] * values["unit_price"]
+    return values
+
+
+def _insert(db: Session, entity: ImportEntity, model, mappings: List[dict]):
+    if entity == ImportEntity.STOCK_ITEMS:
+        # Quantités importées : variations initiales au registre des stocks
+        ids = db.scalars(insert(StockItem).returning(StockItem.id, sort_by_parameter_order=True), mappings).all()
+        record(db, [
+            entry(item_id, values["current_quantity"], LedgerEntryKind.INITIAL, reason="Import CSV")
+            for item_id, values in zip(ids, mappings) if values.get("current_quantity")
+        ])
+        return
+    if entity == ImportEntity.PURCHASES:
+        # Colonnes lues par receive_purchases (id référencé par le mouvement d'entrée)
+        purchases = db.execute(insert(Purchase).returning(
+            Purchase.id, Purchase.item_name, Purchase.category, Purchase.quantity,
+            Purchase.description, Purchase.purchase_date, sort_by_parameter_order=True
+        ), mappings).all()
+        record_purchases(db, mappings)
+        receive_purchases(db, purchases)
+        return
+    db.bulk_insert_mappings(model, mappings)
+
+
+def _insert_chunk(db: Session, entity: ImportEntity, model, chunk: List[Tuple[int, dict]], report: _Report):
+    """Insérer un lot dans sa propre transaction
+
+    Si la base refuse le lot, il est repris ligne par ligne (SAVEPOINT)
+    pour n'écarter que les lignes fautives.
+    """
+    if not chunk:
+        return
+    try:
+        _insert(db, entity, model, [values for _, values in chunk])
+        db.commit()
+        report.imported += len(chunk)
+    except IntegrityError:
+        db.rollback()
+        for line, values in chunk:
+            try:
+                with db.begin_nested():
+                    _insert(db, entity, model, [values])
+                report.imported += 1
+            except IntegrityError as error:
+                report.reject(line, f"Ligne refusée par la base de données: {error.orig}")
+        db.commit()
+    report_cache.invalidate_tables({model.__tablename__})
+    suggestion_index.invalidate_tables({model.__tablename__})
+
+
+def _reject_existing_suppliers(db: Session, chunk: List[Tuple[int, dict]], seen: set, report: _Report) -> list:
+    """Écarter les fournisseurs déjà présents en base ou plus haut dans le fichier"""
+    names = {values["name"] for _, values in chunk}
+    existing = {name for (name,) in db.query(Supplier.name).filter(Supplier.name.in_(names))}
+    accepted = []
+    for line, values in chunk:
+        if values["name"] in existing or values["name"] in seen:
+            report.reject(line, "Un fournisseur avec ce nom existe déjà")
+            continue
+        seen.add(values["name"])
+        accepted.append((line, values))
+    return accepted
+
+
+@router.post("/{entity}", response_model=ImportResult)
+def import_entity(
+    entity: ImportEntity,
+    file: UploadFile = File(..., description="Fichier CSV en UTF-8 avec une ligne d'en-tête"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role(UserRole.MANAGER))
+):
+    """Importer des articles de stock, fournisseurs ou achats depuis un fichier CSV"""
+    model, schema = IMPORTS[entity]
+    report = _Report()
+    seen_suppliers = set()
+    chunk = []
+
+    def flush():
+        accepted = chunk
+        if entity == ImportEntity.SUPPLIERS:
+            accepted = _reject_existing_suppliers(db, chunk, seen_suppliers, report)
+        _insert_chunk(db, entity, model, accepted, report)
+        chunk.clear()
+
+    rows = _read_rows(file)
+    line = 1
+    while True:
+        try:
+            line, row = next(rows)
+        except StopIteration:
+            break
+        except UnicodeDecodeError:
+            report.reject(line + 1, "Encodage invalide (UTF-8 attendu) : import interrompu")
+            break
+
+        report.total_rows += 1
+        try:
+            chunk.append((line, _prepare(entity, schema, row)))
+        except ValidationError as error:
+            report.reject(line, _validation_message(error))
+            continue
+        if len(chunk) >= IMPORT_CHUNK_SIZE:
+            flush()
+    flush()
+
+    return {
+        "entity": entity,
+        "total_rows": report.total_rows,
+        "imported": report.imported,
+        "rejected": report.rejected,
+        "errors": sorted(report.errors, key=lambda error: error["line"]),
+        "errors_truncated": report.rejected > len(report.errors)
+    }
@@ -0,0 +1,70 @@
+"""
+Tâches en arrière-plan (voir jobs.py)
+
+POST /api/jobs met une tâche en file et répond immédiatement (202) ;
+GET /api/jobs/{id} donne son état et GET /api/jobs/{id}/download son
+résultat une fois la tâche terminée.
+"""
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import Response
+from sqlalchemy.orm import Session
+from database import get_db
+from models import Job, JobKind, JobStatus, User, UserRole
+from schemas import JobCreate, Job as JobSchema
+from auth import get_current_active_user
+from jobs import enqueue_job, validate_params
+from receipts import get_received_request
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+def _get_job(db: Session, job_id: int, user: User) -> Job:
+    """Tâche de l'utilisateur (toutes les tâches pour un administrateur)"""
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if not job or (job.created_by_user_id != user.id and user.role != UserRole.ADMIN):
+        raise HTTPException(status_code=404, detail="Tâche non trouvée")
+    return job
+
+
+@router.post("/", response_model=JobSchema, status_code=202)
+def create_job(
+    job: JobCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Mettre en file un bon de réception PDF, un rapport ou une réconciliation des stocks"""
+    params = validate_params(job.kind, job.params)
+    if job.kind == JobKind.RECEIPT_PDF:
+        get_received_request(db, params["request_id"])  # 404/400 tout de suite plutôt qu'une tâche en échec
+    if job.kind == JobKind.STOCK_RECONCILE and params["repair"] and current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Seul un administrateur peut corriger le registre des stocks")
+    return enqueue_job(db, job.kind, params, current_user.id)
+
+
+@router.get("/{job_id}", response_model=JobSchema)
+def get_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """État d'une tâche"""
+    return _get_job(db, job_id, current_user)
+
+
+@router.get("/{job_id}/download")
+def download_job_result(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Télécharger le résultat d'une tâche terminée"""
+    job = _get_job(db, job_id, current_user)
+    if job.status == JobStatus.FAILED.value:
+        raise HTTPException(status_code=409, detail=f"La tâche a échoué: {job.error}")
+    if job.status != JobStatus.SUCCEEDED.value:
+        raise HTTPException(status_code=409, detail="La tâche n'est pas encore terminée")
+    return Response(
+        job.result,
+        media_type=job.result_media_type,
+        headers={"Content-Disposition": f'attachment; filename="{job.result_filename}"'}
+    )
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from database import get_db
 from models import MaintenanceRecord as MaintenanceRecordModel, Breakdown as BreakdownModel, Vehicle
@@ -7,6 +7,8 @@ from schemas import (
     BreakdownCreate, BreakdownUpdate, Breakdown
 )
 from auth import get_current_active_user
+from rollups import record_maintenance
+from pagination import paginate
 from typing import List, Optional
 from datetime import datetime, timedelta
 
@@ -14,7 +16,7 @@ router = APIRouter()
 
 # Routes pour les entretiens
 @router.post("/maintenance/", response_model=MaintenanceRecord)
-async def create_maintenance_record(
+def create_maintenance_record(
     maintenance: MaintenanceRecordCreate,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_active_user)
@@ -27,14 +29,17 @@ async def create_maintenance_record(
     
     db_maintenance = MaintenanceRecordModel(**maintenance.dict())
     db.add(db_maintenance)
+    record_maintenance(db, db_maintenance)
     db.commit()
     db.refresh(db_maintenance)
     return db_maintenance
 
 @router.get("/maintenance/", response_model=List[MaintenanceRecord])
-async def get_maintenance_records(
+def get_maintenance_records(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
     vehicle_id: Optional[int] = Query(None),
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
@@ -55,57 +60,60 @@ async def get_maintenance_records(
         end_dt = datetime.fromisoformat(end_date)
         query = query.filter(MaintenanceRecordModel.service_date <= end_dt)
     
-    return query.order_by(MaintenanceRecordModel.service_date.desc()).offset(skip).limit(limit).all()
+    return paginate(query, MaintenanceRecordModel.service_date, MaintenanceRecordModel.id, limit, cursor, skip, response)
 
 @router.get("/maintenance/{maintenance_id}", response_model=MaintenanceRecord)
-async def get_maintenance_record(
+def get_maintenance_record(
     maintenance_id: int,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_active_user)
 ):
     """Récupérer un enregistrement d'entretien spécifique"""
-    maintenance = db.query(MaintenanceRecord).filter(MaintenanceRecordModel.id == maintenance_id).first()
+    maintenance = db.query(MaintenanceRecordModel).filter(MaintenanceRecordModel.id == maintenance_id).first()
     if not maintenance:
         raise HTTPException(status_code=404, detail="Enregistrement d'entretien non trouvé")
     return maintenance
 
 @router.put("/maintenance/{maintenance_id}", response_model=MaintenanceRecord)
-async def update_maintenance_record(
+def update_maintenance_record(
     maintenance_id: int,
     maintenance_update: MaintenanceRecordUpdate,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_active_user)
 ):
     """Mettre à jour un enregistrement d'entretien"""
-    maintenance = db.query(MaintenanceRecord).filter(MaintenanceRecordModel.id == maintenance_id).first()
+    maintenance = db.query(MaintenanceRecordModel).filter(MaintenanceRecordModel.id == maintenance_id).first()
     if not maintenance:
         raise HTTPException(status_code=404, detail="Enregistrement d'entretien non trouvé")
     
+    record_maintenance(db, maintenance, sign=-1)
     for field, value in maintenance_update.dict(exclude_unset=True).items():
         setattr(maintenance, field, value)
+    record_maintenance(db, maintenance)
     
     db.commit()
     db.refresh(maintenance)
     return maintenance
 
 @router.delete("/maintenance/{maintenance_id}")
-async def delete_maintenance_record(
+def delete_maintenance_record(
     maintenance_id: int,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_active_user)
 ):
     """Supprimer un enregistrement d'entretien"""
-    maintenance = db.query(MaintenanceRecord).filter(MaintenanceRecordModel.id == maintenance_id).first()
+    maintenance = db.query(MaintenanceRecordModel).filter(MaintenanceRecordModel.id == maintenance_id).first()
     if not maintenance:
         raise HTTPException(status_code=404, detail="Enregistrement d'entretien non trouvé")
     
+    record_maintenance(db, maintenance, sign=-1)
     db.delete(maintenance)
     db.commit()
     return {"message": "Enregistrement d'entretien supprimé avec succès"}
 
 # Routes pour les pannes
 @router.post("/breakdowns/", response_model=Breakdown)
-async def create_breakdown(
+def create_breakdown(
     breakdown: BreakdownCreate,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_active_user)
@@ -123,9 +131,11 @@ async def create_breakdown(
     return db_breakdown
 
 @router.get("/breakdowns/", response_model=List[Breakdown])
-async def get_breakdowns(
+def get_breakdowns(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
     vehicle_id: Optional[int] = Query(None),
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
@@ -150,10 +160,10 @@ async def get_breakdowns(
     if is_repaired is not None:
         query = query.filter(BreakdownModel.is_repaired == is_repaired)
     
-    return query.order_by(BreakdownModel.breakdown_date.desc()).offset(skip).limit(limit).all()
+    return paginate(query, BreakdownModel.breakdown_date, BreakdownModel.id, limit, cursor, skip, response)
 
 @router.get("/breakdowns/{breakdown_id}", response_model=Breakdown)
-async def get_breakdown(
+def get_breakdown(
     breakdown_id: int,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_active_user)
@@ -165,7 +175,7 @@ async def get_breakdown(
     return breakdown
 
 @router.put("/breakdowns/{breakdown_id}", response_model=Breakdown)
-async def update_breakdown(
+def update_breakdown(
     breakdown_id: int,
     breakdown_update: BreakdownUpdate,
     db: Session = Depends(get_db),
@@ -184,7 +194,7 @@ async def update_breakdown(
     return breakdown
 
 @router.delete("/breakdowns/{breakdown_id}")
-async def delete_breakdown(
+def delete_breakdown(
     breakdown_id: int,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_active_user)
@@ -200,7 +210,7 @@ async def delete_breakdown(
 
 # Routes pour les rappels et statistiques
 @router.get("/maintenance/reminders/")
-async def get_maintenance_reminders(
+def get_maintenance_reminders(
     days_ahead: int = Query(30, ge=1, le=365),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_active_user)
@@ -220,7 +230,7 @@ async def get_maintenance_reminders(
     }
 
 @router.get("/maintenance/stats/")
-async def get_maintenance_stats(
+def get_maintenance_stats(
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
     db: Session = Depends(get_db),
@@ -258,7 +268,7 @@ async def get_maintenance_stats(
     }
 
 @router.get("/breakdowns/stats/")
-async def get_breakdown_stats(
+def get_breakdown_stats(
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
     db: Session = Depends(get_db),
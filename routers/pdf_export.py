@@ -1,162 +1,161 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy.orm import Session, joinedload
+from collections import deque
 from datetime import datetime
+from typing import Iterator, List, Optional
 import io
-import base64
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
-from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+import os
+import zipfile
+
+try:
+    from pypdf import PdfReader, PdfWriter
+except ImportError:  # pypdf est optionnel : sans lui, export en lot au format ZIP uniquement
+    PdfWriter = None
 
 from database import get_db
-from models import PurchaseRequest as PurchaseRequestModel, User
+from models import PurchaseRequest as PurchaseRequestModel, ReceiptBatchFormat, User
 from auth import get_current_active_user
+from receipts import (
+    cached_receipt, get_received_request, is_cached, receipt_data, receipt_filename, receipt_key, render_receipts
+)
+from jobs import get_executor, JOB_WORKERS
 
 router = APIRouter(prefix="/pdf", tags=["pdf-export"])
 
+RECEIPT_BATCH_MAX = int(os.getenv("RECEIPT_BATCH_MAX", "2000"))
+RECEIPT_CHUNK_SIZE = 10  # bons rendus par appel à un processus du pool
+PARALLEL_MIN = 4  # en dessous, les bons manquants sont rendus dans le processus courant
+
 @router.get("/receipt/{request_id}")
-async def generate_receipt_pdf(
+def generate_receipt_pdf(
     request_id: int,
+    http_request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Générer le PDF du bon de réception signé"""
-    
-    # Récupérer la demande d'achat
-    request = db.query(PurchaseRequestModel).filter(PurchaseRequestModel.id == request_id).first()
-    if not request:
-        raise HTTPException(status_code=404, detail="Demande d'achat non trouvée")
-    
-    if request.status != "received":
-        raise HTTPException(status_code=400, detail="Cette demande n'a pas encore été reçue")
-    
-    # Créer le PDF en mémoire
+    data = receipt_data(get_received_request(db, request_id))
+    headers = {"ETag": f'"{receipt_key(data)}"', "Cache-Control": "private, no-cache"}
+    if http_request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+
+    headers["Content-Disposition"] = f'attachment; filename="{receipt_filename(data)}"'
+    return Response(cached_receipt(data), media_type='application/pdf', headers=headers)
+
+def _rendered(datas: List[dict]) -> Iterator[bytes]:
+    """PDF de chaque bon, dans l'ordre
+
+    Les bons absents du cache sont rendus par lots de RECEIPT_CHUNK_SIZE dans
+    les processus du pool, au plus 2 x JOB_WORKERS lots à la fois : la
+    mémoire reste bornée même si le client lit lentement.
+    """
+    missing = [index for index, data in enumerate(datas) if not is_cached(receipt_key(data))]
+    if len(missing) < PARALLEL_MIN:
+        for data in datas:
+            yield cached_receipt(data)
+        return
+
+    executor = get_executor()
+    chunks = deque(missing[start:start + RECEIPT_CHUNK_SIZE] for start in range(0, len(missing), RECEIPT_CHUNK_SIZE))
+    running = deque()
+
+    def submit():
+        chunk = chunks.popleft()
+        running.append((chunk, executor.submit(render_receipts, [datas[index] for index in chunk])))
+
+    try:
+        while chunks and len(running) < 2 * JOB_WORKERS:
+            submit()
+        missing = set(missing)
+        rendered = {}
+        for index, data in enumerate(datas):
+            if index in missing and index not in rendered:
+                # Les lots sont soumis dans l'ordre : celui de ce bon est le premier en cours
+                chunk, future = running.popleft()
+                rendered.update(zip(chunk, future.result()))
+                if chunks:
+                    submit()
+            yield rendered.pop(index) if index in rendered else cached_receipt(data)
+    finally:
+        for _, future in running:  # client déconnecté
+            future.cancel()
+
+class _ChunkWriter:
+    """Flux en écriture seule : zipfile y écrit, le générateur récupère les octets"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def take(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+def _zip_chunks(datas: List[dict]) -> Iterator[bytes]:
+    """Archive ZIP envoyée au fil du rendu (PDF déjà compressés : stockés tels quels)"""
+    output = _ChunkWriter()
+    date_time = datetime.now().timetuple()[:6]
+    with zipfile.ZipFile(output, mode="w", compression=zipfile.ZIP_STORED) as archive:
+        for data, content in zip(datas, _rendered(datas)):
+            archive.writestr(zipfile.ZipInfo(receipt_filename(data), date_time=date_time), content)
+            yield output.take()
+    yield output.take()
+
+def _merged_pdf(datas: List[dict]) -> bytes:
+    writer = PdfWriter()
+    for content in _rendered(datas):
+        writer.append(PdfReader(io.BytesIO(content)))
     buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
-    
-    # Styles
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=18,
-        spaceAfter=30,
-        alignment=TA_CENTER,
-        textColor=colors.darkblue
-    )
-    
-    header_style = ParagraphStyle(
-        'Header',
-        parent=styles['Heading2'],
-        fontSize=14,
-        spaceAfter=12,
-        textColor=colors.darkblue
-    )
-    
-    normal_style = ParagraphStyle(
-        'Normal',
-        parent=styles['Normal'],
-        fontSize=10,
-        spaceAfter=6
-    )
-    
-    # Contenu du PDF
-    story = []
-    
-    # En-tête
-    story.append(Paragraph("BON DE RÉCEPTION", title_style))
-    story.append(Spacer(1, 20))
-    
-    # Informations de la demande
-    story.append(Paragraph("INFORMATIONS DE LA COMMANDE", header_style))
-    
-    request_data = [
-        ["Numéro de demande:", request.request_number],
-        ["Article demandé:", request.item_name],
-        ["Description:", request.description or "N/A"],
-        ["Quantité:", f"{request.quantity} {request.unit}"],
-        ["Catégorie:", request.category],
-        ["Service demandeur:", request.department],
-        ["Demandé par:", request.requested_by],
-        ["Date de demande:", request.requested_at.strftime("%d/%m/%Y à %H:%M")],
-        ["Numéro de commande:", request.order_number or "N/A"],
-        ["Fournisseur:", request.supplier.name if request.supplier else "N/A"]
-    ]
-    
-    request_table = Table(request_data, colWidths=[2*inch, 4*inch])
-    request_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), colors.lightgrey),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-        ('BACKGROUND', (0, 0), (0, -1), colors.lightblue),
-        ('TEXTCOLOR', (0, 0), (0, -1), colors.darkblue),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-    ]))
-    
-    story.append(request_table)
-    story.append(Spacer(1, 20))
-    
-    # Informations de réception
-    story.append(Paragraph("INFORMATIONS DE RÉCEPTION", header_style))
-    
-    reception_data = [
-        ["Date de réception:", request.received_at.strftime("%d/%m/%Y à %H:%M")],
-        ["Reçu par:", request.received_by],
-        ["Notes de réception:", request.receipt_notes or "Aucune note"],
-        ["Statut:", "REÇU"]
-    ]
-    
-    reception_table = Table(reception_data, colWidths=[2*inch, 4*inch])
-    reception_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), colors.lightgreen),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-        ('BACKGROUND', (0, 0), (0, -1), colors.green),
-        ('TEXTCOLOR', (0, 0), (0, -1), colors.white),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-    ]))
-    
-    story.append(reception_table)
-    story.append(Spacer(1, 20))
-    
-    # Signature
-    if request.receipt_signature:
-        story.append(Paragraph("SIGNATURE ÉLECTRONIQUE", header_style))
-        story.append(Spacer(1, 10))
-        
-        try:
-            # Décoder l'image de signature
-            signature_data = base64.b64decode(request.receipt_signature.split(',')[1] if ',' in request.receipt_signature else request.receipt_signature)
-            signature_img = Image(io.BytesIO(signature_data), width=4*inch, height=1.5*inch)
-            story.append(signature_img)
-        except Exception as e:
-            story.append(Paragraph(f"Erreur lors du chargement de la signature: {str(e)}", normal_style))
-    
-    story.append(Spacer(1, 30))
-    
-    # Pied de page
-    story.append(Paragraph(f"Document généré le {datetime.now().strftime('%d/%m/%Y à %H:%M')}", 
-                         ParagraphStyle('Footer', parent=styles['Normal'], fontSize=8, alignment=TA_CENTER)))
-    
-    # Construire le PDF
-    doc.build(story)
-    
-    # Retourner le fichier PDF
-    buffer.seek(0)
-    
-    return FileResponse(
-        io.BytesIO(buffer.getvalue()),
-        media_type='application/pdf',
-        filename=f"bon_reception_{request.request_number}.pdf"
+    writer.write(buffer)
+    return buffer.getvalue()
+
+@router.get("/receipts")
+def generate_receipts_batch(
+    start_date: Optional[datetime] = Query(None, description="Réceptions à partir de cette date"),
+    end_date: Optional[datetime] = Query(None, description="Réceptions jusqu'à cette date"),
+    request_ids: Optional[List[int]] = Query(None, description="Demandes à inclure (sinon toutes celles de la période)"),
+    format: ReceiptBatchFormat = ReceiptBatchFormat.ZIP,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Télécharger plusieurs bons de réception : archive ZIP ou PDF fusionné"""
+    if format == ReceiptBatchFormat.PDF and PdfWriter is None:
+        raise HTTPException(status_code=400, detail="Fusion PDF indisponible (pypdf non installé) : utilisez format=zip")
+
+    query = db.query(PurchaseRequestModel).options(joinedload(PurchaseRequestModel.supplier)).filter(
+        PurchaseRequestModel.status == "received"
     )
+    if request_ids:
+        query = query.filter(PurchaseRequestModel.id.in_(request_ids))
+    if start_date:
+        query = query.filter(PurchaseRequestModel.received_at >= start_date)
+    if end_date:
+        query = query.filter(PurchaseRequestModel.received_at <= end_date)
+    requests = query.order_by(PurchaseRequestModel.received_at, PurchaseRequestModel.id).limit(RECEIPT_BATCH_MAX + 1).all()
 
+    if not requests:
+        raise HTTPException(status_code=404, detail="Aucun bon de réception pour ces critères")
+    if len(requests) > RECEIPT_BATCH_MAX:
+        raise HTTPException(status_code=400, detail=f"Trop de bons de réception (maximum {RECEIPT_BATCH_MAX}), réduisez la période")
 
+    datas = [receipt_data(request) for request in requests]
+    filename = f"bons_reception_{datetime.now():%Y%m%d}"
+    if format == ReceiptBatchFormat.PDF:
+        return Response(
+            _merged_pdf(datas),
+            media_type="application/pdf",
+            headers={"Content-Disposition": f'attachment; filename="{filename}.pdf"'}
+        )
+    return StreamingResponse(
+        _zip_chunks(datas),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}.zip"'}
+    )
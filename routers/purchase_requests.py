@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
@@ -14,6 +14,10 @@ from schemas import (
     PurchaseRequestReceipt
 )
 from auth import get_current_active_user
+from query_counter import query_budget
+from pagination import paginate
+from projection import FIELDS_DESCRIPTION, parse_fields, project, projected_response
+from blobstore import store_signature
 
 router = APIRouter(prefix="/purchase-requests", tags=["purchase-requests"])
 
@@ -30,7 +34,7 @@ def generate_order_number():
     return f"CMD-{timestamp}-{unique_id}"
 
 @router.post("/", response_model=PurchaseRequest, status_code=status.HTTP_201_CREATED)
-async def create_purchase_request(
+def create_purchase_request(
     request: PurchaseRequestCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -61,14 +65,21 @@ async def create_purchase_request(
     return db_request
 
 @router.get("/", response_model=List[PurchaseRequest])
-async def get_purchase_requests(
+@query_budget(2)
+def get_purchase_requests(
+    response: Response,
     status_filter: Optional[str] = Query(None, description="Filtrer par statut"),
     department: Optional[str] = Query(None, description="Filtrer par département"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Récupérer les demandes d'achat avec filtres"""
-    query = db.query(PurchaseRequestModel)
+    selected = parse_fields(fields, PurchaseRequest)
+    query = project(db.query(PurchaseRequestModel), PurchaseRequestModel, PurchaseRequest, selected, PurchaseRequestModel.created_at)
     
     # Filtres selon le rôle de l'utilisateur
     if current_user.role == "admin":
@@ -87,10 +98,14 @@ async def get_purchase_requests(
     if department:
         query = query.filter(PurchaseRequestModel.department == department)
     
-    return query.order_by(PurchaseRequestModel.created_at.desc()).all()
+    requests = paginate(query, PurchaseRequestModel.created_at, PurchaseRequestModel.id, limit, cursor, skip, response)
+    if selected is None:
+        return requests
+    return projected_response(requests, PurchaseRequest, selected, response)
 
 @router.get("/{request_id}", response_model=PurchaseRequest)
-async def get_purchase_request(
+@query_budget(2)
+def get_purchase_request(
     request_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -108,7 +123,7 @@ async def get_purchase_request(
     return request
 
 @router.put("/{request_id}/approve-dg", response_model=PurchaseRequest)
-async def approve_by_dg(
+def approve_by_dg(
     request_id: int,
     approval: PurchaseRequestApproval,
     db: Session = Depends(get_db),
@@ -130,7 +145,7 @@ async def approve_by_dg(
         request.status = "approved_by_dg"
         request.approved_by_dg_at = datetime.utcnow()
         request.approved_by_dg_user_id = current_user.id
-        request.dg_signature = approval.signature
+        request.dg_signature = store_signature(approval.signature)
     else:
         request.status = "rejected"
         request.rejected_at = datetime.utcnow()
@@ -142,7 +157,7 @@ async def approve_by_dg(
     return request
 
 @router.put("/{request_id}/approve-purchase", response_model=PurchaseRequest)
-async def approve_by_purchase(
+def approve_by_purchase(
     request_id: int,
     supplier_id: int,
     db: Session = Depends(get_db),
@@ -180,7 +195,7 @@ async def approve_by_purchase(
     return request
 
 @router.put("/{request_id}/complete", response_model=PurchaseRequest)
-async def complete_purchase_request(
+def complete_purchase_request(
     request_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -199,7 +214,8 @@ async def complete_purchase_request(
     return request
 
 @router.get("/dashboard/stats")
-async def get_dashboard_stats(
+@query_budget(7)
+def get_dashboard_stats(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -227,7 +243,7 @@ async def get_dashboard_stats(
     }
 
 @router.put("/{request_id}/receive", response_model=PurchaseRequest)
-async def receive_purchase_request(
+def receive_purchase_request(
     request_id: int,
     receipt: PurchaseRequestReceipt,
     db: Session = Depends(get_db),
@@ -246,7 +262,7 @@ async def receive_purchase_request(
     request.received_at = datetime.utcnow()
     request.received_by = receipt.received_by
     request.received_by_user_id = current_user.id
-    request.receipt_signature = receipt.signature
+    request.receipt_signature = store_signature(receipt.signature)
     request.receipt_notes = receipt.receipt_notes
     
     db.commit()
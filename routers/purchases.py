@@ -1,85 +1,88 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from datetime import datetime, timedelta
+from datetime import datetime
 from database import get_db
-from models import Purchase, PurchaseCategory, PurchasePeriod, StockItem, StockMovement, User
-from schemas import PurchaseCreate, PurchaseUpdate, Purchase as PurchaseSchema, PurchaseReport
+from models import Purchase, PurchaseCategory, PurchasePeriod, StockItem, User, DailyPurchaseRollup
+from schemas import (
+    PurchaseCreate, PurchaseUpdate, Purchase as PurchaseSchema, PurchaseReport,
+    PurchaseInvoice, PurchaseInvoiceResult
+)
 from auth import get_current_active_user
-import calendar
+from aggregations import period_bounds
+from rollups import record_purchase, record_purchases, purchase_period_totals, purchase_period_breakdown
+from pagination import paginate
+from projection import FIELDS_DESCRIPTION, parse_fields, project, projected_response
+from inventory import receive_purchases, MAX_BATCH_SIZE
+from serialization import fast_json
 
 router = APIRouter(prefix="/purchases", tags=["purchases"])
 
 @router.post("/", response_model=PurchaseSchema)
-async def create_purchase(
+def create_purchase(
     purchase: PurchaseCreate, 
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Créer un nouvel achat et l'article de stock correspondant"""
+    """Créer un nouvel achat et l'entrer en stock (article créé si nécessaire)
+
+    L'achat, ses agrégats, l'article de stock et le mouvement d'entrée sont
+    écrits dans une seule transaction.
+    """
     # Calculer le total automatiquement
     purchase_data = purchase.dict()
     purchase_data['total'] = purchase.quantity * purchase.unit_price
     
-    # Créer l'achat
     db_purchase = Purchase(**purchase_data)
     db.add(db_purchase)
+    db.flush()  # id de l'achat, référencé par le mouvement d'entrée
+    record_purchases(db, [purchase_data])
+    receive_purchases(db, [db_purchase])
     db.commit()
-    db.refresh(db_purchase)
-    
-    # Vérifier si l'article existe déjà dans le stock
-    existing_item = db.query(StockItem).filter(
-        StockItem.name == purchase.item_name,
-        StockItem.category == purchase.category
-    ).first()
-    
-    if existing_item:
-        # Mettre à jour la quantité existante
-        existing_item.current_quantity += purchase.quantity
-        existing_item.updated_at = datetime.utcnow()
-        db.commit()
-        
-        # Créer un mouvement d'entrée
-        movement = StockMovement(
-            stock_item_id=existing_item.id,
-            movement_type="entry",
-            quantity=purchase.quantity,
-            reason=f"Achat - {purchase.item_name}",
-            reference=f"ACH-{db_purchase.id}"
-        )
-        db.add(movement)
-        db.commit()
-    else:
-        # Créer un nouvel article de stock
-        stock_item = StockItem(
-            name=purchase.item_name,
-            description=purchase.description or f"Achat du {purchase.purchase_date.strftime('%d/%m/%Y')}",
-            category=purchase.category,
-            current_quantity=purchase.quantity,
-            min_threshold=5,  # Seuil par défaut
-            max_threshold=100,  # Seuil par défaut
-            unit="pièce",  # Unité par défaut
-            location="Stock général"
-        )
-        db.add(stock_item)
-        db.commit()
-        db.refresh(stock_item)
-        
-        # Créer un mouvement d'entrée
-        movement = StockMovement(
-            stock_item_id=stock_item.id,
-            movement_type="entry",
-            quantity=purchase.quantity,
-            reason=f"Achat - {purchase.item_name}",
-            reference=f"ACH-{db_purchase.id}"
-        )
-        db.add(movement)
-        db.commit()
     
     return db_purchase
 
+@router.post("/invoice", response_model=PurchaseInvoiceResult)
+def create_purchase_invoice(
+    invoice: PurchaseInvoice,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Enregistrer une facture fournisseur : un achat et une entrée en stock par ligne
+
+    Toutes les lignes sont écrites en une seule transaction (tout ou rien).
+    """
+    if len(invoice.lines) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Facture trop volumineuse ({len(invoice.lines)} lignes, maximum {MAX_BATCH_SIZE})"
+        )
+
+    rows = []
+    for line in invoice.lines:
+        row = line.dict()
+        row['amount'] = line.amount or line.quantity * line.unit_price
+        row['total'] = line.quantity * line.unit_price
+        row['supplier'] = invoice.supplier
+        row['purchase_date'] = invoice.purchase_date
+        rows.append(row)
+
+    purchases = db.scalars(insert(Purchase).returning(Purchase, sort_by_parameter_order=True), rows).all()
+    record_purchases(db, rows)
+    receive_purchases(db, purchases)
+    # Réponse construite avant le commit, qui expire les objets (un SELECT par achat sinon)
+    result = PurchaseInvoiceResult(
+        supplier=invoice.supplier,
+        purchase_date=invoice.purchase_date,
+        total_amount=sum(row['amount'] for row in rows),
+        purchases=purchases
+    )
+    db.commit()
+    return result
+
 @router.get("/{purchase_id}/stock-item")
-async def get_purchase_stock_item(
+def get_purchase_stock_item(
     purchase_id: int, 
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -101,18 +104,22 @@ async def get_purchase_stock_item(
     return stock_item
 
 @router.get("/", response_model=List[PurchaseSchema])
-async def get_purchases(
+def get_purchases(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
     category: Optional[PurchaseCategory] = None,
     period: Optional[PurchasePeriod] = None,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Récupérer les achats avec filtres"""
-    query = db.query(Purchase)
+    selected = parse_fields(fields, PurchaseSchema)
+    query = project(db.query(Purchase), Purchase, PurchaseSchema, selected, Purchase.created_at)
     
     if category:
         query = query.filter(Purchase.category == category)
@@ -123,10 +130,13 @@ async def get_purchases(
     if end_date:
         query = query.filter(Purchase.purchase_date <= end_date)
     
-    return query.offset(skip).limit(limit).all()
+    purchases = paginate(query, Purchase.created_at, Purchase.id, limit, cursor, skip, response)
+    if selected is None:
+        return purchases
+    return projected_response(purchases, PurchaseSchema, selected, response)
 
 @router.get("/{purchase_id}", response_model=PurchaseSchema)
-async def get_purchase(
+def get_purchase(
     purchase_id: int, 
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -138,7 +148,7 @@ async def get_purchase(
     return purchase
 
 @router.put("/{purchase_id}", response_model=PurchaseSchema)
-async def update_purchase(
+def update_purchase(
     purchase_id: int, 
     purchase_update: PurchaseUpdate, 
     db: Session = Depends(get_db),
@@ -149,9 +159,11 @@ async def update_purchase(
     if not purchase:
         raise HTTPException(status_code=404, detail="Achat non trouvé")
     
+    record_purchase(db, purchase, sign=-1)
     update_data = purchase_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(purchase, field, value)
+    record_purchase(db, purchase)
     
     purchase.updated_at = datetime.utcnow()
     db.commit()
@@ -159,7 +171,7 @@ async def update_purchase(
     return purchase
 
 @router.delete("/{purchase_id}")
-async def delete_purchase(
+def delete_purchase(
     purchase_id: int, 
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -169,12 +181,13 @@ async def delete_purchase(
     if not purchase:
         raise HTTPException(status_code=404, detail="Achat non trouvé")
     
+    record_purchase(db, purchase, sign=-1)
     db.delete(purchase)
     db.commit()
     return {"message": "Achat supprimé avec succès"}
 
 @router.get("/reports/period/{period}", response_model=PurchaseReport)
-async def get_purchase_report(
+def get_purchase_report(
     period: PurchasePeriod,
     year: int = Query(..., description="Année"),
     month: Optional[int] = Query(None, description="Mois (pour les rapports mensuels)"),
@@ -185,52 +198,18 @@ async def get_purchase_report(
     """Générer un rapport d'achats par période"""
     
     # Définir les dates selon la période
-    if period == PurchasePeriod.DAILY:
-        if not month:
-            raise HTTPException(status_code=400, detail="Le mois est requis pour les rapports journaliers")
-        start_date = datetime(year, month, 1)
-        end_date = datetime(year, month, calendar.monthrange(year, month)[1])
-    elif period == PurchasePeriod.WEEKLY:
-        if not week:
-            raise HTTPException(status_code=400, detail="La semaine est requise pour les rapports hebdomadaires")
-        # Calculer le début de la semaine
-        start_date = datetime(year, 1, 1) + timedelta(weeks=week-1)
-        end_date = start_date + timedelta(days=6)
-    elif period == PurchasePeriod.MONTHLY:
-        if not month:
-            raise HTTPException(status_code=400, detail="Le mois est requis pour les rapports mensuels")
-        start_date = datetime(year, month, 1)
-        end_date = datetime(year, month, calendar.monthrange(year, month)[1])
-    elif period == PurchasePeriod.SEMESTRIAL:
-        semester = 1 if month and month <= 6 else 2
-        if semester == 1:
-            start_date = datetime(year, 1, 1)
-            end_date = datetime(year, 6, 30)
-        else:
-            start_date = datetime(year, 7, 1)
-            end_date = datetime(year, 12, 31)
-    elif period == PurchasePeriod.ANNUAL:
-        start_date = datetime(year, 1, 1)
-        end_date = datetime(year, 12, 31)
-    
-    # Récupérer les achats dans la période
-    purchases = db.query(Purchase).filter(
-        Purchase.purchase_date >= start_date,
-        Purchase.purchase_date <= end_date
-    ).all()
+    start_date, end_date = period_bounds(period, year, month, week)
     
-    # Calculer les statistiques
-    total_amount = sum(p.amount for p in purchases)
-    item_count = len(purchases)
+    # Calculer les statistiques (lues dans les agrégats journaliers)
+    total_amount, item_count = purchase_period_totals(db, start_date, end_date)
     
     # Répartition par catégorie
-    category_breakdown = {}
-    for purchase in purchases:
-        category = purchase.category
-        if category not in category_breakdown:
-            category_breakdown[category] = {"count": 0, "amount": 0.0}
-        category_breakdown[category]["count"] += 1
-        category_breakdown[category]["amount"] += purchase.amount
+    category_breakdown = {
+        category: {"count": count, "amount": amount}
+        for category, count, amount in purchase_period_breakdown(
+            db, DailyPurchaseRollup.category, start_date, end_date
+        )
+    }
     
     return PurchaseReport(
         period=f"{period.value}_{year}",
@@ -240,7 +219,8 @@ async def get_purchase_report(
     )
 
 @router.get("/reports/category/{category}")
-async def get_purchases_by_category(
+@fast_json
+def get_purchases_by_category(
     category: PurchaseCategory,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
@@ -265,7 +245,7 @@ async def get_purchases_by_category(
     }
 
 @router.get("/stats/summary")
-async def get_purchase_summary(
+def get_purchase_summary(
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     db: Session = Depends(get_db),
@@ -1,20 +1,26 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import func, and_, or_
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 from database import get_db
 from models import (
     Purchase, StockItem, StockMovement, Vehicle, 
-    MaintenanceRecord, FuelRecord, PurchaseCategory, PurchasePeriod
+    MaintenanceRecord, FuelRecord, PurchaseCategory, PurchasePeriod, DailyPurchaseRollup
 )
 from schemas import DashboardStats
-import calendar
+from aggregations import average_unit_prices, period_bounds, total_and_count, stock_value
+from rollups import purchase_period_totals, purchase_period_breakdown, vehicle_cost_totals
+from cache import cached_report, report_cache
+from query_counter import query_budget
+from serialization import fast_json
 
 router = APIRouter(prefix="/reports", tags=["reports"])
 
 @router.get("/dashboard", response_model=DashboardStats)
-async def get_dashboard_stats(db: Session = Depends(get_db)):
+@query_budget(7)
+@cached_report("purchases", "vehicles", "stock_items", "stock_movements", "maintenance_records")
+def get_dashboard_stats(db: Session = Depends(get_db)):
     """Tableau de bord principal avec toutes les statistiques"""
     
     # Statistiques des achats
@@ -56,12 +62,14 @@ async def get_dashboard_stats(db: Session = Depends(get_db)):
         })
     
     # Mouvements de stock récents
-    recent_movements = db.query(StockMovement).filter(
+    recent_movements = db.query(StockMovement).options(
+        joinedload(StockMovement.stock_item)
+    ).filter(
         StockMovement.created_at >= datetime.utcnow() - timedelta(days=7)
     ).order_by(StockMovement.created_at.desc()).limit(5).all()
     
     for movement in recent_movements:
-        item = db.query(StockItem).filter(StockItem.id == movement.stock_item_id).first()
+        item = movement.stock_item
         if item:
             recent_activities.append({
                 "type": "stock_movement",
@@ -71,12 +79,14 @@ async def get_dashboard_stats(db: Session = Depends(get_db)):
             })
     
     # Maintenances récentes
-    recent_maintenance = db.query(MaintenanceRecord).filter(
+    recent_maintenance = db.query(MaintenanceRecord).options(
+        joinedload(MaintenanceRecord.vehicle)
+    ).filter(
         MaintenanceRecord.service_date >= datetime.utcnow() - timedelta(days=7)
     ).order_by(MaintenanceRecord.service_date.desc()).limit(5).all()
     
     for maintenance in recent_maintenance:
-        vehicle = db.query(Vehicle).filter(Vehicle.id == maintenance.vehicle_id).first()
+        vehicle = maintenance.vehicle
         if vehicle:
             recent_activities.append({
                 "type": "maintenance",
@@ -97,91 +107,55 @@ async def get_dashboard_stats(db: Session = Depends(get_db)):
     )
 
 @router.get("/purchases/period")
-async def get_purchase_period_report(
+@fast_json
+@query_budget(4)
+@cached_report("purchases", "daily_purchase_rollups")
+def get_purchase_period_report(
     period: PurchasePeriod,
     year: int = Query(..., description="Année"),
     month: Optional[int] = Query(None, description="Mois (pour les rapports mensuels)"),
     week: Optional[int] = Query(None, description="Semaine (pour les rapports hebdomadaires)"),
+    include_purchases: bool = Query(True, description="Inclure le détail des achats"),
     db: Session = Depends(get_db)
 ):
     """Rapport détaillé des achats par période"""
     
     # Calculer les dates selon la période
-    if period == PurchasePeriod.DAILY:
-        if not month:
-            raise HTTPException(status_code=400, detail="Le mois est requis pour les rapports journaliers")
-        start_date = datetime(year, month, 1)
-        end_date = datetime(year, month, calendar.monthrange(year, month)[1])
-    elif period == PurchasePeriod.WEEKLY:
-        if not week:
-            raise HTTPException(status_code=400, detail="La semaine est requise pour les rapports hebdomadaires")
-        start_date = datetime(year, 1, 1) + timedelta(weeks=week-1)
-        end_date = start_date + timedelta(days=6)
-    elif period == PurchasePeriod.MONTHLY:
-        if not month:
-            raise HTTPException(status_code=400, detail="Le mois est requis pour les rapports mensuels")
-        start_date = datetime(year, month, 1)
-        end_date = datetime(year, month, calendar.monthrange(year, month)[1])
-    elif period == PurchasePeriod.SEMESTRIAL:
-        semester = 1 if month and month <= 6 else 2
-        if semester == 1:
-            start_date = datetime(year, 1, 1)
-            end_date = datetime(year, 6, 30)
-        else:
-            start_date = datetime(year, 7, 1)
-            end_date = datetime(year, 12, 31)
-    elif period == PurchasePeriod.ANNUAL:
-        start_date = datetime(year, 1, 1)
-        end_date = datetime(year, 12, 31)
-    
-    # Récupérer les achats
-    purchases = db.query(Purchase).filter(
-        and_(
-            Purchase.purchase_date >= start_date,
-            Purchase.purchase_date <= end_date
-        )
-    ).all()
+    start_date, end_date = period_bounds(period, year, month, week)
     
-    # Statistiques générales
-    total_amount = sum(p.amount for p in purchases)
-    total_items = len(purchases)
+    # Statistiques générales (lues dans les agrégats journaliers)
+    total_amount, total_items = purchase_period_totals(db, start_date, end_date)
     average_amount = total_amount / total_items if total_items > 0 else 0
     
     # Répartition par catégorie
-    category_breakdown = {}
-    for purchase in purchases:
-        cat = purchase.category
-        if cat not in category_breakdown:
-            category_breakdown[cat] = {
-                "count": 0,
-                "amount": 0.0,
-                "percentage": 0.0
-            }
-        category_breakdown[cat]["count"] += 1
-        category_breakdown[cat]["amount"] += purchase.amount
-    
-    # Calculer les pourcentages
-    for cat in category_breakdown:
-        category_breakdown[cat]["percentage"] = (
-            category_breakdown[cat]["amount"] / total_amount * 100
-            if total_amount > 0 else 0
+    category_breakdown = {
+        category: {
+            "count": count,
+            "amount": amount,
+            "percentage": amount / total_amount * 100 if total_amount > 0 else 0
+        }
+        for category, count, amount in purchase_period_breakdown(
+            db, DailyPurchaseRollup.category, start_date, end_date
         )
+    }
     
     # Top 5 des fournisseurs
-    supplier_stats = {}
-    for purchase in purchases:
-        if purchase.supplier:
-            supplier = purchase.supplier
-            if supplier not in supplier_stats:
-                supplier_stats[supplier] = {"count": 0, "amount": 0.0}
-            supplier_stats[supplier]["count"] += 1
-            supplier_stats[supplier]["amount"] += purchase.amount
-    
-    top_suppliers = sorted(
-        supplier_stats.items(),
-        key=lambda x: x[1]["amount"],
-        reverse=True
-    )[:5]
+    top_suppliers = purchase_period_breakdown(
+        db, DailyPurchaseRollup.supplier, start_date, end_date,
+        filters=[DailyPurchaseRollup.supplier != ""],
+        limit=5
+    )
+    
+    # Détail des achats (optionnel pour les tableaux de bord), jour de fin
+    # inclus comme dans les agrégats journaliers
+    purchases = []
+    if include_purchases:
+        purchases = db.query(Purchase).filter(
+            and_(
+                Purchase.purchase_date >= start_date,
+                Purchase.purchase_date < end_date + timedelta(days=1)
+            )
+        ).all()
     
     return {
         "period": f"{period.value}_{year}",
@@ -193,19 +167,28 @@ async def get_purchase_period_report(
             "average_amount": average_amount
         },
         "category_breakdown": category_breakdown,
-        "top_suppliers": [{"supplier": s[0], **s[1]} for s in top_suppliers],
+        "top_suppliers": [
+            {"supplier": supplier, "count": count, "amount": amount}
+            for supplier, count, amount in top_suppliers
+        ],
         "purchases": purchases
     }
 
 @router.get("/stock/analysis")
-async def get_stock_analysis(
+@query_budget(1)
+def get_stock_analysis(
     category: Optional[PurchaseCategory] = None,
     low_stock_only: bool = False,
     db: Session = Depends(get_db)
 ):
     """Analyse détaillée du stock"""
     
-    query = db.query(StockItem).filter(StockItem.is_active == True)
+    # Articles valorisés au prix unitaire moyen d'achat (0 sans achat), comme stock_value()
+    average_prices = average_unit_prices(db)
+    query = db.query(StockItem, func.coalesce(average_prices.c.unit_price, 0.0)).outerjoin(
+        average_prices,
+        (average_prices.c.item_name == StockItem.name) & (average_prices.c.category == StockItem.category)
+    ).filter(StockItem.is_active == True)
     
     if category:
         query = query.filter(StockItem.category == category)
@@ -213,7 +196,9 @@ async def get_stock_analysis(
     if low_stock_only:
         query = query.filter(StockItem.current_quantity <= StockItem.min_threshold)
     
-    items = query.all()
+    rows = query.all()
+    items = [item for item, _ in rows]
+    unit_prices = {item.id: unit_price for item, unit_price in rows}
     
     if not items:
         return {
@@ -226,7 +211,7 @@ async def get_stock_analysis(
         }
     
     # Statistiques générales
-    total_value = sum(item.current_quantity * item.unit_cost for item in items)
+    total_value = sum(item.current_quantity * unit_prices[item.id] for item in items)
     low_stock_count = len([item for item in items if item.current_quantity <= item.min_threshold])
     out_of_stock_count = len([item for item in items if item.current_quantity == 0])
     
@@ -244,7 +229,7 @@ async def get_stock_analysis(
             }
         categories[cat]["count"] += 1
         categories[cat]["total_quantity"] += item.current_quantity
-        categories[cat]["total_value"] += item.current_quantity * item.unit_cost
+        categories[cat]["total_value"] += item.current_quantity * unit_prices[item.id]
         if item.current_quantity <= item.min_threshold:
             categories[cat]["low_stock"] += 1
         if item.current_quantity == 0:
@@ -290,56 +275,33 @@ async def get_stock_analysis(
     }
 
 @router.get("/vehicles/costs")
-async def get_vehicle_costs_report(
+@query_budget(4)
+@cached_report("vehicles", "maintenance_records", "fuel_records", "daily_vehicle_cost_rollups")
+def get_vehicle_costs_report(
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     vehicle_id: Optional[int] = None,
     db: Session = Depends(get_db)
 ):
-    """Rapport des coûts des véhicules"""
-    
-    # Coûts de maintenance
-    maintenance_query = db.query(MaintenanceRecord)
-    if start_date:
-        maintenance_query = maintenance_query.filter(MaintenanceRecord.service_date >= start_date)
-    if end_date:
-        maintenance_query = maintenance_query.filter(MaintenanceRecord.service_date <= end_date)
-    if vehicle_id:
-        maintenance_query = maintenance_query.filter(MaintenanceRecord.vehicle_id == vehicle_id)
-    
-    maintenance_records = maintenance_query.all()
-    total_maintenance_cost = sum(record.cost for record in maintenance_records)
-    
-    # Coûts de carburant
-    fuel_query = db.query(FuelRecord)
-    if start_date:
-        fuel_query = fuel_query.filter(FuelRecord.refuel_date >= start_date)
-    if end_date:
-        fuel_query = fuel_query.filter(FuelRecord.refuel_date <= end_date)
-    if vehicle_id:
-        fuel_query = fuel_query.filter(FuelRecord.vehicle_id == vehicle_id)
-    
-    fuel_records = fuel_query.all()
-    total_fuel_cost = sum(record.total_cost for record in fuel_records)
+    """Rapport des coûts des véhicules (jours entiers lus dans les agrégats journaliers)"""
+    totals = vehicle_cost_totals(db, start_date, end_date, vehicle_id)
+    total_maintenance_cost = sum((amount for _, _, amount in totals["maintenance"]), 0.0)
+    maintenance_count = sum(count for _, count, _ in totals["maintenance"])
+    total_fuel_cost = sum((amount for _, _, amount in totals["fuel"]), 0.0)
+    fuel_count = sum(count for _, count, _ in totals["fuel"])
     
     # Coûts par véhicule
     vehicle_costs = {}
-    for record in maintenance_records:
-        if record.vehicle_id not in vehicle_costs:
-            vehicle_costs[record.vehicle_id] = {"maintenance": 0.0, "fuel": 0.0}
-        vehicle_costs[record.vehicle_id]["maintenance"] += record.cost
-    
-    for record in fuel_records:
-        if record.vehicle_id not in vehicle_costs:
-            vehicle_costs[record.vehicle_id] = {"maintenance": 0.0, "fuel": 0.0}
-        vehicle_costs[record.vehicle_id]["fuel"] += record.total_cost
+    for cost_type in ("maintenance", "fuel"):
+        for vid, _, amount in totals[cost_type]:
+            vehicle_costs.setdefault(vid, {"maintenance": 0.0, "fuel": 0.0})[cost_type] += amount
     
-    # Ajouter les informations des véhicules
+    # Ajouter les informations des véhicules (une seule requête)
     vehicle_details = {}
-    for vid in vehicle_costs.keys():
-        vehicle = db.query(Vehicle).filter(Vehicle.id == vid).first()
-        if vehicle:
-            vehicle_details[vid] = {
+    if vehicle_costs:
+        vehicles = db.query(Vehicle).filter(Vehicle.id.in_(list(vehicle_costs.keys()))).all()
+        for vehicle in vehicles:
+            vehicle_details[vehicle.id] = {
                 "plate_number": vehicle.plate_number,
                 "brand": vehicle.brand,
                 "model": vehicle.model,
@@ -355,8 +317,8 @@ async def get_vehicle_costs_report(
             "total_maintenance_cost": total_maintenance_cost,
             "total_fuel_cost": total_fuel_cost,
             "total_operating_cost": total_maintenance_cost + total_fuel_cost,
-            "maintenance_count": len(maintenance_records),
-            "fuel_count": len(fuel_records)
+            "maintenance_count": maintenance_count,
+            "fuel_count": fuel_count
         },
         "vehicle_costs": {
             vid: {
@@ -369,7 +331,9 @@ async def get_vehicle_costs_report(
     }
 
 @router.get("/financial/summary")
-async def get_financial_summary(
+@query_budget(5)
+@cached_report("purchases", "maintenance_records", "fuel_records", "stock_items", "vehicles")
+def get_financial_summary(
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     db: Session = Depends(get_db)
@@ -377,38 +341,18 @@ async def get_financial_summary(
     """Résumé financier global"""
     
     # Achats
-    purchase_query = db.query(Purchase)
-    if start_date:
-        purchase_query = purchase_query.filter(Purchase.purchase_date >= start_date)
-    if end_date:
-        purchase_query = purchase_query.filter(Purchase.purchase_date <= end_date)
-    
-    purchases = purchase_query.all()
-    total_purchases = sum(p.amount for p in purchases)
+    total_purchases, _ = total_and_count(db, Purchase.amount, Purchase.purchase_date, start_date, end_date)
     
     # Coûts de maintenance
-    maintenance_query = db.query(MaintenanceRecord)
-    if start_date:
-        maintenance_query = maintenance_query.filter(MaintenanceRecord.service_date >= start_date)
-    if end_date:
-        maintenance_query = maintenance_query.filter(MaintenanceRecord.service_date <= end_date)
-    
-    maintenance_records = maintenance_query.all()
-    total_maintenance = sum(record.cost for record in maintenance_records)
+    total_maintenance, _ = total_and_count(db, MaintenanceRecord.cost, MaintenanceRecord.service_date, start_date, end_date)
     
     # Coûts de carburant
-    fuel_query = db.query(FuelRecord)
-    if start_date:
-        fuel_query = fuel_query.filter(FuelRecord.refuel_date >= start_date)
-    if end_date:
-        fuel_query = fuel_query.filter(FuelRecord.refuel_date <= end_date)
-    
-    fuel_records = fuel_query.all()
-    total_fuel = sum(record.total_cost for record in fuel_records)
+    total_fuel, _ = total_and_count(db, FuelRecord.total_cost, FuelRecord.refuel_date, start_date, end_date)
     
     # Valeur du stock actuel
-    stock_items = db.query(StockItem).filter(StockItem.is_active == True).all()
-    stock_value = sum(item.current_quantity * item.unit_cost for item in stock_items)
+    current_stock_value = stock_value(db)
+    
+    total_expenses = total_purchases + total_maintenance + total_fuel
     
     return {
         "period": {
@@ -419,20 +363,24 @@ async def get_financial_summary(
             "purchases": total_purchases,
             "maintenance": total_maintenance,
             "fuel": total_fuel,
-            "total_expenses": total_purchases + total_maintenance + total_fuel
+            "total_expenses": total_expenses
         },
         "assets": {
-            "stock_value": stock_value,
+            "stock_value": current_stock_value,
             "total_vehicles": db.query(Vehicle).count()
         },
         "summary": {
-            "net_expenses": total_purchases + total_maintenance + total_fuel,
-            "asset_value": stock_value,
+            "net_expenses": total_expenses,
+            "asset_value": current_stock_value,
             "expense_breakdown": {
-                "purchases_percentage": (total_purchases / (total_purchases + total_maintenance + total_fuel) * 100) if (total_purchases + total_maintenance + total_fuel) > 0 else 0,
-                "maintenance_percentage": (total_maintenance / (total_purchases + total_maintenance + total_fuel) * 100) if (total_purchases + total_maintenance + total_fuel) > 0 else 0,
-                "fuel_percentage": (total_fuel / (total_purchases + total_maintenance + total_fuel) * 100) if (total_purchases + total_maintenance + total_fuel) > 0 else 0
+                "purchases_percentage": (total_purchases / total_expenses * 100) if total_expenses > 0 else 0,
+                "maintenance_percentage": (total_maintenance / total_expenses * 100) if total_expenses > 0 else 0,
+                "fuel_percentage": (total_fuel / total_expenses * 100) if total_expenses > 0 else 0
             }
         }
     }
 
+@router.get("/cache/stats")
+def get_report_cache_stats():
+    """Compteurs du cache des rapports (succès, échecs, évictions)"""
+    return report_cache.stats()
@@ -0,0 +1,32 @@
+"""
+Recherche plein texte (voir search.py)
+
+GET /api/search?q=papier : articles de stock, fournisseurs, prestataires,
+véhicules et services correspondant à tous les mots (préfixes, sans tenir
+compte des accents ni de la casse), du plus au moins pertinent.
+"""
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from database import get_db
+from models import SearchEntity, User
+from schemas import SearchResult
+from auth import get_current_active_user
+from query_counter import query_budget
+from search import search
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+@router.get("", response_model=List[SearchResult])
+@query_budget(2)
+def search_all(
+    q: str = Query(..., min_length=1, max_length=200, description="Mots recherchés"),
+    entity: Optional[List[SearchEntity]] = Query(None, description="Limiter à ces entités (par défaut : toutes)"),
+    include_inactive: bool = Query(False, description="Inclure les éléments désactivés et les véhicules hors service"),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Rechercher dans les articles, fournisseurs, prestataires, véhicules et services"""
+    return search(db, q, entity, include_inactive, limit)
@@ -1,15 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from database import get_db
 from models import ServiceProvider
 from schemas import ServiceProviderCreate, ServiceProviderUpdate, ServiceProvider as ServiceProviderSchema
 from auth import get_current_active_user
+from pagination import paginate
 
 router = APIRouter(prefix="/service-providers", tags=["service-providers"])
 
 @router.post("/", response_model=ServiceProviderSchema)
-async def create_service_provider(
+def create_service_provider(
     provider: ServiceProviderCreate, 
     db: Session = Depends(get_db),
     current_user = Depends(get_current_active_user)
@@ -22,9 +23,11 @@ async def create_service_provider(
     return db_provider
 
 @router.get("/", response_model=List[ServiceProviderSchema])
-async def get_service_providers(
+def get_service_providers(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
     service_type: Optional[str] = None,
     city: Optional[str] = None,
     is_active: Optional[bool] = None,
@@ -43,10 +46,10 @@ async def get_service_providers(
     if is_active is not None:
         query = query.filter(ServiceProvider.is_active == is_active)
     
-    return query.order_by(ServiceProvider.name).offset(skip).limit(limit).all()
+    return paginate(query, ServiceProvider.name, ServiceProvider.id, limit, cursor, skip, response, descending=False)
 
 @router.get("/{provider_id}", response_model=ServiceProviderSchema)
-async def get_service_provider(
+def get_service_provider(
     provider_id: int,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_active_user)
@@ -58,7 +61,7 @@ async def get_service_provider(
     return provider
 
 @router.put("/{provider_id}", response_model=ServiceProviderSchema)
-async def update_service_provider(
+def update_service_provider(
     provider_id: int,
     provider_update: ServiceProviderUpdate,
     db: Session = Depends(get_db),
@@ -78,7 +81,7 @@ async def update_service_provider(
     return provider
 
 @router.delete("/{provider_id}")
-async def delete_service_provider(
+def delete_service_provider(
     provider_id: int,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_active_user)
@@ -93,7 +96,7 @@ async def delete_service_provider(
     return {"message": "Prestataire supprimé avec succès"}
 
 @router.get("/stats/summary")
-async def get_service_providers_stats(
+def get_service_providers_stats(
     db: Session = Depends(get_db),
     current_user = Depends(get_current_active_user)
 ):
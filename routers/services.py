@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
@@ -9,6 +9,7 @@ from database import get_db
 from models import Service as ServiceModel, User, UserRole
 from schemas import ServiceCreate, ServiceUpdate, Service
 from auth import get_current_active_user
+from pagination import paginate
 
 router = APIRouter(prefix="/services", tags=["services"])
 
@@ -21,7 +22,7 @@ def generate_service_code():
         return code
 
 @router.post("/", response_model=Service, status_code=status.HTTP_201_CREATED)
-async def create_service(
+def create_service(
     service: ServiceCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -63,7 +64,11 @@ async def create_service(
     return db_service
 
 @router.get("/", response_model=List[Service])
-async def get_services(
+def get_services(
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
     search: Optional[str] = Query(None, description="Rechercher par nom ou code"),
     is_active: Optional[bool] = Query(None, description="Filtrer par statut actif"),
     db: Session = Depends(get_db),
@@ -81,10 +86,10 @@ async def get_services(
     if is_active is not None:
         query = query.filter(ServiceModel.is_active == is_active)
     
-    return query.order_by(ServiceModel.name).all()
+    return paginate(query, ServiceModel.name, ServiceModel.id, limit, cursor, skip, response, descending=False)
 
 @router.get("/{service_id}", response_model=Service)
-async def get_service(
+def get_service(
     service_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -97,7 +102,7 @@ async def get_service(
     return service
 
 @router.put("/{service_id}", response_model=Service)
-async def update_service(
+def update_service(
     service_id: int,
     service_update: ServiceUpdate,
     db: Session = Depends(get_db),
@@ -125,7 +130,7 @@ async def update_service(
     return service
 
 @router.delete("/{service_id}")
-async def delete_service(
+def delete_service(
     service_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -156,7 +161,7 @@ async def delete_service(
     return {"message": "Service supprimé avec succès"}
 
 @router.get("/dashboard/stats")
-async def get_services_stats(
+def get_services_stats(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
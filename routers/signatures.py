@@ -0,0 +1,50 @@
+"""
+Images des signatures (voir blobstore.py)
+
+L'URL contient l'empreinte du contenu : une image ne change jamais pour une
+URL donnée, le navigateur la garde en cache sans revalidation.
+
+Accès par l'URL signée des réponses (dg_signature_url, receipt_signature_url),
+utilisable dans <img src>, ou par l'en-tête Authorization: Bearer.
+"""
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import Response
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy.orm import Session
+from typing import Optional
+from database import get_db
+from auth import get_current_active_user, get_current_user
+from blobstore import get, is_digest, media_type, valid_token
+
+router = APIRouter(prefix="/signatures", tags=["signatures"])
+
+optional_security = HTTPBearer(auto_error=False)
+
+
+@router.get("/{digest}")
+def get_signature(
+    digest: str,
+    request: Request,
+    expires: Optional[int] = None,
+    token: Optional[str] = None,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+    db: Session = Depends(get_db)
+):
+    """Image d'une signature (PNG envoyé lors de l'approbation ou de la réception)"""
+    if not valid_token(digest, expires, token):
+        if credentials is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="URL de signature expirée ou invalide",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        get_current_active_user(get_current_user(credentials, db))
+
+    headers = {"ETag": f'"{digest}"', "Cache-Control": "private, max-age=31536000, immutable"}
+    if is_digest(digest) and request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+
+    data = get(digest)
+    if data is None:
+        raise HTTPException(status_code=404, detail="Signature non trouvée")
+    return Response(data, media_type=media_type(data), headers=headers)
@@ -1,31 +1,46 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 from database import get_db
-from models import StockItem, StockMovement, PurchaseCategory
+from models import StockItem, StockMovement, StockLedgerEntry, PurchaseCategory, BatchMode
 from schemas import (
     StockItemCreate, StockItemUpdate, StockItem as StockItemSchema,
     StockMovementCreate, StockMovement as StockMovementSchema,
-    StockAlert
+    StockAlert, StockMovementBatch, StockMovementBatchResult,
+    StockLedgerEntry as StockLedgerEntrySchema, StockQuantityAsOf
 )
+from pagination import paginate
+from inventory import apply_movement, available_quantity, apply_movement_batch, set_quantity
+from ledger import quantity_as_of
 import os
 
 router = APIRouter(prefix="/stock", tags=["stock"])
 
+def _commit_item(db: Session):
+    """Valider la création ou modification d'un article ((nom, catégorie) est unique)"""
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Un article avec ce nom existe déjà dans cette catégorie")
+
 @router.post("/items", response_model=StockItemSchema)
-async def create_stock_item(item: StockItemCreate, db: Session = Depends(get_db)):
+def create_stock_item(item: StockItemCreate, db: Session = Depends(get_db)):
     """Créer un nouvel article en stock"""
     db_item = StockItem(**item.dict())
     db.add(db_item)
-    db.commit()
+    _commit_item(db)
     db.refresh(db_item)
     return db_item
 
 @router.get("/items", response_model=List[StockItemSchema])
-async def get_stock_items(
+def get_stock_items(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
     category: Optional[PurchaseCategory] = None,
     low_stock: Optional[bool] = None,
     db: Session = Depends(get_db)
@@ -41,18 +56,42 @@ async def get_stock_items(
         else:
             query = query.filter(StockItem.current_quantity > StockItem.min_threshold)
     
-    return query.offset(skip).limit(limit).all()
+    return paginate(query, StockItem.id, StockItem.id, limit, cursor, skip, response, descending=False)
 
 @router.get("/items/{item_id}", response_model=StockItemSchema)
-async def get_stock_item(item_id: int, db: Session = Depends(get_db)):
+def get_stock_item(item_id: int, db: Session = Depends(get_db)):
     """Récupérer un article par ID"""
     item = db.query(StockItem).filter(StockItem.id == item_id).first()
     if not item:
         raise HTTPException(status_code=404, detail="Article non trouvé")
     return item
 
+@router.get("/items/{item_id}/quantity", response_model=StockQuantityAsOf)
+def get_stock_quantity_as_of(item_id: int, as_of: Optional[datetime] = None, db: Session = Depends(get_db)):
+    """Quantité d'un article à une date (UTC), reconstituée à partir du registre des stocks"""
+    if not db.query(StockItem.id).filter(StockItem.id == item_id).first():
+        raise HTTPException(status_code=404, detail="Article non trouvé")
+    if as_of is None:
+        as_of = datetime.utcnow()
+    elif as_of.tzinfo is not None:
+        as_of = as_of.astimezone(timezone.utc).replace(tzinfo=None)
+    return {"stock_item_id": item_id, "as_of": as_of, "quantity": quantity_as_of(db, item_id, as_of)}
+
+@router.get("/items/{item_id}/ledger", response_model=List[StockLedgerEntrySchema])
+def get_stock_ledger(
+    item_id: int,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Variations de la quantité d'un article, de la plus récente à la plus ancienne"""
+    query = db.query(StockLedgerEntry).filter(StockLedgerEntry.stock_item_id == item_id)
+    return paginate(query, StockLedgerEntry.created_at, StockLedgerEntry.id, limit, cursor, skip, response)
+
 @router.put("/items/{item_id}", response_model=StockItemSchema)
-async def update_stock_item(
+def update_stock_item(
     item_id: int,
     item_update: StockItemUpdate,
     db: Session = Depends(get_db)
@@ -63,16 +102,21 @@ async def update_stock_item(
         raise HTTPException(status_code=404, detail="Article non trouvé")
     
     update_data = item_update.dict(exclude_unset=True)
+    new_quantity = update_data.pop("current_quantity", None)
     for field, value in update_data.items():
         setattr(item, field, value)
     
     item.updated_at = datetime.utcnow()
-    db.commit()
+    if new_quantity is not None:
+        # Quantité fixée comme un ajustement, enregistré au registre
+        db.flush()
+        set_quantity(db, item_id, new_quantity, reason="Modification de l'article")
+    _commit_item(db)
     db.refresh(item)
     return item
 
 @router.delete("/items/{item_id}")
-async def delete_stock_item(item_id: int, db: Session = Depends(get_db)):
+def delete_stock_item(item_id: int, db: Session = Depends(get_db)):
     """Supprimer un article (désactivation)"""
     item = db.query(StockItem).filter(StockItem.id == item_id).first()
     if not item:
@@ -84,39 +128,58 @@ async def delete_stock_item(item_id: int, db: Session = Depends(get_db)):
     return {"message": "Article désactivé avec succès"}
 
 @router.post("/movements", response_model=StockMovementSchema)
-async def create_stock_movement(movement: StockMovementCreate, db: Session = Depends(get_db)):
+def create_stock_movement(movement: StockMovementCreate, db: Session = Depends(get_db)):
     """Créer un mouvement de stock"""
     # Vérifier que l'article existe
     stock_item = db.query(StockItem).filter(StockItem.id == movement.stock_item_id).first()
     if not stock_item:
         raise HTTPException(status_code=404, detail="Article non trouvé")
     
-    # Créer le mouvement
+    # Créer le mouvement (son id est référencé par la variation du registre)
     db_movement = StockMovement(**movement.dict())
     db.add(db_movement)
+    db.flush()
     
-    # Mettre à jour la quantité en stock
-    if movement.movement_type == "in":
-        stock_item.current_quantity += movement.quantity
-    elif movement.movement_type == "out":
-        if stock_item.current_quantity < movement.quantity:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Stock insuffisant. Disponible: {stock_item.current_quantity}, Demandé: {movement.quantity}"
-            )
-        stock_item.current_quantity -= movement.quantity
-    elif movement.movement_type == "adjustment":
-        stock_item.current_quantity = movement.quantity
+    # Mettre à jour la quantité en stock (UPDATE conditionnel, sans lecture préalable)
+    if not apply_movement(db, movement.stock_item_id, movement.movement_type, movement.quantity, db_movement.id):
+        db.rollback()
+        raise HTTPException(
+            status_code=400, 
+            detail=f"Stock insuffisant. Disponible: {available_quantity(db, movement.stock_item_id)}, Demandé: {movement.quantity}"
+        )
     
-    stock_item.updated_at = datetime.utcnow()
     db.commit()
     db.refresh(db_movement)
     return db_movement
 
+@router.post("/movements/batch", response_model=StockMovementBatchResult)
+def create_stock_movements_batch(batch: StockMovementBatch, db: Session = Depends(get_db)):
+    """Créer des mouvements de stock en lot (réceptions, inventaires) dans une seule transaction"""
+    all_or_nothing = batch.mode == BatchMode.ALL_OR_NOTHING
+    results = apply_movement_batch(db, batch.movements, all_or_nothing)
+    rejected = sum(1 for line in results if line["status"] == "rejected")
+    
+    if all_or_nothing and rejected:
+        db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail={"message": "Lot refusé : aucune ligne n'a été appliquée", "results": results}
+        )
+    
+    db.commit()
+    return {
+        "mode": batch.mode,
+        "applied": len(results) - rejected,
+        "rejected": rejected,
+        "results": results
+    }
+
 @router.get("/movements", response_model=List[StockMovementSchema])
-async def get_stock_movements(
+def get_stock_movements(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
     item_id: Optional[int] = None,
     movement_type: Optional[str] = None,
     db: Session = Depends(get_db)
@@ -129,10 +192,10 @@ async def get_stock_movements(
     if movement_type:
         query = query.filter(StockMovement.movement_type == movement_type)
     
-    return query.order_by(StockMovement.created_at.desc()).offset(skip).limit(limit).all()
+    return paginate(query, StockMovement.created_at, StockMovement.id, limit, cursor, skip, response)
 
 @router.get("/alerts", response_model=List[StockAlert])
-async def get_stock_alerts(db: Session = Depends(get_db)):
+def get_stock_alerts(db: Session = Depends(get_db)):
     """Récupérer les alertes de stock (articles en rupture ou seuil bas)"""
     items = db.query(StockItem).filter(StockItem.is_active == True).all()
     
@@ -166,7 +229,7 @@ async def get_stock_alerts(db: Session = Depends(get_db)):
     return alerts
 
 @router.get("/reorder-list")
-async def get_reorder_list(db: Session = Depends(get_db)):
+def get_reorder_list(db: Session = Depends(get_db)):
     """Liste des articles à réapprovisionner"""
     items = db.query(StockItem).filter(
         StockItem.is_active == True,
@@ -195,7 +258,7 @@ async def get_reorder_list(db: Session = Depends(get_db)):
     }
 
 @router.get("/stats/summary")
-async def get_stock_summary(db: Session = Depends(get_db)):
+def get_stock_summary(db: Session = Depends(get_db)):
     """Résumé du stock"""
     items = db.query(StockItem).filter(StockItem.is_active == True).all()
     
@@ -238,7 +301,7 @@ async def get_stock_summary(db: Session = Depends(get_db)):
     }
 
 @router.post("/items/{item_id}/adjust")
-async def adjust_stock_quantity(
+def adjust_stock_quantity(
     item_id: int,
     new_quantity: int,
     reason: str = "Ajustement manuel",
@@ -249,18 +312,17 @@ async def adjust_stock_quantity(
     if not item:
         raise HTTPException(status_code=404, detail="Article non trouvé")
     
-    old_quantity = item.current_quantity
-    item.current_quantity = new_quantity
-    item.updated_at = datetime.utcnow()
-    
-    # Créer un mouvement d'ajustement
+    # Créer un mouvement d'ajustement, puis fixer la quantité sous verrou
+    # (variation nouvelle - ancienne enregistrée au registre)
     movement = StockMovement(
         stock_item_id=item_id,
         movement_type="adjustment",
-        quantity=new_quantity,
-        reason=f"Ajustement: {reason} (ancien: {old_quantity}, nouveau: {new_quantity})"
+        quantity=new_quantity
     )
     db.add(movement)
+    db.flush()
+    old_quantity = set_quantity(db, item_id, new_quantity, movement.id, reason)
+    movement.reason = f"Ajustement: {reason} (ancien: {old_quantity}, nouveau: {new_quantity})"
     
     db.commit()
     return {
@@ -1,16 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
-from typing import List
-from datetime import datetime
+from typing import List, Optional
 from database import get_db
 from models import StockMovement, StockItem, User
 from schemas import StockMovementCreate, StockMovementUpdate, StockMovement as StockMovementSchema
 from auth import get_current_active_user
+from pagination import paginate
+from inventory import apply_movement, available_quantity, reverse_movement, movement_delta
 
 router = APIRouter(prefix="/stock-movements", tags=["stock-movements"])
 
 @router.post("/", response_model=StockMovementSchema)
-async def create_stock_movement(
+def create_stock_movement(
     movement: StockMovementCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -21,34 +22,35 @@ async def create_stock_movement(
     if not stock_item:
         raise HTTPException(status_code=404, detail="Article de stock non trouvé")
     
-    # Créer le mouvement
+    # Créer le mouvement (son id est référencé par la variation du registre)
     movement_data = movement.dict()
     movement_data['user_id'] = current_user.id
     
     db_movement = StockMovement(**movement_data)
     db.add(db_movement)
+    db.flush()
     
-    # Mettre à jour la quantité en stock
-    if movement.movement_type == "entry":
-        stock_item.current_quantity += movement.quantity
-    elif movement.movement_type == "exit":
-        if stock_item.current_quantity < movement.quantity:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Quantité insuffisante en stock. Disponible: {stock_item.current_quantity}, Demandée: {movement.quantity}"
-            )
-        stock_item.current_quantity -= movement.quantity
+    # Mettre à jour la quantité en stock (UPDATE conditionnel, sans lecture préalable)
+    if not apply_movement(db, movement.stock_item_id, movement.movement_type, movement.quantity, db_movement.id):
+        db.rollback()
+        raise HTTPException(
+            status_code=400, 
+            detail=f"Quantité insuffisante en stock. Disponible: {available_quantity(db, movement.stock_item_id)}, Demandée: {movement.quantity}"
+        )
     
-    stock_item.updated_at = datetime.utcnow()
     db.commit()
     db.refresh(db_movement)
     
     return db_movement
 
 @router.get("/", response_model=List[StockMovementSchema])
-async def get_stock_movements(
+def get_stock_movements(
+    response: Response,
     stock_item_id: int = None,
     movement_type: str = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -61,11 +63,10 @@ async def get_stock_movements(
     if movement_type:
         query = query.filter(StockMovement.movement_type == movement_type)
     
-    movements = query.order_by(StockMovement.created_at.desc()).all()
-    return movements
+    return paginate(query, StockMovement.created_at, StockMovement.id, limit, cursor, skip, response)
 
 @router.get("/{movement_id}", response_model=StockMovementSchema)
-async def get_stock_movement(
+def get_stock_movement(
     movement_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -77,7 +78,7 @@ async def get_stock_movement(
     return movement
 
 @router.put("/{movement_id}", response_model=StockMovementSchema)
-async def update_stock_movement(
+def update_stock_movement(
     movement_id: int,
     movement_update: StockMovementUpdate,
     db: Session = Depends(get_db),
@@ -97,7 +98,7 @@ async def update_stock_movement(
     return movement
 
 @router.delete("/{movement_id}")
-async def delete_stock_movement(
+def delete_stock_movement(
     movement_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -107,14 +108,14 @@ async def delete_stock_movement(
     if not movement:
         raise HTTPException(status_code=404, detail="Mouvement de stock non trouvé")
     
-    # Annuler l'effet du mouvement sur le stock
-    stock_item = db.query(StockItem).filter(StockItem.id == movement.stock_item_id).first()
-    if stock_item:
-        if movement.movement_type == "entry":
-            stock_item.current_quantity -= movement.quantity
-        elif movement.movement_type == "exit":
-            stock_item.current_quantity += movement.quantity
-        stock_item.updated_at = datetime.utcnow()
+    # Annuler l'effet du mouvement sur le stock (variation inverse au registre)
+    if reverse_movement(db, movement) is None:
+        to_remove = movement_delta(db, movement)
+        db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail=f"Impossible d'annuler l'entrée : stock disponible {available_quantity(db, movement.stock_item_id)}, à retirer {to_remove}"
+        )
     
     db.delete(movement)
     db.commit()
@@ -0,0 +1,34 @@
+"""
+Suggestions au fil de la frappe (voir suggest.py)
+
+GET /api/suggest?entity=stock_item&q=pap : noms d'articles, de fournisseurs
+ou immatriculations de véhicules commençant par la saisie (ou dont un mot
+commence par la saisie), lus dans l'index en mémoire du worker.
+"""
+from fastapi import APIRouter, Depends, Query
+from typing import List
+from models import SuggestEntity, User
+from schemas import Suggestion
+from auth import get_current_active_user
+from query_counter import query_budget
+from suggest import suggestion_index
+
+router = APIRouter(prefix="/suggest", tags=["suggest"])
+
+
+@router.get("", response_model=List[Suggestion])
+@query_budget(1)  # authentification uniquement (utilisateur absent du cache)
+def suggest(
+    entity: SuggestEntity = Query(..., description="Entité suggérée"),
+    q: str = Query(..., min_length=1, max_length=100, description="Début de la saisie"),
+    limit: int = Query(10, ge=1, le=50),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Suggestions pour un champ de saisie (articles, fournisseurs, véhicules)"""
+    return suggestion_index.suggest(entity, q, limit)
+
+
+@router.get("/stats")
+def get_suggest_stats(current_user: User = Depends(get_current_active_user)):
+    """Taille des index de suggestions et nombre de recherches et de mises à jour"""
+    return suggestion_index.stats()
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
@@ -6,11 +6,14 @@ from database import get_db
 from models import Supplier
 from schemas import SupplierCreate, SupplierUpdate, Supplier as SupplierSchema
 from auth import get_current_active_user, require_role, UserRole
+from serialization import fast_json
+from projection import FIELDS_DESCRIPTION, parse_fields, project, projected_response
+from pagination import paginate
 
 router = APIRouter(prefix="/suppliers", tags=["suppliers"])
 
 @router.post("/", response_model=SupplierSchema)
-async def create_supplier(
+def create_supplier(
     supplier: SupplierCreate, 
     db: Session = Depends(get_db),
     current_user = Depends(require_role(UserRole.MANAGER))
@@ -34,16 +37,20 @@ async def create_supplier(
     return db_supplier
 
 @router.get("/", response_model=List[SupplierSchema])
-async def get_suppliers(
+def get_suppliers(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
     active_only: bool = Query(True, description="Afficher seulement les fournisseurs actifs"),
     search: Optional[str] = Query(None, description="Rechercher par nom ou contact"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_active_user)
 ):
     """Récupérer la liste des fournisseurs"""
-    query = db.query(Supplier)
+    selected = parse_fields(fields, SupplierSchema)
+    query = project(db.query(Supplier), Supplier, SupplierSchema, selected)
     
     if active_only:
         query = query.filter(Supplier.is_active == True)
@@ -56,10 +63,13 @@ async def get_suppliers(
             (Supplier.email.ilike(search_term))
         )
     
-    return query.offset(skip).limit(limit).all()
+    suppliers = paginate(query, Supplier.id, Supplier.id, limit, cursor, skip, response, descending=False)
+    if selected is None:
+        return suppliers
+    return projected_response(suppliers, SupplierSchema, selected, response)
 
 @router.get("/{supplier_id}", response_model=SupplierSchema)
-async def get_supplier(
+def get_supplier(
     supplier_id: int, 
     db: Session = Depends(get_db),
     current_user = Depends(get_current_active_user)
@@ -71,7 +81,7 @@ async def get_supplier(
     return supplier
 
 @router.put("/{supplier_id}", response_model=SupplierSchema)
-async def update_supplier(
+def update_supplier(
     supplier_id: int,
     supplier_update: SupplierUpdate,
     db: Session = Depends(get_db),
@@ -92,7 +102,7 @@ async def update_supplier(
     return supplier
 
 @router.delete("/{supplier_id}")
-async def delete_supplier(
+def delete_supplier(
     supplier_id: int,
     db: Session = Depends(get_db),
     current_user = Depends(require_role(UserRole.MANAGER))
@@ -119,7 +129,8 @@ async def delete_supplier(
         return {"message": "Fournisseur supprimé avec succès"}
 
 @router.get("/{supplier_id}/purchases")
-async def get_supplier_purchases(
+@fast_json
+def get_supplier_purchases(
     supplier_id: int,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
@@ -144,7 +155,7 @@ async def get_supplier_purchases(
     }
 
 @router.get("/stats/summary")
-async def get_suppliers_summary(
+def get_suppliers_summary(
     db: Session = Depends(get_db),
     current_user = Depends(get_current_active_user)
 ):
@@ -1,15 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from database import get_db
 from models import User as UserModel
 from schemas import UserCreate, UserUpdate, User
-from auth import get_current_active_user, get_password_hash
+from auth import get_current_active_user, get_password_hash, invalidate_user
+from pagination import paginate
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 @router.post("/", response_model=User, status_code=status.HTTP_201_CREATED)
-async def create_user(
+def create_user(
     user: UserCreate,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_active_user)
@@ -59,9 +60,11 @@ async def create_user(
     return db_user
 
 @router.get("/", response_model=List[User])
-async def get_users(
-    skip: int = 0,
-    limit: int = 100,
+def get_users(
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_active_user)
 ):
@@ -73,11 +76,10 @@ async def get_users(
             detail="Vous n'avez pas les permissions pour voir les utilisateurs"
         )
     
-    users = db.query(UserModel).offset(skip).limit(limit).all()
-    return users
+    return paginate(db.query(UserModel), UserModel.id, UserModel.id, limit, cursor, skip, response, descending=False)
 
 @router.get("/{user_id}", response_model=User)
-async def get_user(
+def get_user(
     user_id: int,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_active_user)
@@ -99,7 +101,7 @@ async def get_user(
     return user
 
 @router.put("/{user_id}", response_model=User)
-async def update_user(
+def update_user(
     user_id: int,
     user_update: UserUpdate,
     db: Session = Depends(get_db),
@@ -132,10 +134,11 @@ async def update_user(
     
     db.commit()
     db.refresh(user)
+    invalidate_user(user_id)
     return user
 
 @router.delete("/{user_id}")
-async def delete_user(
+def delete_user(
     user_id: int,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_active_user)
@@ -164,6 +167,7 @@ async def delete_user(
     
     db.delete(user)
     db.commit()
+    invalidate_user(user_id)
     return {"message": "Utilisateur supprimé avec succès"}
 
 
@@ -1,5 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
+from sqlalchemy import func
 from typing import List, Optional
 from datetime import datetime, timedelta
 from database import get_db
@@ -9,6 +10,10 @@ from schemas import (
     MaintenanceRecordCreate, MaintenanceRecord as MaintenanceRecordSchema,
     FuelRecordCreate, FuelRecord as FuelRecordSchema
 )
+from rollups import record_maintenance, record_fuel, detach_vehicle
+from query_counter import query_budget
+from pagination import paginate
+from serialization import fast_json
 import calendar
 
 router = APIRouter(prefix="/vehicles", tags=["vehicles"])
@@ -16,7 +21,7 @@ router = APIRouter(prefix="/vehicles", tags=["vehicles"])
 # === GESTION DES VÉHICULES ===
 
 @router.post("/", response_model=VehicleSchema)
-async def create_vehicle(vehicle: VehicleCreate, db: Session = Depends(get_db)):
+def create_vehicle(vehicle: VehicleCreate, db: Session = Depends(get_db)):
     """Créer un nouveau véhicule"""
     # Vérifier que le numéro de plaque n'existe pas déjà
     existing = db.query(Vehicle).filter(Vehicle.plate_number == vehicle.plate_number).first()
@@ -30,9 +35,12 @@ async def create_vehicle(vehicle: VehicleCreate, db: Session = Depends(get_db)):
     return db_vehicle
 
 @router.get("/", response_model=List[VehicleSchema])
-async def get_vehicles(
+@query_budget(1)
+def get_vehicles(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
     status: Optional[VehicleStatus] = None,
     brand: Optional[str] = None,
     db: Session = Depends(get_db)
@@ -45,10 +53,10 @@ async def get_vehicles(
     if brand:
         query = query.filter(Vehicle.brand.ilike(f"%{brand}%"))
     
-    return query.offset(skip).limit(limit).all()
+    return paginate(query, Vehicle.id, Vehicle.id, limit, cursor, skip, response, descending=False)
 
 @router.get("/{vehicle_id}", response_model=VehicleSchema)
-async def get_vehicle(vehicle_id: int, db: Session = Depends(get_db)):
+def get_vehicle(vehicle_id: int, db: Session = Depends(get_db)):
     """Récupérer un véhicule par ID"""
     vehicle = db.query(Vehicle).filter(Vehicle.id == vehicle_id).first()
     if not vehicle:
@@ -56,7 +64,7 @@ async def get_vehicle(vehicle_id: int, db: Session = Depends(get_db)):
     return vehicle
 
 @router.put("/{vehicle_id}", response_model=VehicleSchema)
-async def update_vehicle(
+def update_vehicle(
     vehicle_id: int,
     vehicle_update: VehicleUpdate,
     db: Session = Depends(get_db)
@@ -76,20 +84,21 @@ async def update_vehicle(
     return vehicle
 
 @router.delete("/{vehicle_id}")
-async def delete_vehicle(vehicle_id: int, db: Session = Depends(get_db)):
+def delete_vehicle(vehicle_id: int, db: Session = Depends(get_db)):
     """Supprimer un véhicule"""
     vehicle = db.query(Vehicle).filter(Vehicle.id == vehicle_id).first()
     if not vehicle:
         raise HTTPException(status_code=404, detail="Véhicule non trouvé")
     
     db.delete(vehicle)
+    detach_vehicle(db, vehicle_id)  # ses entretiens et ravitaillements perdent aussi leur véhicule
     db.commit()
     return {"message": "Véhicule supprimé avec succès"}
 
 # === GESTION DE LA MAINTENANCE ===
 
 @router.post("/{vehicle_id}/maintenance", response_model=MaintenanceRecordSchema)
-async def create_maintenance_record(
+def create_maintenance_record(
     vehicle_id: int,
     maintenance: MaintenanceRecordCreate,
     db: Session = Depends(get_db)
@@ -105,6 +114,7 @@ async def create_maintenance_record(
     maintenance_data["vehicle_id"] = vehicle_id
     db_maintenance = MaintenanceRecord(**maintenance_data)
     db.add(db_maintenance)
+    record_maintenance(db, db_maintenance)
     
     # Mettre à jour le kilométrage du véhicule si fourni
     if maintenance.mileage_at_service and maintenance.mileage_at_service > vehicle.current_mileage:
@@ -115,10 +125,13 @@ async def create_maintenance_record(
     return db_maintenance
 
 @router.get("/{vehicle_id}/maintenance", response_model=List[MaintenanceRecordSchema])
-async def get_vehicle_maintenance(
+@query_budget(2)
+def get_vehicle_maintenance(
     vehicle_id: int,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """Récupérer l'historique de maintenance d'un véhicule"""
@@ -126,14 +139,12 @@ async def get_vehicle_maintenance(
     if not vehicle:
         raise HTTPException(status_code=404, detail="Véhicule non trouvé")
     
-    maintenance_records = db.query(MaintenanceRecord).filter(
-        MaintenanceRecord.vehicle_id == vehicle_id
-    ).order_by(MaintenanceRecord.service_date.desc()).offset(skip).limit(limit).all()
-    
-    return maintenance_records
+    query = db.query(MaintenanceRecord).filter(MaintenanceRecord.vehicle_id == vehicle_id)
+    return paginate(query, MaintenanceRecord.service_date, MaintenanceRecord.id, limit, cursor, skip, response)
 
 @router.get("/maintenance/upcoming")
-async def get_upcoming_maintenance(
+@query_budget(1)
+def get_upcoming_maintenance(
     days_ahead: int = Query(30, ge=1, le=365),
     db: Session = Depends(get_db)
 ):
@@ -154,7 +165,7 @@ async def get_upcoming_maintenance(
 # === GESTION DU CARBURANT ===
 
 @router.post("/{vehicle_id}/fuel", response_model=FuelRecordSchema)
-async def create_fuel_record(
+def create_fuel_record(
     vehicle_id: int,
     fuel_record: FuelRecordCreate,
     db: Session = Depends(get_db)
@@ -170,6 +181,7 @@ async def create_fuel_record(
     fuel_data["vehicle_id"] = vehicle_id
     db_fuel = FuelRecord(**fuel_data)
     db.add(db_fuel)
+    record_fuel(db, db_fuel)
     
     # Mettre à jour le kilométrage du véhicule si fourni
     if fuel_record.mileage_after and fuel_record.mileage_after > vehicle.current_mileage:
@@ -180,10 +192,13 @@ async def create_fuel_record(
     return db_fuel
 
 @router.get("/{vehicle_id}/fuel", response_model=List[FuelRecordSchema])
-async def get_vehicle_fuel_records(
+@query_budget(2)
+def get_vehicle_fuel_records(
     vehicle_id: int,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     db: Session = Depends(get_db)
@@ -200,11 +215,11 @@ async def get_vehicle_fuel_records(
     if end_date:
         query = query.filter(FuelRecord.refuel_date <= end_date)
     
-    fuel_records = query.order_by(FuelRecord.refuel_date.desc()).offset(skip).limit(limit).all()
-    return fuel_records
+    return paginate(query, FuelRecord.refuel_date, FuelRecord.id, limit, cursor, skip, response)
 
 @router.get("/{vehicle_id}/fuel/stats")
-async def get_vehicle_fuel_stats(
+@query_budget(2)
+def get_vehicle_fuel_stats(
     vehicle_id: int,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
@@ -260,11 +275,12 @@ async def get_vehicle_fuel_stats(
 # === RAPPORTS ET STATISTIQUES ===
 
 @router.get("/stats/summary")
-async def get_vehicles_summary(db: Session = Depends(get_db)):
+@query_budget(5)
+def get_vehicles_summary(db: Session = Depends(get_db)):
     """Résumé des véhicules et de leurs coûts"""
-    vehicles = db.query(Vehicle).all()
+    total_vehicles = db.query(func.count(Vehicle.id)).scalar()
     
-    if not vehicles:
+    if not total_vehicles:
         return {
             "total_vehicles": 0,
             "active_vehicles": 0,
@@ -273,33 +289,24 @@ async def get_vehicles_summary(db: Session = Depends(get_db)):
             "brands": {}
         }
     
-    active_vehicles = len([v for v in vehicles if v.status == VehicleStatus.ACTIVE])
+    active_vehicles = db.query(func.count(Vehicle.id)).filter(Vehicle.status == VehicleStatus.ACTIVE).scalar()
     
     # Coûts de maintenance
-    maintenance_cost = db.query(MaintenanceRecord).with_entities(
-        db.func.sum(MaintenanceRecord.cost)
-    ).scalar() or 0.0
+    maintenance_cost = db.query(func.sum(MaintenanceRecord.cost)).scalar() or 0.0
     
     # Coûts de carburant
-    fuel_cost = db.query(FuelRecord).with_entities(
-        db.func.sum(FuelRecord.total_cost)
-    ).scalar() or 0.0
+    fuel_cost = db.query(func.sum(FuelRecord.total_cost)).scalar() or 0.0
     
     # Statistiques par marque
     brands = {}
-    for vehicle in vehicles:
-        brand = vehicle.brand
+    for brand, model, count in db.query(Vehicle.brand, Vehicle.model, func.count(Vehicle.id)).group_by(Vehicle.brand, Vehicle.model):
         if brand not in brands:
-            brands[brand] = {"count": 0, "models": set()}
-        brands[brand]["count"] += 1
-        brands[brand]["models"].add(vehicle.model)
-    
-    # Convertir les sets en listes pour la sérialisation JSON
-    for brand in brands:
-        brands[brand]["models"] = list(brands[brand]["models"])
+            brands[brand] = {"count": 0, "models": []}
+        brands[brand]["count"] += count
+        brands[brand]["models"].append(model)
     
     return {
-        "total_vehicles": len(vehicles),
+        "total_vehicles": total_vehicles,
         "active_vehicles": active_vehicles,
         "total_maintenance_cost": maintenance_cost,
         "total_fuel_cost": fuel_cost,
@@ -308,7 +315,9 @@ async def get_vehicles_summary(db: Session = Depends(get_db)):
     }
 
 @router.get("/{vehicle_id}/history")
-async def get_vehicle_complete_history(
+@fast_json
+@query_budget(3)
+def get_vehicle_complete_history(
     vehicle_id: int,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
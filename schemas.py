@@ -1,7 +1,8 @@
-from pydantic import BaseModel, Field, EmailStr
-from typing import Optional, List
+from pydantic import BaseModel, Field, EmailStr, field_validator
+from typing import Optional, List, Any, Dict
 from datetime import datetime
-from models import PurchasePeriod, PurchaseCategory, VehicleStatus, UserRole
+from blobstore import signature_data, signature_url
+from models import PurchasePeriod, PurchaseCategory, VehicleStatus, UserRole, BatchMode, ImportEntity, JobKind, JobStatus, SearchEntity, LedgerEntryKind
 
 # Schémas pour les achats
 class PurchaseBase(BaseModel):
@@ -38,6 +39,27 @@ class Purchase(PurchaseBase):
     class Config:
         from_attributes = True
 
+# Schémas pour les factures fournisseur (achats en lot)
+class PurchaseInvoiceLine(BaseModel):
+    item_name: str = Field(..., description="Nom de l'article acheté")
+    description: Optional[str] = Field(None, description="Description détaillée")
+    category: PurchaseCategory = Field(..., description="Catégorie de l'achat")
+    period: PurchasePeriod = Field(..., description="Période de l'achat")
+    quantity: int = Field(1, gt=0, description="Quantité achetée")
+    unit_price: float = Field(..., gt=0, description="Prix unitaire")
+    amount: Optional[float] = Field(None, gt=0, description="Montant de la ligne (quantité x prix unitaire par défaut)")
+
+class PurchaseInvoice(BaseModel):
+    supplier: str = Field(..., description="Fournisseur")
+    purchase_date: datetime = Field(default_factory=datetime.utcnow)
+    lines: List[PurchaseInvoiceLine] = Field(..., min_length=1, description="Lignes de la facture (1000 au maximum)")
+
+class PurchaseInvoiceResult(BaseModel):
+    supplier: str
+    purchase_date: datetime
+    total_amount: float
+    purchases: List[Purchase]
+
 # Schémas pour le stock
 class StockItemBase(BaseModel):
     name: str = Field(..., description="Nom de l'article")
@@ -445,6 +467,20 @@ class PurchaseRequest(PurchaseRequestBase):
     receipt_notes: Optional[str] = None
     created_at: datetime
     updated_at: datetime
+    # URL signée de l'image, utilisable dans <img src> (lue dans la même colonne)
+    dg_signature_url: Optional[str] = Field(None, validation_alias="dg_signature")
+    receipt_signature_url: Optional[str] = Field(None, validation_alias="receipt_signature")
+
+    # Les signatures sont stockées hors de la base : l'image est relue dans le stockage
+    @field_validator("dg_signature", "receipt_signature", mode="before")
+    @classmethod
+    def _signature_data(cls, value):
+        return signature_data(value)
+
+    @field_validator("dg_signature_url", "receipt_signature_url", mode="before")
+    @classmethod
+    def _signature_urls(cls, value):
+        return signature_url(value)
     
     class Config:
         from_attributes = True
@@ -504,3 +540,85 @@ class StockMovement(StockMovementBase):
     
     class Config:
         from_attributes = True
+
+# Schémas pour les mouvements de stock en lot
+class StockMovementBatch(BaseModel):
+    movements: List[StockMovementCreate] = Field(..., description="Lignes du lot (1000 au maximum)")
+    mode: BatchMode = Field(BatchMode.ALL_OR_NOTHING, description="all_or_nothing ou best_effort")
+
+class StockMovementBatchLine(BaseModel):
+    index: int  # Position de la ligne dans le lot
+    stock_item_id: int
+    status: str  # applied, rejected
+    movement_id: Optional[int] = None
+    error: Optional[str] = None
+
+class StockMovementBatchResult(BaseModel):
+    mode: BatchMode
+    applied: int
+    rejected: int
+    results: List[StockMovementBatchLine]
+
+# Schémas pour l'import CSV
+class ImportRowError(BaseModel):
+    line: int  # Numéro de ligne dans le fichier (l'en-tête est la ligne 1)
+    error: str
+
+class ImportResult(BaseModel):
+    entity: ImportEntity
+    total_rows: int
+    imported: int
+    rejected: int
+    errors: List[ImportRowError]  # limitées aux premières erreurs
+    errors_truncated: bool = False
+
+# Schémas pour les tâches en arrière-plan
+class JobCreate(BaseModel):
+    kind: JobKind
+    params: Dict[str, Any] = Field(default_factory=dict, description="Paramètres de la tâche (ex. request_id, report)")
+
+class Job(BaseModel):
+    id: int
+    kind: JobKind
+    status: JobStatus
+    params: Dict[str, Any]
+    error: Optional[str] = None
+    result_filename: Optional[str] = None
+    result_size: Optional[int] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+# Schémas pour la recherche plein texte
+class SearchResult(BaseModel):
+    entity: SearchEntity
+    id: int
+    title: str = Field(..., description="Nom (numéro d'immatriculation pour un véhicule)")
+    detail: Optional[str] = Field(None, description="Catégorie, ville, type de service, marque et modèle ou code")
+    score: float = Field(..., description="Pertinence (plus élevé = plus pertinent)")
+
+# Schémas pour les suggestions au fil de la frappe
+class Suggestion(BaseModel):
+    id: int
+    label: str = Field(..., description="Nom (numéro d'immatriculation pour un véhicule)")
+
+# Schémas pour le registre des stocks
+class StockLedgerEntry(BaseModel):
+    id: int
+    stock_item_id: int
+    delta: int = Field(..., description="Variation signée de la quantité")
+    kind: LedgerEntryKind
+    movement_id: Optional[int] = None
+    reason: Optional[str] = None
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+class StockQuantityAsOf(BaseModel):
+    stock_item_id: int
+    as_of: datetime
+    quantity: int
@@ -0,0 +1,274 @@
+"""
+Recherche plein texte : articles, fournisseurs, prestataires, véhicules et services
+
+Une seule table search_index couvre les cinq tables, tenue à jour par des
+triggers (INSERT, UPDATE, DELETE) : les écritures de l'ORM, les imports CSV
+et les requêtes SQL directes sont indexés de la même façon.
+
+- SQLite : table virtuelle FTS5, tokenizer unicode61 sans diacritiques
+  (« electricite » trouve « Électricité »), index de préfixes pour la saisie
+  au fil de la frappe, classement bm25 (le titre pèse plus que le reste).
+- PostgreSQL : colonne tsvector (configuration simple) avec index GIN,
+  classement ts_rank. Les accents sont retirés par la fonction SQL
+  search_fold (translate), sans dépendre de l'extension unaccent.
+
+L'identifiant d'une ligne de l'index encode l'entité et son id
+(id * 8 + code de l'entité) : les triggers mettent à jour ou suppriment une
+ligne par sa clé, sans parcourir l'index.
+
+ensure_search_index() (au démarrage) crée la table et les triggers, et
+reconstruit l'index s'il ne correspond plus aux tables (base existante,
+colonnes indexées modifiées).
+"""
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from typing import List, Optional
+import re
+import unicodedata
+
+from database import IS_SQLITE
+from models import SearchEntity
+
+SEARCH_TABLE = "search_index"
+MAX_TERMS = 8  # mots pris en compte dans une recherche
+_CODE_FACTOR = 8  # id dans l'index = id * 8 + code de l'entité
+
+# Colonnes indexées par entité ; {row} est remplacé par NEW. (triggers) ou le nom de la table (reconstruction)
+ENTITIES = {
+    SearchEntity.STOCK_ITEM: {
+        "code": 1, "table": "stock_items", "title": "{row}name",
+        "body": ["description", "location", "category"], "detail": "{row}category",
+        "active": "COALESCE({row}is_active, TRUE)",
+    },
+    SearchEntity.SUPPLIER: {
+        "code": 2, "table": "suppliers", "title": "{row}name",
+        "body": ["contact_person", "email", "address", "city", "notes"], "detail": "{row}city",
+        "active": "COALESCE({row}is_active, TRUE)",
+    },
+    SearchEntity.SERVICE_PROVIDER: {
+        "code": 3, "table": "service_providers", "title": "{row}name",
+        "body": ["contact_person", "service_type", "specialization", "address", "city", "notes"], "detail": "{row}service_type",
+        "active": "COALESCE({row}is_active, TRUE)",
+    },
+    SearchEntity.VEHICLE: {
+        "code": 4, "table": "vehicles", "title": "{row}plate_number",
+        "body": ["brand", "model", "color"], "detail": "{row}brand || ' ' || {row}model",
+        "active": "COALESCE({row}status, 'active') <> 'out_of_service'",
+    },
+    SearchEntity.SERVICE: {
+        "code": 5, "table": "services", "title": "{row}name",
+        "body": ["code", "description", "department_head", "location"], "detail": "{row}code",
+        "active": "COALESCE({row}is_active, TRUE)",
+    },
+}
+_BY_CODE = {spec["code"]: entity for entity, spec in ENTITIES.items()}
+
+# Lettres accentuées du français (et voisines) ; œ et æ sont développés à part
+_ACCENTED = "àâäáãåçéèêëíìîïñóòôöõúùûüýÿ"
+_PLAIN = "aaaaaaceeeeiiiinooooouuuuyy"
+
+
+def fold(value: str) -> str:
+    """Minuscules sans accents (même règle que search_fold côté PostgreSQL)"""
+    if value.isascii():
+        return value.lower()
+    decomposed = unicodedata.normalize("NFKD", value.lower())
+    plain = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return plain.replace("œ", "oe").replace("æ", "ae")
+
+
+def _terms(query: str) -> List[str]:
+    return re.findall(r"[^\W_]+", fold(query))[:MAX_TERMS]
+
+
+def _values(spec: dict, row: str) -> dict:
+    """Expressions SQL des valeurs indexées d'une ligne"""
+    return {
+        "key": f"{row}id * {_CODE_FACTOR} + {spec['code']}",
+        "title": f"COALESCE({spec['title'].format(row=row)}, '')",
+        "body": " || ' ' || ".join(f"COALESCE({row}{column}, '')" for column in spec["body"]),
+        "detail": spec["detail"].format(row=row),
+        "active": spec["active"].format(row=row),
+    }
+
+
+# === SQLite (FTS5) ===
+
+def _sqlite_ddl() -> List[str]:
+    statements = [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+        "title, body, active, detail UNINDEXED, "
+        "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+    ]
+    for spec in ENTITIES.values():
+        table = spec["table"]
+        new, old = _values(spec, "NEW."), _values(spec, "OLD.")
+        insert = (
+            f"INSERT INTO {SEARCH_TABLE} (rowid, title, body, detail, active) "
+            f"VALUES ({new['key']}, {new['title']}, {new['body']}, {new['detail']}, {new['active']});"
+        )
+        delete = f"DELETE FROM {SEARCH_TABLE} WHERE rowid = {old['key']};"
+        triggers = {
+            "insert": f"AFTER INSERT ON {table} BEGIN {insert} END",
+            "update": f"AFTER UPDATE ON {table} BEGIN {delete} {insert} END",
+            "delete": f"AFTER DELETE ON {table} BEGIN {delete} END",
+        }
+        for operation, body in triggers.items():
+            statements.append(f"DROP TRIGGER IF EXISTS {SEARCH_TABLE}_{table}_{operation}")
+            statements.append(f"CREATE TRIGGER {SEARCH_TABLE}_{table}_{operation} {body}")
+    return statements
+
+
+def _sqlite_fill(spec: dict) -> str:
+    values = _values(spec, f"{spec['table']}.")
+    return (
+        f"INSERT INTO {SEARCH_TABLE} (rowid, title, body, detail, active) "
+        f"SELECT {values['key']}, {values['title']}, {values['body']}, {values['detail']}, {values['active']} "
+        f"FROM {spec['table']}"
+    )
+
+
+def _sqlite_search(terms: List[str], include_inactive: bool, codes: Optional[str]) -> str:
+    # Chaque mot est un préfixe ("mot"*), tous les mots doivent être présents. La colonne
+    # active est indexée pour filtrer dans l'index même ; titre et détail ne sont lus
+    # que pour les lignes retenues.
+    condition = f"{SEARCH_TABLE} MATCH :match"
+    if codes:
+        condition += f" AND rowid % {_CODE_FACTOR} IN ({codes})"
+    return (
+        f"SELECT top.key, {SEARCH_TABLE}.title, {SEARCH_TABLE}.detail, top.score FROM ("
+        f"SELECT rowid AS key, bm25({SEARCH_TABLE}, 10.0, 1.0, 0.0) AS score FROM {SEARCH_TABLE} "
+        f"WHERE {condition} ORDER BY score LIMIT :limit"
+        f") AS top JOIN {SEARCH_TABLE} ON {SEARCH_TABLE}.rowid = top.key ORDER BY top.score"
+    )
+
+
+def _sqlite_match(terms: List[str], include_inactive: bool) -> str:
+    match = " ".join(f'"{term}"*' for term in terms)
+    return match if include_inactive else f"({match}) NOT active : 0"
+
+
+# === PostgreSQL (tsvector) ===
+
+def _postgres_document(values: dict) -> str:
+    return (
+        f"setweight(to_tsvector('simple', search_fold({values['title']})), 'A') || "
+        f"setweight(to_tsvector('simple', search_fold({values['body']})), 'B')"
+    )
+
+
+def _postgres_ddl() -> List[str]:
+    statements = [
+        f"CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ("
+        "id BIGINT PRIMARY KEY, title TEXT NOT NULL, detail TEXT, active BOOLEAN NOT NULL, document TSVECTOR NOT NULL)",
+        # fastupdate = off : sans liste d'attente GIN, parcourue à chaque recherche tant qu'un VACUUM ne l'a pas vidée
+        f"CREATE INDEX IF NOT EXISTS ix_{SEARCH_TABLE}_document ON {SEARCH_TABLE} USING GIN (document) WITH (fastupdate = off)",
+        f"ALTER INDEX ix_{SEARCH_TABLE}_document SET (fastupdate = off)",
+        "CREATE OR REPLACE FUNCTION search_fold(value TEXT) RETURNS TEXT LANGUAGE sql IMMUTABLE AS $$ "
+        f"SELECT replace(replace(translate(lower(value), '{_ACCENTED}', '{_PLAIN}'), 'œ', 'oe'), 'æ', 'ae') $$",
+    ]
+    for spec in ENTITIES.values():
+        table = spec["table"]
+        new, old = _values(spec, "NEW."), _values(spec, "OLD.")
+        statements.append(
+            f"CREATE OR REPLACE FUNCTION {SEARCH_TABLE}_{table}() RETURNS trigger LANGUAGE plpgsql AS $$ BEGIN "
+            f"IF TG_OP = 'DELETE' THEN DELETE FROM {SEARCH_TABLE} WHERE id = {old['key']}; RETURN OLD; END IF; "
+            f"IF TG_OP = 'UPDATE' AND OLD.id <> NEW.id THEN DELETE FROM {SEARCH_TABLE} WHERE id = {old['key']}; END IF; "
+            f"INSERT INTO {SEARCH_TABLE} (id, title, detail, active, document) "
+            f"VALUES ({new['key']}, {new['title']}, {new['detail']}, {new['active']}, {_postgres_document(new)}) "
+            "ON CONFLICT (id) DO UPDATE SET title = EXCLUDED.title, detail = EXCLUDED.detail, "
+            "active = EXCLUDED.active, document = EXCLUDED.document; "
+            "RETURN NEW; END $$"
+        )
+        statements.append(f"DROP TRIGGER IF EXISTS {SEARCH_TABLE}_{table} ON {table}")
+        statements.append(
+            f"CREATE TRIGGER {SEARCH_TABLE}_{table} AFTER INSERT OR UPDATE OR DELETE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION {SEARCH_TABLE}_{table}()"
+        )
+    return statements
+
+
+def _postgres_fill(spec: dict) -> str:
+    values = _values(spec, f"{spec['table']}.")
+    return (
+        f"INSERT INTO {SEARCH_TABLE} (id, title, detail, active, document) "
+        f"SELECT {values['key']}, {values['title']}, {values['detail']}, {values['active']}, {_postgres_document(values)} "
+        f"FROM {spec['table']}"
+    )
+
+
+def _postgres_search(terms: List[str], include_inactive: bool, codes: Optional[str]) -> str:
+    condition = "document @@ query"
+    if not include_inactive:
+        condition += " AND active"
+    if codes:
+        condition += f" AND id % {_CODE_FACTOR} IN ({codes})"
+    return (
+        f"SELECT id AS key, title, detail, ts_rank(document, query) AS score "
+        f"FROM {SEARCH_TABLE}, to_tsquery('simple', :match) AS query WHERE {condition} "
+        "ORDER BY score DESC LIMIT :limit"
+    )
+
+
+def _postgres_match(terms: List[str], include_inactive: bool) -> str:
+    # Tous les mots, chacun comme préfixe (mot:*)
+    return " & ".join(f"{term}:*" for term in terms)
+
+
+# === Création, reconstruction et recherche ===
+
+def rebuild_search_index(db: Session):
+    """Réindexer toutes les lignes des tables couvertes"""
+    fill = _sqlite_fill if IS_SQLITE else _postgres_fill
+    db.execute(text(f"DELETE FROM {SEARCH_TABLE}"))
+    for spec in ENTITIES.values():
+        db.execute(text(fill(spec)))
+    if IS_SQLITE:
+        # Fusionner les segments créés par le remplissage : recherches et écritures suivantes plus rapides
+        db.execute(text(f"INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}) VALUES ('optimize')"))
+    else:
+        db.execute(text(f"ANALYZE {SEARCH_TABLE}"))
+    db.commit()
+
+
+def ensure_search_index(db: Session):
+    """Créer l'index et ses triggers, et le reconstruire s'il ne correspond plus aux tables"""
+    for statement in _sqlite_ddl() if IS_SQLITE else _postgres_ddl():
+        db.execute(text(statement))
+    db.commit()
+
+    indexed = db.execute(text(f"SELECT COUNT(*) FROM {SEARCH_TABLE}")).scalar()
+    expected = sum(db.execute(text(f"SELECT COUNT(*) FROM {spec['table']}")).scalar() for spec in ENTITIES.values())
+    if indexed != expected:
+        rebuild_search_index(db)
+
+
+def search(
+    db: Session,
+    query: str,
+    entities: Optional[List[SearchEntity]] = None,
+    include_inactive: bool = False,
+    limit: int = 20
+) -> List[dict]:
+    """Résultats classés du plus au moins pertinent : entité, id, titre, détail et score"""
+    terms = _terms(query)
+    if not terms:
+        return []
+
+    codes = ", ".join(str(ENTITIES[entity]["code"]) for entity in entities) if entities else None
+    if IS_SQLITE:
+        statement, match = _sqlite_search(terms, include_inactive, codes), _sqlite_match(terms, include_inactive)
+    else:
+        statement, match = _postgres_search(terms, include_inactive, codes), _postgres_match(terms, include_inactive)
+
+    results = []
+    # .columns() : requête déclarée comme SELECT (pool de lecture du profil SQLite production)
+    for key, title, detail, score in db.execute(text(statement).columns(), {"match": match, "limit": limit}):
+        results.append({
+            "entity": _BY_CODE[key % _CODE_FACTOR],
+            "id": key // _CODE_FACTOR,
+            "title": title,
+            "detail": detail,
+            "score": abs(float(score)),
+        })
+    return results
@@ -0,0 +1,98 @@
+"""
+Profil de production SQLite (activé avec SQLITE_PROFILE=production)
+
+- Pragmas appliqués à chaque connexion : journal WAL, synchronous=NORMAL,
+  busy_timeout, mmap et cache de pages.
+- Un seul écrivain par processus : les écritures passent par un moteur dont
+  le pool ne contient qu'une connexion. Les sessions qui veulent écrire font
+  la queue sur ce pool (pendant DB_POOL_TIMEOUT secondes au plus) au lieu de
+  se disputer le verrou du fichier.
+- Les lectures passent par un pool de connexions en lecture seule qui, grâce
+  au WAL, ne bloquent pas l'écrivain et ne sont pas bloquées par lui.
+
+Entre plusieurs workers, les écrivains de chaque processus restent en
+concurrence sur le verrou du fichier : busy_timeout les fait attendre au
+lieu d'échouer avec "database is locked".
+"""
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.selectable import TextualSelect
+import os
+
+BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT", "5000"))
+MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", str(64 * 1024)))
+READ_POOL_SIZE = int(os.getenv("SQLITE_READ_POOL_SIZE", "8"))
+
+
+def is_enabled(database_url: str) -> bool:
+    return database_url.startswith("sqlite") and os.getenv("SQLITE_PROFILE", "default") == "production"
+
+
+def read_only_url(database_url: str) -> str:
+    """URL SQLite en lecture seule (mode=ro) pour le même fichier"""
+    url = make_url(database_url)
+    return f"sqlite:///file:{url.database}?mode=ro&uri=true"
+
+
+def writer_options() -> dict:
+    return {
+        "connect_args": {"check_same_thread": False},
+        "pool_size": 1,
+        "max_overflow": 0,
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+    }
+
+
+def reader_options() -> dict:
+    return {
+        "connect_args": {"check_same_thread": False},
+        "pool_size": READ_POOL_SIZE,
+        "max_overflow": READ_POOL_SIZE,
+    }
+
+
+def install_pragmas(engine, writer: bool):
+    """Appliquer les pragmas à chaque nouvelle connexion du moteur"""
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        if writer:
+            cursor.execute("PRAGMA journal_mode=WAL")  # persistant dans le fichier
+            cursor.execute("PRAGMA synchronous=NORMAL")
+        else:
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        cursor.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+        cursor.execute(f"PRAGMA cache_size=-{CACHE_SIZE_KB}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+
+class RoutingSession(Session):
+    """Session qui envoie les SELECT au pool de lecture et le reste à l'écrivain
+
+    Dès qu'une transaction a écrit, toutes ses requêtes suivantes passent par
+    l'écrivain pour lire ses propres écritures non encore validées. Une
+    requête SQL textuelle est envoyée au pool de lecture si elle est
+    déclarée comme SELECT (text(...).columns()).
+    """
+
+    def __init__(self, *args, writer=None, reader=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.writer = writer
+        self.reader = reader
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.info.get("uses_writer") or self._flushing or not isinstance(clause, (Select, TextualSelect)):
+            self.info["uses_writer"] = True
+            return self.writer
+        return self.reader
+
+
+@event.listens_for(RoutingSession, "after_commit")
+@event.listens_for(RoutingSession, "after_rollback")
+def _release_writer(session):
+    session.info.pop("uses_writer", None)
@@ -0,0 +1,196 @@
+// Numéro de la demande, lu dans l'URL /approval/{request_id}
+const requestId = parseInt(window.location.pathname.split('/').pop(), 10);
+document.getElementById('requestNumber').textContent = 'DEM-20240925-' + String(requestId).padStart(3, '0');
+
+// Attendre que le DOM soit chargé
+document.addEventListener('DOMContentLoaded', function() {
+    // Variable pour suivre si une signature a été faite
+    let hasSignature = false;
+    let isDrawing = false;
+
+    // Initialiser le canvas de signature
+    const canvas = document.getElementById('signaturePad');
+    if (!canvas) return;
+
+    const ctx = canvas.getContext('2d');
+
+    // Configuration du canvas
+    ctx.lineWidth = 2;
+    ctx.lineCap = 'round';
+    ctx.strokeStyle = '#333';
+
+    canvas.addEventListener('mousedown', startDrawing);
+    canvas.addEventListener('mousemove', draw);
+    canvas.addEventListener('mouseup', stopDrawing);
+    canvas.addEventListener('mouseout', stopDrawing);
+
+    function startDrawing(e) {
+        isDrawing = true;
+        hasSignature = true; // Marquer qu'une signature a été commencée
+        draw(e);
+    }
+
+    function draw(e) {
+        if (!isDrawing) return;
+
+        const rect = canvas.getBoundingClientRect();
+        const x = e.clientX - rect.left;
+        const y = e.clientY - rect.top;
+
+        ctx.lineTo(x, y);
+        ctx.stroke();
+        ctx.beginPath();
+        ctx.moveTo(x, y);
+    }
+
+    function stopDrawing() {
+        isDrawing = false;
+        ctx.beginPath();
+    }
+
+    function clearSignature() {
+        ctx.clearRect(0, 0, canvas.width, canvas.height);
+        hasSignature = false; // Réinitialiser le flag de signature
+    }
+
+    function approveRequest(id) {
+        const comment = document.getElementById('comment').value;
+
+        // Vérifier si une signature a été faite
+        if (!hasSignature) {
+            showModal('Erreur', 'Veuillez apposer votre signature avant de continuer.', 'error');
+            return;
+        }
+
+        showModal('Confirmation', 'Êtes-vous sûr de vouloir approuver cette demande d\'achat ?', 'confirm', function() {
+    showModal('Succès', 'Demande approuvée avec succès !<br><br><strong>Commentaire:</strong> ' + (comment || 'Aucun') + '<br><strong>Signature:</strong> Enregistrée', 'success');
+        // Mettre à jour le statut dans localStorage
+        updateRequestStatus(id, 'approved');
+        setTimeout(() => {
+            window.location.href = '/purchase-requests';
+        }, 2000);
+        });
+    }
+
+    function rejectRequest(id) {
+        const comment = document.getElementById('comment').value;
+
+        // Vérifier si une signature a été faite
+        if (!hasSignature) {
+            showModal('Erreur', 'Veuillez apposer votre signature avant de continuer.', 'error');
+            return;
+        }
+
+        showModal('Confirmation', 'Êtes-vous sûr de vouloir rejeter cette demande d\'achat ?', 'confirm', function() {
+    showModal('Information', 'Demande rejetée !<br><br><strong>Commentaire:</strong> ' + (comment || 'Aucun') + '<br><strong>Signature:</strong> Enregistrée', 'info');
+        // Mettre à jour le statut dans localStorage
+        updateRequestStatus(id, 'rejected');
+        setTimeout(() => {
+            window.location.href = '/purchase-requests';
+        }, 2000);
+        });
+    }
+
+    function goBack() {
+        window.location.href = '/purchase-requests';
+    }
+
+    // Fonction pour afficher les modales
+    function showModal(title, message, type, callback = null) {
+        const modal = document.createElement('div');
+        modal.className = 'modal';
+        modal.style.display = 'block';
+
+        let icon = '';
+        let buttonClass = 'modal-btn-primary';
+        let buttonText = 'OK';
+
+        switch(type) {
+            case 'success':
+                icon = '✅';
+                buttonClass = 'modal-btn-success';
+                break;
+            case 'error':
+                icon = '❌';
+                buttonClass = 'modal-btn-danger';
+                break;
+            case 'info':
+                icon = 'ℹ️';
+                buttonClass = 'modal-btn-primary';
+                break;
+            case 'confirm':
+                icon = '❓';
+                buttonClass = 'modal-btn-primary';
+                buttonText = 'Confirmer';
+                break;
+        }
+
+        modal.innerHTML = `
+            <div class="modal-content">
+                <span class="close" onclick="closeModal(this)">&times;</span>
+                <div class="modal-header">
+                    <div class="modal-icon">${icon}</div>
+                    <div class="modal-title">${title}</div>
+                </div>
+                <div class="modal-message">${message}</div>
+                <div class="modal-buttons">
+                    ${type === 'confirm' ? `
+                        <button class="modal-btn modal-btn-secondary" onclick="closeModal(this)">Annuler</button>
+                        <button class="modal-btn ${buttonClass}" onclick="confirmAction(this)">${buttonText}</button>
+                    ` : `
+                        <button class="modal-btn ${buttonClass}" onclick="closeModal(this)">${buttonText}</button>
+                    `}
+                </div>
+            </div>
+        `;
+
+        document.body.appendChild(modal);
+
+        // Stocker le callback pour la confirmation
+        if (callback && type === 'confirm') {
+            modal._callback = callback;
+        }
+
+        // Fermer en cliquant à l'extérieur
+        modal.onclick = function(event) {
+            if (event.target === modal) {
+                closeModal(modal);
+            }
+        };
+    }
+
+    function closeModal(element) {
+        const modal = element.closest('.modal');
+        modal.style.display = 'none';
+        document.body.removeChild(modal);
+    }
+
+    function confirmAction(element) {
+        const modal = element.closest('.modal');
+        if (modal._callback) {
+            modal._callback();
+        }
+        closeModal(modal);
+    }
+
+    // Fonction pour mettre à jour le statut des demandes
+    function updateRequestStatus(id, status) {
+        const requests = JSON.parse(localStorage.getItem('purchaseRequests') || '[]');
+        const requestIndex = requests.findIndex(req => req.id === id);
+        if (requestIndex !== -1) {
+            requests[requestIndex].status = status;
+            requests[requestIndex].updatedAt = new Date().toISOString();
+            localStorage.setItem('purchaseRequests', JSON.stringify(requests));
+        }
+    }
+
+    // Exposer les fonctions globalement
+    window.approveRequest = approveRequest;
+    window.rejectRequest = rejectRequest;
+    window.goBack = goBack;
+    window.clearSignature = clearSignature;
+    window.showModal = showModal;
+    window.closeModal = closeModal;
+    window.confirmAction = confirmAction;
+    window.updateRequestStatus = updateRequestStatus;
+});
@@ -0,0 +1,30 @@
+document.getElementById('loginForm').addEventListener('submit', async function(e) {
+    e.preventDefault();
+
+    const formData = new FormData(e.target);
+    const username = formData.get('username');
+    const password = formData.get('password');
+
+    try {
+        const response = await fetch('/api/auth/login', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/x-www-form-urlencoded',
+            },
+            body: `username=${encodeURIComponent(username)}&password=${encodeURIComponent(password)}`
+        });
+
+        if (response.ok) {
+            const data = await response.json();
+            alert('Connexion réussie ! Vous allez être redirigé vers le tableau de bord.');
+            window.location.href = '/dashboard';
+        } else if (response.status === 401) {
+            alert('Erreur d\'authentification: Nom d\'utilisateur ou mot de passe incorrect.');
+        } else {
+            const error = await response.json().catch(() => ({ detail: 'Erreur inconnue' }));
+            alert('Erreur: ' + error.detail);
+        }
+    } catch (error) {
+            alert('Erreur de connexion: ' + error.message);
+    }
+});
@@ -0,0 +1,210 @@
+document.getElementById('purchaseRequestForm').addEventListener('submit', function(e) {
+    e.preventDefault();
+
+    const formData = new FormData(e.target);
+    const data = Object.fromEntries(formData.entries());
+
+    // Validation
+    if (!data.service || !data.article || !data.quantity || !data.urgency || !data.justification) {
+        showModal('Erreur', 'Veuillez remplir tous les champs obligatoires marqués d\'un astérisque (*).', 'error');
+        return;
+    }
+
+    // Générer un numéro de demande
+    const requestNumber = 'DEM-' + new Date().toISOString().slice(0,10).replace(/-/g,'') + '-' + Math.floor(Math.random() * 1000).toString().padStart(3, '0');
+
+    // Afficher un résumé
+    const summary = `
+        <strong>Demande créée avec succès !</strong><br><br>
+        <strong>N° Demande:</strong> ${requestNumber}<br>
+        <strong>Service:</strong> ${data.service}<br>
+        <strong>Article:</strong> ${data.article}<br>
+        <strong>Quantité:</strong> ${data.quantity} ${data.unit}<br>
+        <strong>Urgence:</strong> ${data.urgency}<br>
+        <strong>Prix estimé:</strong> ${data.estimatedPrice ? data.estimatedPrice + ' GNF' : 'Non spécifié'}<br><br>
+        Votre demande a été soumise et sera traitée par le responsable des achats.
+    `;
+
+    showModal('Succès', summary, 'success');
+
+    // Rediriger vers la liste des demandes après 3 secondes
+    setTimeout(() => {
+        window.location.href = '/purchase-requests';
+    }, 3000);
+});
+
+function goBack() {
+    window.location.href = '/purchase-requests';
+}
+
+// Auto-remplir la date de livraison (7 jours par défaut)
+const deliveryDate = new Date();
+deliveryDate.setDate(deliveryDate.getDate() + 7);
+document.getElementById('deliveryDate').value = deliveryDate.toISOString().slice(0,10);
+
+// Suggestions au fil de la frappe (index en mémoire, GET /api/suggest)
+function attachSuggestions(input, entity) {
+    const list = document.createElement('datalist');
+    list.id = `${input.id}_suggestions`;
+    input.setAttribute('list', list.id);
+    input.setAttribute('autocomplete', 'off');
+    input.after(list);
+    let timer = null;
+    let controller = null;
+    input.addEventListener('input', () => {
+        clearTimeout(timer);
+        const q = input.value.trim();
+        if (!q) {
+            list.innerHTML = '';
+            return;
+        }
+        timer = setTimeout(async () => {
+            if (controller) controller.abort();
+            controller = new AbortController();
+            try {
+                const token = localStorage.getItem('access_token');
+                const params = new URLSearchParams({ entity, q, limit: 10 });
+                const response = await fetch(`/api/suggest?${params}`, {
+                    headers: { 'Authorization': `Bearer ${token}` },
+                    signal: controller.signal
+                });
+                if (!response.ok) return;
+                const suggestions = await response.json();
+                list.innerHTML = '';
+                suggestions.forEach(suggestion => {
+                    const option = document.createElement('option');
+                    option.value = suggestion.label;
+                    list.appendChild(option);
+                });
+            } catch (error) {
+                if (error.name !== 'AbortError') console.error('Erreur lors du chargement des suggestions:', error);
+            }
+        }, 120);
+    });
+}
+
+attachSuggestions(document.getElementById('article'), 'stock_item');
+attachSuggestions(document.getElementById('newSupplierName'), 'supplier');  // fournisseur déjà enregistré
+
+// Gestion de la création de nouveau service
+document.getElementById('service').addEventListener('change', function() {
+    const newServiceForm = document.getElementById('newServiceForm');
+    if (this.value === 'new') {
+        newServiceForm.style.display = 'block';
+    } else {
+        newServiceForm.style.display = 'none';
+    }
+});
+
+// Fournisseurs actifs (seuls les champs affichés sont demandés, paramètre fields)
+async function loadSuppliers() {
+    const select = document.getElementById('supplier');
+    try {
+        const token = localStorage.getItem('access_token');
+        const response = await fetch('/api/suppliers/?fields=id,name&limit=1000', {
+            headers: { 'Authorization': `Bearer ${token}` }
+        });
+        if (!response.ok) return;
+        const suppliers = await response.json();
+        select.querySelectorAll('option:not([value=""]):not([value="new"])').forEach(option => option.remove());
+        const newOption = select.querySelector('option[value="new"]');
+        suppliers.forEach(supplier => {
+            const option = document.createElement('option');
+            option.value = supplier.id;
+            option.textContent = supplier.name;
+            select.insertBefore(option, newOption);
+        });
+    } catch (error) {
+        console.error('Erreur lors du chargement des fournisseurs:', error);
+    }
+}
+
+loadSuppliers();
+
+// Gestion de la création de nouveau fournisseur
+document.getElementById('supplier').addEventListener('change', function() {
+    const newSupplierForm = document.getElementById('newSupplierForm');
+    if (this.value === 'new') {
+        newSupplierForm.style.display = 'block';
+    } else {
+        newSupplierForm.style.display = 'none';
+    }
+});
+
+// Fonction pour afficher les modales
+function showModal(title, message, type, callback = null) {
+    const modal = document.createElement('div');
+    modal.className = 'modal';
+    modal.style.display = 'block';
+
+    let icon = '';
+    let buttonClass = 'modal-btn-primary';
+    let buttonText = 'OK';
+
+    switch(type) {
+        case 'success':
+            icon = '✅';
+            buttonClass = 'modal-btn-success';
+            break;
+        case 'error':
+            icon = '❌';
+            buttonClass = 'modal-btn-danger';
+            break;
+        case 'info':
+            icon = 'ℹ️';
+            buttonClass = 'modal-btn-primary';
+            break;
+        case 'confirm':
+            icon = '❓';
+            buttonClass = 'modal-btn-primary';
+            buttonText = 'Confirmer';
+            break;
+    }
+
+    modal.innerHTML = `
+        <div class="modal-content">
+            <span class="close" onclick="closeModal(this)">&times;</span>
+            <div class="modal-header">
+                <div class="modal-icon">${icon}</div>
+                <div class="modal-title">${title}</div>
+            </div>
+            <div class="modal-message">${message}</div>
+            <div class="modal-buttons">
+                ${type === 'confirm' ? `
+                    <button class="modal-btn modal-btn-secondary" onclick="closeModal(this)">Annuler</button>
+                    <button class="modal-btn ${buttonClass}" onclick="confirmAction(this)">${buttonText}</button>
+                ` : `
+                    <button class="modal-btn ${buttonClass}" onclick="closeModal(this)">${buttonText}</button>
+                `}
+            </div>
+        </div>
+    `;
+
+    document.body.appendChild(modal);
+
+    // Stocker le callback pour la confirmation
+    if (callback && type === 'confirm') {
+        modal._callback = callback;
+    }
+
+    // Fermer en cliquant à l'extérieur
+    modal.onclick = function(event) {
+        if (event.target === modal) {
+            closeModal(modal);
+        }
+    };
+}
+
+function closeModal(element) {
+    const modal = element.closest('.modal');
+    modal.style.display = 'none';
+    document.body.removeChild(modal);
+}
+
+function confirmAction(element) {
+    const modal = element.closest('.modal');
+    if (modal._callback) {
+        modal._callback();
+    }
+    closeModal(modal);
+}
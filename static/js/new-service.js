@@ -0,0 +1,34 @@
+            document.getElementById('serviceForm').addEventListener('submit', function(e) {
+                e.preventDefault();
+
+                const formData = new FormData(e.target);
+                const data = Object.fromEntries(formData.entries());
+
+                // Validation
+                if (!data.name || !data.description || !data.responsible || !data.email || !data.status) {
+                    alert('Veuillez remplir tous les champs obligatoires');
+                    return;
+                }
+
+                // Afficher un résumé
+                const summary = `
+Service créé avec succès !
+
+Nom: ${data.name}
+Responsable: ${data.responsible}
+Email: ${data.email}
+Téléphone: ${data.phone || 'Non spécifié'}
+Statut: ${data.status}
+
+Le service a été ajouté à votre organisation.
+                `;
+
+                alert(summary);
+
+                // Rediriger vers la liste des services
+                window.location.href = '/services';
+            });
+
+            function goBack() {
+                window.location.href = '/services';
+            }
@@ -0,0 +1,35 @@
+            document.getElementById('supplierForm').addEventListener('submit', function(e) {
+                e.preventDefault();
+
+                const formData = new FormData(e.target);
+                const data = Object.fromEntries(formData.entries());
+
+                // Validation
+                if (!data.name || !data.contact || !data.email || !data.phone) {
+                    alert('Veuillez remplir tous les champs obligatoires');
+                    return;
+                }
+
+                // Afficher un résumé
+                const summary = `
+Fournisseur créé avec succès !
+
+Nom: ${data.name}
+Contact: ${data.contact}
+Email: ${data.email}
+Téléphone: ${data.phone}
+Conditions: ${data.paymentTerms || 'Non spécifiées'}
+Adresse: ${data.address || 'Non spécifiée'}
+
+Le fournisseur a été ajouté à votre base de données.
+                `;
+
+                alert(summary);
+
+                // Rediriger vers la liste des fournisseurs
+                window.location.href = '/suppliers';
+            });
+
+            function goBack() {
+                window.location.href = '/suppliers';
+            }
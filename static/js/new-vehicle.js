@@ -0,0 +1,149 @@
+// Attendre que le DOM soit chargé
+document.addEventListener('DOMContentLoaded', function() {
+    const form = document.getElementById('vehicleForm');
+    if (form) {
+        form.addEventListener('submit', function(e) {
+    e.preventDefault();
+
+    const formData = new FormData(e.target);
+    const data = Object.fromEntries(formData.entries());
+
+    // Validation
+    if (!data.plate || !data.year || !data.brand || !data.model || !data.fuelType || !data.status) {
+        showModal('Erreur', 'Veuillez remplir tous les champs obligatoires marqués d\'un astérisque (*).', 'error');
+        return;
+    }
+
+    // Afficher un résumé
+    const summary = `
+        <strong>Véhicule ajouté avec succès !</strong><br><br>
+        <strong>Plaque:</strong> ${data.plate}<br>
+        <strong>Marque/Modèle:</strong> ${data.brand} ${data.model}<br>
+        <strong>Année:</strong> ${data.year}<br>
+        <strong>Couleur:</strong> ${data.color || 'Non spécifiée'}<br>
+        <strong>Carburant:</strong> ${data.fuelType}<br>
+        <strong>Kilométrage:</strong> ${data.mileage || 'Non spécifié'} km<br>
+        <strong>Statut:</strong> ${data.status}<br><br>
+        Le véhicule a été ajouté à votre flotte.
+    `;
+
+    showModal('Succès', summary, 'success');
+
+    // Ajouter le véhicule à la table
+    addVehicleToTable(data);
+
+    // Rediriger vers la liste des véhicules après 2 secondes
+    setTimeout(() => {
+        window.location.href = '/vehicles';
+    }, 2000);
+        });
+    }
+});
+
+    function goBack() {
+        window.location.href = '/vehicles';
+    }
+
+    // Fonction pour ajouter un véhicule à la table
+    function addVehicleToTable(data) {
+        // Stocker le véhicule dans localStorage pour qu'il apparaisse dans la liste
+        const vehicles = JSON.parse(localStorage.getItem('vehicles') || '[]');
+        const newVehicle = {
+            id: Date.now(), // ID unique basé sur le timestamp
+            plate: data.plate,
+            brand: data.brand,
+            model: data.model,
+            year: data.year,
+            color: data.color || 'Non spécifiée',
+            mileage: data.mileage || 'Non spécifié',
+            fuelType: data.fuelType,
+            status: data.status
+        };
+        vehicles.push(newVehicle);
+        localStorage.setItem('vehicles', JSON.stringify(vehicles));
+    }
+
+    // Fonction pour afficher les modales
+    function showModal(title, message, type, callback = null) {
+        const modal = document.createElement('div');
+        modal.className = 'modal';
+        modal.style.display = 'block';
+
+        let icon = '';
+        let buttonClass = 'modal-btn-primary';
+        let buttonText = 'OK';
+
+        switch(type) {
+            case 'success':
+                icon = '✅';
+                buttonClass = 'modal-btn-success';
+                break;
+            case 'error':
+                icon = '❌';
+                buttonClass = 'modal-btn-danger';
+                break;
+            case 'info':
+                icon = 'ℹ️';
+                buttonClass = 'modal-btn-primary';
+                break;
+            case 'confirm':
+                icon = '❓';
+                buttonClass = 'modal-btn-primary';
+                buttonText = 'Confirmer';
+                break;
+        }
+
+        modal.innerHTML = `
+            <div class="modal-content">
+                <span class="close" onclick="closeModal(this)">&times;</span>
+                <div class="modal-header">
+                    <div class="modal-icon">${icon}</div>
+                    <div class="modal-title">${title}</div>
+                </div>
+                <div class="modal-message">${message}</div>
+                <div class="modal-buttons">
+                    ${type === 'confirm' ? `
+                        <button class="modal-btn modal-btn-secondary" onclick="closeModal(this)">Annuler</button>
+                        <button class="modal-btn ${buttonClass}" onclick="confirmAction(this)">${buttonText}</button>
+                    ` : `
+                        <button class="modal-btn ${buttonClass}" onclick="closeModal(this)">${buttonText}</button>
+                    `}
+                </div>
+            </div>
+        `;
+
+        document.body.appendChild(modal);
+
+        // Stocker le callback pour la confirmation
+        if (callback && type === 'confirm') {
+            modal._callback = callback;
+        }
+
+        // Fermer en cliquant à l'extérieur
+        modal.onclick = function(event) {
+            if (event.target === modal) {
+                closeModal(modal);
+            }
+        };
+    }
+
+    function closeModal(element) {
+        const modal = element.closest('.modal');
+        modal.style.display = 'none';
+        document.body.removeChild(modal);
+    }
+
+    function confirmAction(element) {
+        const modal = element.closest('.modal');
+        if (modal._callback) {
+            modal._callback();
+        }
+        closeModal(modal);
+    }
+
+    // Exposer les fonctions globalement
+    window.goBack = goBack;
+    window.addVehicleToTable = addVehicleToTable;
+    window.showModal = showModal;
+    window.closeModal = closeModal;
+    window.confirmAction = confirmAction;
@@ -0,0 +1,71 @@
+function showAddForm() {
+    window.location.href = '/new-purchase-request';
+}
+
+function refreshTable() {
+    location.reload();
+}
+
+function exportData() {
+    alert('Fonctionnalité d\'export à implémenter');
+}
+
+function filterTable(searchTerm) {
+    const table = document.getElementById('requestsTable');
+    const rows = table.getElementsByTagName('tr');
+
+    for (let i = 1; i < rows.length; i++) {
+        const row = rows[i];
+        const text = row.textContent.toLowerCase();
+        if (text.includes(searchTerm.toLowerCase())) {
+            row.style.display = '';
+        } else {
+            row.style.display = 'none';
+        }
+    }
+}
+
+function viewRequest(id) {
+    alert('Voir demande ID: ' + id);
+}
+
+function approveRequest(id) {
+    window.location.href = '/approval/' + id;
+}
+
+function rejectRequest(id) {
+    if (confirm('Rejeter cette demande d\'achat ?')) {
+        // Mettre à jour le statut dans localStorage
+        updateRequestStatus(id, 'rejected');
+        alert('Demande rejetée');
+        location.reload();
+    }
+}
+
+function markPurchased(id) {
+    if (confirm('Marquer cette demande comme achetée ?')) {
+        // Mettre à jour le statut dans localStorage
+        updateRequestStatus(id, 'purchased');
+        alert('Demande marquée comme achetée - Stock mis à jour automatiquement');
+        location.reload();
+    }
+}
+
+function markReceived(id) {
+    if (confirm('Marquer cette demande comme reçue ?')) {
+        // Mettre à jour le statut dans localStorage
+        updateRequestStatus(id, 'received');
+        alert('Demande marquée comme reçue - Signature et date de réception automatiques');
+        location.reload();
+    }
+}
+
+function updateRequestStatus(id, status) {
+    const requests = JSON.parse(localStorage.getItem('purchaseRequests') || '[]');
+    const requestIndex = requests.findIndex(req => req.id === id);
+    if (requestIndex !== -1) {
+        requests[requestIndex].status = status;
+        requests[requestIndex].updatedAt = new Date().toISOString();
+        localStorage.setItem('purchaseRequests', JSON.stringify(requests));
+    }
+}
@@ -0,0 +1,40 @@
+function showAddForm() {
+    alert('Fonctionnalité d\'ajout d\'achat à implémenter');
+}
+
+function refreshTable() {
+    location.reload();
+}
+
+function exportData() {
+    alert('Fonctionnalité d\'export à implémenter');
+}
+
+function filterTable(searchTerm) {
+    const table = document.getElementById('purchasesTable');
+    const rows = table.getElementsByTagName('tr');
+
+    for (let i = 1; i < rows.length; i++) {
+        const row = rows[i];
+        const text = row.textContent.toLowerCase();
+        if (text.includes(searchTerm.toLowerCase())) {
+            row.style.display = '';
+        } else {
+            row.style.display = 'none';
+        }
+    }
+}
+
+function viewPurchase(id) {
+    alert('Voir achat ID: ' + id);
+}
+
+function editPurchase(id) {
+    alert('Modifier achat ID: ' + id);
+}
+
+function deletePurchase(id) {
+    if (confirm('Êtes-vous sûr de vouloir supprimer cet achat ?')) {
+        alert('Supprimer achat ID: ' + id);
+    }
+}
@@ -0,0 +1,40 @@
+function showAddForm() {
+    alert('Fonctionnalité d\'ajout de rapport à implémenter');
+}
+
+function refreshTable() {
+    location.reload();
+}
+
+function exportData() {
+    alert('Fonctionnalité d\'export à implémenter');
+}
+
+function filterTable(searchTerm) {
+    const table = document.getElementById('reportsTable');
+    const rows = table.getElementsByTagName('tr');
+
+    for (let i = 1; i < rows.length; i++) {
+        const row = rows[i];
+        const text = row.textContent.toLowerCase();
+        if (text.includes(searchTerm.toLowerCase())) {
+            row.style.display = '';
+        } else {
+            row.style.display = 'none';
+        }
+    }
+}
+
+function viewReport(id) {
+    alert('Voir rapport ID: ' + id);
+}
+
+function editReport(id) {
+    alert('Modifier rapport ID: ' + id);
+}
+
+function deleteReport(id) {
+    if (confirm('Êtes-vous sûr de vouloir supprimer ce rapport ?')) {
+        alert('Supprimer rapport ID: ' + id);
+    }
+}
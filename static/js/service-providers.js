@@ -0,0 +1,40 @@
+function showAddForm() {
+    alert('Fonctionnalité d\'ajout de prestataire à implémenter');
+}
+
+function refreshTable() {
+    location.reload();
+}
+
+function exportData() {
+    alert('Fonctionnalité d\'export à implémenter');
+}
+
+function filterTable(searchTerm) {
+    const table = document.getElementById('providersTable');
+    const rows = table.getElementsByTagName('tr');
+
+    for (let i = 1; i < rows.length; i++) {
+        const row = rows[i];
+        const text = row.textContent.toLowerCase();
+        if (text.includes(searchTerm.toLowerCase())) {
+            row.style.display = '';
+        } else {
+            row.style.display = 'none';
+        }
+    }
+}
+
+function viewProvider(id) {
+    alert('Voir prestataire ID: ' + id);
+}
+
+function editProvider(id) {
+    alert('Modifier prestataire ID: ' + id);
+}
+
+function deleteProvider(id) {
+    if (confirm('Êtes-vous sûr de vouloir supprimer ce prestataire ?')) {
+        alert('Supprimer prestataire ID: ' + id);
+    }
+}
@@ -0,0 +1,40 @@
+function showAddForm() {
+    window.location.href = '/new-service';
+}
+
+function refreshTable() {
+    location.reload();
+}
+
+function exportData() {
+    alert('Fonctionnalité d\'export à implémenter');
+}
+
+function filterTable(searchTerm) {
+    const table = document.getElementById('servicesTable');
+    const rows = table.getElementsByTagName('tr');
+
+    for (let i = 1; i < rows.length; i++) {
+        const row = rows[i];
+        const text = row.textContent.toLowerCase();
+        if (text.includes(searchTerm.toLowerCase())) {
+            row.style.display = '';
+        } else {
+            row.style.display = 'none';
+        }
+    }
+}
+
+function viewService(id) {
+    alert('Voir service ID: ' + id);
+}
+
+function editService(id) {
+    alert('Modifier service ID: ' + id);
+}
+
+function deleteService(id) {
+    if (confirm('Êtes-vous sûr de vouloir supprimer ce service ?')) {
+        alert('Supprimer service ID: ' + id);
+    }
+}
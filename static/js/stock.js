@@ -0,0 +1,40 @@
+function showAddForm() {
+    alert('Fonctionnalité d\'ajout d\'article à implémenter');
+}
+
+function refreshTable() {
+    location.reload();
+}
+
+function exportData() {
+    alert('Fonctionnalité d\'export à implémenter');
+}
+
+function filterTable(searchTerm) {
+    const table = document.getElementById('stockTable');
+    const rows = table.getElementsByTagName('tr');
+
+    for (let i = 1; i < rows.length; i++) {
+        const row = rows[i];
+        const text = row.textContent.toLowerCase();
+        if (text.includes(searchTerm.toLowerCase())) {
+            row.style.display = '';
+        } else {
+            row.style.display = 'none';
+        }
+    }
+}
+
+function viewItem(id) {
+    alert('Voir article ID: ' + id);
+}
+
+function editItem(id) {
+    alert('Modifier article ID: ' + id);
+}
+
+function deleteItem(id) {
+    if (confirm('Êtes-vous sûr de vouloir supprimer cet article ?')) {
+        alert('Supprimer article ID: ' + id);
+    }
+}
@@ -0,0 +1,40 @@
+function showAddForm() {
+    window.location.href = '/new-supplier';
+}
+
+function refreshTable() {
+    location.reload();
+}
+
+function exportData() {
+    alert('Fonctionnalité d\'export à implémenter');
+}
+
+function filterTable(searchTerm) {
+    const table = document.getElementById('suppliersTable');
+    const rows = table.getElementsByTagName('tr');
+
+    for (let i = 1; i < rows.length; i++) {
+        const row = rows[i];
+        const text = row.textContent.toLowerCase();
+        if (text.includes(searchTerm.toLowerCase())) {
+            row.style.display = '';
+        } else {
+            row.style.display = 'none';
+        }
+    }
+}
+
+function viewSupplier(id) {
+    alert('Voir fournisseur ID: ' + id);
+}
+
+function editSupplier(id) {
+    alert('Modifier fournisseur ID: ' + id);
+}
+
+function deleteSupplier(id) {
+    if (confirm('Êtes-vous sûr de vouloir supprimer ce fournisseur ?')) {
+        alert('Supprimer fournisseur ID: ' + id);
+    }
+}
@@ -0,0 +1,81 @@
+function showAddForm() {
+    window.location.href = '/new-vehicle';
+}
+
+function refreshTable() {
+    location.reload();
+}
+
+function exportData() {
+    alert('Fonctionnalité d\'export à implémenter');
+}
+
+function filterTable(searchTerm) {
+    const table = document.getElementById('vehiclesTable');
+    const rows = table.getElementsByTagName('tr');
+
+    for (let i = 1; i < rows.length; i++) {
+        const row = rows[i];
+        const text = row.textContent.toLowerCase();
+        if (text.includes(searchTerm.toLowerCase())) {
+            row.style.display = '';
+        } else {
+            row.style.display = 'none';
+        }
+    }
+}
+
+function viewVehicle(id) {
+    alert('Voir véhicule ID: ' + id);
+}
+
+function editVehicle(id) {
+    alert('Modifier véhicule ID: ' + id);
+}
+
+function deleteVehicle(id) {
+    if (confirm('Êtes-vous sûr de vouloir supprimer ce véhicule ?')) {
+        alert('Supprimer véhicule ID: ' + id);
+    }
+}
+
+// Charger les véhicules depuis localStorage au chargement de la page
+document.addEventListener('DOMContentLoaded', function() {
+    loadVehiclesFromStorage();
+});
+
+function loadVehiclesFromStorage() {
+    const vehicles = JSON.parse(localStorage.getItem('vehicles') || '[]');
+    const tbody = document.querySelector('#vehiclesTable tbody');
+
+    // Vider le tbody avant d'ajouter les véhicules
+    tbody.innerHTML = '';
+
+    // Ajouter les véhicules stockés à la table
+    vehicles.forEach(vehicle => {
+        const row = document.createElement('tr');
+        const statusClass = vehicle.status === 'active' ? 'status-active' : 
+                          vehicle.status === 'maintenance' ? 'status-warning' : 'status-inactive';
+        const statusText = vehicle.status === 'active' ? 'Actif' : 
+                         vehicle.status === 'maintenance' ? 'En maintenance' : 'Inactif';
+
+        row.innerHTML = `
+            <td>${vehicle.plate}</td>
+            <td>${vehicle.brand}</td>
+            <td>${vehicle.model}</td>
+            <td>${vehicle.year}</td>
+            <td>${vehicle.color}</td>
+            <td>${vehicle.mileage} km</td>
+            <td>${vehicle.fuelType}</td>
+            <td><span class="status-badge ${statusClass}">${statusText}</span></td>
+            <td>
+                <div class="action-buttons">
+                    <button class="btn btn-primary btn-sm" onclick="viewVehicle(${vehicle.id})" title="Voir">👁️</button>
+                    <button class="btn btn-warning btn-sm" onclick="editVehicle(${vehicle.id})" title="Modifier">✏️</button>
+                    <button class="btn btn-danger btn-sm" onclick="deleteVehicle(${vehicle.id})" title="Supprimer">🗑️</button>
+                </div>
+            </td>
+        `;
+        tbody.appendChild(row);
+    });
+}
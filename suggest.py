@@ -0,0 +1,439 @@
+"""
+Suggestions au fil de la frappe : index de préfixes en mémoire
+
+GET /api/suggest?entity=stock_item&q=pap répond sans requête SQL : chaque
+worker garde en mémoire, par entité, un tableau trié de clés (libellés sans
+accents ni casse, voir search.fold) parcouru par dichotomie (bisect). Une
+recherche coûte O(log n) plus le nombre de suggestions lues.
+
+- Articles de stock et fournisseurs : nom ; véhicules : immatriculation,
+  aussi sans séparateurs (« rc0 » trouve « RC-0001-A »). Les éléments
+  désactivés et les véhicules hors service ne sont pas proposés.
+- Un libellé est trouvé par son début ou par le début de l'un de ses
+  SUGGEST_MAX_WORDS premiers mots (« a4 » trouve « Papier A4 »).
+
+Mémoire bornée : clés tronquées à KEY_LENGTH caractères, au plus
+SUGGEST_MAX_WORDS clés par libellé et SUGGEST_MAX_ENTRIES clés par entité
+(au-delà, seul le début des libellés est indexé).
+
+Mise à jour :
+- écritures de l'ORM : l'index est corrigé ligne par ligne à la validation
+  de la transaction (mêmes événements de session que cache.py) ;
+- INSERT/UPDATE en masse (entrées en stock, imports CSV) : les lignes
+  modifiées depuis la dernière synchronisation (updated_at) sont relues en
+  arrière-plan ;
+- autres workers : relecture des lignes modifiées au plus tard après
+  SUGGEST_REFRESH_SECONDS, et reconstruction complète (suppressions) après
+  SUGGEST_RELOAD_SECONDS.
+"""
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Iterable, List, Optional
+import logging
+import os
+import re
+import threading
+import time
+import unicodedata
+
+from models import StockItem, SuggestEntity, Supplier, Vehicle
+from search import fold
+
+logger = logging.getLogger(__name__)
+
+KEY_LENGTH = 32  # caractères conservés par clé
+MAX_WORDS = int(os.getenv("SUGGEST_MAX_WORDS", "4"))
+MAX_ENTRIES = int(os.getenv("SUGGEST_MAX_ENTRIES", "500000"))
+REFRESH_SECONDS = float(os.getenv("SUGGEST_REFRESH_SECONDS", "30"))
+RELOAD_SECONDS = float(os.getenv("SUGGEST_RELOAD_SECONDS", "900"))
+MAX_SCAN = 200  # clés lues au plus par recherche
+_SYNC_MARGIN = timedelta(seconds=2)  # transactions validées juste après la lecture précédente
+
+_WORD = re.compile(r"[^\W_]+")
+
+# Colonne du libellé et état « proposable » par entité
+ENTITIES = {
+    SuggestEntity.STOCK_ITEM: {
+        "model": StockItem, "label": "name", "state": "is_active",
+        "active": lambda value: value is not False, "compact": False,
+    },
+    SuggestEntity.SUPPLIER: {
+        "model": Supplier, "label": "name", "state": "is_active",
+        "active": lambda value: value is not False, "compact": False,
+    },
+    SuggestEntity.VEHICLE: {
+        "model": Vehicle, "label": "plate_number", "state": "status",
+        "active": lambda value: value != "out_of_service", "compact": True,
+    },
+}
+_BY_TABLE = {spec["model"].__tablename__: entity for entity, spec in ENTITIES.items()}
+_BY_MODEL = {spec["model"]: entity for entity, spec in ENTITIES.items()}
+
+
+@lru_cache(maxsize=65536)
+def _fold_word(word: str) -> str:
+    return fold(word)
+
+
+def _words(value: str) -> List[str]:
+    # Les libellés répètent peu de mots différents : chaque mot n'est plié qu'une fois
+    return [_fold_word(word) for word in _WORD.findall(unicodedata.normalize("NFC", value))]
+
+
+def normalize(value: str) -> str:
+    """Clé de comparaison : mots sans accents ni casse, séparés par une espace"""
+    return " ".join(_words(value))
+
+
+def label_keys(label: str, compact: bool = False, truncate: bool = True) -> tuple:
+    """Clés d'un libellé : (clés du début du libellé, clés des mots suivants)"""
+    words = _words(label)
+    if not words:
+        return (), ()
+    length = KEY_LENGTH if truncate else None
+    joined = " ".join(words)
+    primary = (joined[:length], "".join(words)[:length]) if compact and len(words) > 1 else (joined[:length],)
+    secondary, start = [], 0
+    for word in words[:MAX_WORDS - 1]:
+        start += len(word) + 1
+        if start >= len(joined):
+            break
+        secondary.append(joined[start:start + length] if length else joined[start:])
+    return primary, tuple(secondary)
+
+
+class PrefixIndex:
+    """Clés triées (liste) et références correspondantes (tableau parallèle)
+
+    Une référence vaut id * 2, plus 1 si la clé commence à un mot suivant
+    (le libellé ne commence pas par cette clé).
+    """
+
+    def __init__(self, compact: bool = False, max_entries: int = MAX_ENTRIES):
+        self.compact = compact
+        self.max_entries = max_entries
+        self.keys: List[str] = []
+        self.refs = array("q")
+        self.labels = {}  # id -> libellé
+
+    def build(self, rows: Iterable[tuple]):
+        """Construire l'index à partir de (id, libellé) en un seul tri"""
+        primary, secondary = [], []
+        for item_id, label in rows:
+            first, others = label_keys(label, self.compact)
+            if not first:
+                continue
+            self.labels[item_id] = label
+            primary.extend((key, item_id * 2) for key in first)
+            secondary.extend((key, item_id * 2 + 1) for key in others)
+        entries = primary + secondary[:max(0, self.max_entries - len(primary))]
+        entries.sort()
+        self.keys = [key for key, _ in entries]
+        self.refs = array("q", (ref for _, ref in entries))
+
+    def _insert(self, key: str, ref: int):
+        position = bisect_right(self.keys, key)
+        self.keys.insert(position, key)
+        self.refs.insert(position, ref)
+
+    def _delete(self, key: str, ref: int):
+        position = bisect_left(self.keys, key)
+        while position < len(self.keys) and self.keys[position] == key:
+            if self.refs[position] == ref:
+                del self.keys[position]
+                del self.refs[position]
+                return
+            position += 1
+
+    def remove(self, item_id: int):
+        label = self.labels.pop(item_id, None)
+        if label is None:
+            return
+        first, others = label_keys(label, self.compact)
+        for key in first:
+            self._delete(key, item_id * 2)
+        for key in others:
+            self._delete(key, item_id * 2 + 1)
+
+    def upsert(self, item_id: int, label: str):
+        if self.labels.get(item_id) == label:
+            return
+        self.remove(item_id)
+        first, others = label_keys(label, self.compact)
+        if not first:
+            return
+        self.labels[item_id] = label
+        for key in first:
+            self._insert(key, item_id * 2)
+        for key in others:
+            if len(self.keys) >= self.max_entries:
+                break
+            self._insert(key, item_id * 2 + 1)
+
+    def lookup(self, query: str, limit: int) -> List[dict]:
+        """Libellés dont le début ou le début d'un mot correspond à `query`
+
+        Les libellés qui commencent par `query` passent en premier, puis les
+        plus courts. Un même libellé n'est proposé qu'une fois.
+        """
+        wanted = normalize(query)
+        if not wanted:
+            return []
+        prefix = wanted[:KEY_LENGTH]
+        start = bisect_left(self.keys, prefix)
+        end = bisect_left(self.keys, prefix + "\U0010ffff", start, min(len(self.keys), start + MAX_SCAN))
+        labels = self.labels
+        candidates = {}
+        for ref in self.refs[start:end]:
+            item_id = ref >> 1
+            label = labels.get(item_id)
+            if label is None:
+                continue
+            secondary = ref & 1
+            if len(wanted) > KEY_LENGTH:
+                # Clé tronquée : comparer avec les clés complètes du libellé
+                first, others = label_keys(label, self.compact, truncate=False)
+                secondary = not any(key.startswith(wanted) for key in first)
+                if secondary and not any(key.startswith(wanted) for key in others):
+                    continue
+            rank = (secondary, len(label), label, item_id)
+            if item_id not in candidates or rank < candidates[item_id]:
+                candidates[item_id] = rank
+        results, seen = [], set()
+        for _, _, label, item_id in sorted(candidates.values()):
+            folded = label.lower()
+            if folded in seen:
+                continue
+            seen.add(folded)
+            results.append({"id": item_id, "label": label})
+            if len(results) >= limit:
+                break
+        return results
+
+
+class SuggestionIndex:
+    """Index de préfixes de chaque entité, tenu à jour par les écritures"""
+
+    def __init__(self, refresh_seconds: float = REFRESH_SECONDS, reload_seconds: float = RELOAD_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self.reload_seconds = reload_seconds
+        self._indexes = {entity: PrefixIndex(spec["compact"]) for entity, spec in ENTITIES.items()}
+        self._lock = threading.Lock()
+        self._session_factory = None
+        self._loaded_at = {}   # entité -> time.monotonic() de la dernière reconstruction
+        self._checked_at = {}  # entité -> time.monotonic() de la dernière relecture
+        self._synced_at = {}   # entité -> updated_at à partir duquel relire
+        self._pending = {}     # entité -> True pour une reconstruction, False pour une relecture
+        self._replay = None    # modifications validées pendant une lecture en arrière-plan
+        self._worker = None
+        self.lookups = 0
+        self.refreshes = 0
+        self.reloads = 0
+
+    # === Chargement ===
+
+    def _rows(self, db: Session, entity: SuggestEntity, since: Optional[datetime] = None) -> list:
+        spec = ENTITIES[entity]
+        model = spec["model"]
+        statement = select(model.id, getattr(model, spec["label"]), getattr(model, spec["state"]))
+        if since is not None:
+            statement = statement.where(model.updated_at >= since)
+        return db.execute(statement).all()
+
+    def load(self, db: Session, session_factory=None):
+        """Construire les index de toutes les entités (démarrage)"""
+        if session_factory is not None:
+            self._session_factory = session_factory
+        for entity in ENTITIES:
+            self._sync(db, entity, full=True)
+
+    def _sync(self, db: Session, entity: SuggestEntity, full: bool):
+        """Reconstruire l'index, ou relire les lignes modifiées depuis la dernière synchronisation"""
+        spec = ENTITIES[entity]
+        with self._lock:
+            self._replay = []
+        try:
+            started = datetime.utcnow()
+            rows = self._rows(db, entity, None if full else self._synced_at.get(entity))
+            if full:
+                index = PrefixIndex(spec["compact"])
+                index.build((item_id, label) for item_id, label, state in rows if spec["active"](state))
+            with self._lock:
+                if full:
+                    self._indexes[entity] = index
+                    self._loaded_at[entity] = time.monotonic()
+                    self.reloads += 1
+                else:
+                    for item_id, label, state in rows:
+                        self._apply(entity, item_id, label if spec["active"](state) else None, replay=False)
+                    self.refreshes += 1
+                # Écritures validées pendant la lecture : réappliquées par-dessus
+                for replayed_entity, item_id, label in self._replay:
+                    if replayed_entity == entity:
+                        self._apply(entity, item_id, label, replay=False)
+                self._checked_at[entity] = time.monotonic()
+                self._synced_at[entity] = started - _SYNC_MARGIN
+        finally:
+            with self._lock:
+                self._replay = None
+
+    def _apply(self, entity: SuggestEntity, item_id: int, label: Optional[str], replay: bool = True):
+        """Ajouter, renommer ou retirer (label None) un élément ; appelé sous le verrou"""
+        if label is None:
+            self._indexes[entity].remove(item_id)
+        else:
+            self._indexes[entity].upsert(item_id, label)
+        if replay and self._replay is not None:
+            self._replay.append((entity, item_id, label))
+
+    # === Mises à jour en arrière-plan ===
+
+    def _schedule(self, entities: Iterable[SuggestEntity], full: bool = False):
+        if self._session_factory is None:
+            return
+        with self._lock:
+            for entity in entities:
+                self._pending[entity] = full or self._pending.get(entity, False)
+            if self._worker is not None and self._worker.is_alive():
+                return
+            self._worker = threading.Thread(target=self._run_pending, name="suggest-refresh", daemon=True)
+            self._worker.start()
+
+    def _run_pending(self):
+        while True:
+            with self._lock:
+                if not self._pending:
+                    return
+                entity, full = self._pending.popitem()
+                full = (full or entity not in self._synced_at
+                        or time.monotonic() - self._loaded_at.get(entity, 0) > self.reload_seconds)
+            db = self._session_factory()
+            try:
+                self._sync(db, entity, full)
+            except Exception:
+                logger.exception("Mise à jour des suggestions impossible (%s)", entity.value)
+            finally:
+                db.close()
+
+    def invalidate_tables(self, tables: Iterable[str], deleted: bool = False):
+        """Relire en arrière-plan les lignes modifiées des tables écrites hors ORM
+
+        Une suppression en masse n'est pas visible dans updated_at : `deleted`
+        demande une reconstruction complète.
+        """
+        entities = {_BY_TABLE[table] for table in tables if table in _BY_TABLE}
+        if entities:
+            self._schedule(entities, full=deleted)
+
+    def apply_changes(self, changes: Iterable[tuple]):
+        """Modifications (entité, id, libellé ou None) d'une transaction validée"""
+        with self._lock:
+            for entity, item_id, label in changes:
+                self._apply(entity, item_id, label)
+
+    # === Recherche ===
+
+    def suggest(self, entity: SuggestEntity, query: str, limit: int = 10) -> List[dict]:
+        now = time.monotonic()
+        with self._lock:
+            self.lookups += 1
+            results = self._indexes[entity].lookup(query, limit)
+            stale = now - self._checked_at.get(entity, 0) > self.refresh_seconds
+        if stale:
+            self._schedule([entity])
+        return results
+
+    def stats(self) -> dict:
+        with self._lock:
+            entities = {
+                entity.value: {"labels": len(index.labels), "keys": len(index.keys)}
+                for entity, index in self._indexes.items()
+            }
+        return {
+            "entities": entities,
+            "max_entries": MAX_ENTRIES,
+            "lookups": self.lookups,
+            "refreshes": self.refreshes,
+            "reloads": self.reloads,
+        }
+
+
+suggestion_index = SuggestionIndex()
+
+
+def load_suggestions(db: Session, session_factory=None):
+    """Charger les index de suggestions au démarrage"""
+    suggestion_index.load(db, session_factory)
+
+
+# === Événements de mise à jour ===
+# Comme pour cache.py, les modifications sont mémorisées dans session.info
+# et appliquées une fois la transaction validée.
+
+def _touched_columns(statement) -> Optional[set]:
+    """Colonnes modifiées par un UPDATE en masse (None si inconnues)"""
+    values = getattr(statement, "_values", None)
+    if not values:
+        return None
+    return {key if isinstance(key, str) else getattr(key, "key", None) for key in values}
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_changes(session, flush_context):
+    changes = None
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        entity = _BY_MODEL.get(type(obj))
+        if entity is None:
+            continue
+        spec = ENTITIES[entity]
+        if obj in session.deleted:
+            label = None
+        else:
+            if obj in session.dirty:
+                state = inspect(obj)
+                if not any(state.attrs[name].history.has_changes() for name in (spec["label"], spec["state"])):
+                    continue
+            label = getattr(obj, spec["label"]) if spec["active"](getattr(obj, spec["state"])) else None
+        if changes is None:
+            changes = session.info.setdefault("suggest_changes", [])
+        changes.append((entity, obj.id, label))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_changes(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert):
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    entity = _BY_TABLE.get(getattr(table, "name", None))
+    if entity is None:
+        return
+    if orm_execute_state.is_update:
+        spec = ENTITIES[entity]
+        columns = _touched_columns(orm_execute_state.statement)
+        if columns is not None and not columns & {spec["label"], spec["state"]}:
+            return  # quantités, kilométrage... : libellés inchangés
+    key = "suggest_deleted_tables" if orm_execute_state.is_delete else "suggest_tables"
+    orm_execute_state.session.info.setdefault(key, set()).add(table.name)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_after_commit(session):
+    changes = session.info.pop("suggest_changes", None)
+    tables = session.info.pop("suggest_tables", None)
+    deleted_tables = session.info.pop("suggest_deleted_tables", None)
+    if changes:
+        suggestion_index.apply_changes(changes)
+    if tables:
+        suggestion_index.invalidate_tables(tables)
+    if deleted_tables:
+        suggestion_index.invalidate_tables(deleted_tables, deleted=True)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    for key in ("suggest_changes", "suggest_tables", "suggest_deleted_tables"):
+        session.info.pop(key, None)